@@ -0,0 +1,423 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from enum import Enum
+import json
+import struct
+
+from gotyno_validation import encoding
+from gotyno_validation import schema as s
+from gotyno_validation import validation
+from gotyno_validation.validation import Buffer, Invalid, Valid, ValidationResult
+
+Encoder = Callable[[Any, bytearray], None]
+Decoder = Callable[[memoryview, int], Tuple[Any, int]]
+
+_DOUBLE = struct.Struct('<d')
+
+# The attributes that schemas keep their encoder and decoder in, see `schema.derived`
+_ENCODER_ATTRIBUTE = '_binary_encoder'
+_DECODER_ATTRIBUTE = '_binary_decoder'
+
+
+class BinaryDecodeError(ValueError):
+    """
+    Raised internally when binary data does not match the schema it is decoded with.
+    """
+
+    def __init__(self, reason: Any):
+        super().__init__(reason)
+        self.reason = reason
+
+
+def to_binary(value: Any, type_: Any, *arguments: Any) -> bytes:
+    """
+    Encodes a validated value of `type_` in the compact binary format. Interfaces are written as
+    positional fields with a bitmap for their optional fields, tagged unions as the ordinal of their
+    case, enumerations as ordinals, and literals are not written at all.
+
+    :param value: The value to encode.
+    :param type_: The generated type of `value`.
+    :param arguments: Type arguments for generic types, as types or validators.
+    :return: The encoded bytes.
+    """
+    out = bytearray()
+    encoder_of(s.schema_of(type_, *arguments))(value, out)
+
+    return bytes(out)
+
+
+def from_binary(data: Buffer,
+                type_: Any,
+                *arguments: Any,
+                offset: int = 0,
+                length: Optional[int] = None) -> ValidationResult[Any]:
+    """
+    Decodes a value of `type_` from the compact binary format. The result is the same as decoding the
+    JSON encoding of the value would give.
+
+    :param data: The bytes to decode, or any buffer holding them.
+    :param type_: The generated type to decode as.
+    :param arguments: Type arguments for generic types, as types or validators.
+    :param offset: Where in `data` the value starts.
+    :param length: The length of the value, which otherwise runs to the end of `data`.
+    :return: The validation result.
+    :raises ValueError: If the range is not within `data`.
+    """
+    decode = decoder_of(s.schema_of(type_, *arguments))
+    with memoryview(data) as view, view.cast('B') as buffer:
+        end = len(buffer) if length is None else offset + length
+        if offset < 0 or end < offset or end > len(buffer):
+            raise ValueError(f'Range of {length} from {offset} is outside of the {len(buffer)} available')
+        with buffer[:end] as value_data:
+            try:
+                value, value_end = decode(value_data, offset)
+            except BinaryDecodeError as e:
+                return Invalid(e.reason)
+            except (IndexError, ValueError, struct.error) as e:
+                return Invalid(f'Invalid binary data: {e}')
+
+    if value_end != end:
+        return Invalid(f'Trailing data after binary value: {end - value_end} bytes')
+
+    return Valid(value)
+
+
+def encoder_of(schema: s.Schema) -> Encoder:
+    """
+    Creates the binary encoder for a schema. Encoders append to a `bytearray`.
+    """
+    return s.derived(schema, _ENCODER_ATTRIBUTE, _build_encoder)
+
+
+def decoder_of(schema: s.Schema) -> Decoder:
+    """
+    Creates the binary decoder for a schema. Decoders take a buffer and an offset and return the
+    decoded value together with the offset after it.
+    """
+    return s.derived(schema, _DECODER_ATTRIBUTE, _build_decoder)
+
+
+def write_varint(value: int, out: bytearray) -> None:
+    """
+    Writes a non-negative integer as a LEB128 varint.
+    """
+    while value > 0x7f:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data: memoryview, offset: int) -> Tuple[int, int]:
+    """
+    Reads a LEB128 varint, returning it together with the offset after it.
+    """
+    result = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        result |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return result, offset
+        shift += 7
+
+
+def _write_int(value: int, out: bytearray) -> None:
+    write_varint((value << 1) if value >= 0 else ((-value) << 1) - 1, out)
+
+
+def _read_int(data: memoryview, offset: int) -> Tuple[int, int]:
+    zigzag, offset = read_varint(data, offset)
+
+    return (zigzag >> 1) if zigzag & 1 == 0 else -((zigzag + 1) >> 1), offset
+
+
+def _write_string(value: str, out: bytearray) -> None:
+    encoded = value.encode('utf-8')
+    write_varint(len(encoded), out)
+    out += encoded
+
+
+def _read_string(data: memoryview, offset: int) -> Tuple[str, int]:
+    length, offset = read_varint(data, offset)
+    end = offset + length
+    if end > len(data):
+        raise IndexError('string runs past end of data')
+
+    return str(data[offset:end], 'utf-8'), end
+
+
+def _write_bool(value: bool, out: bytearray) -> None:
+    out.append(1 if value else 0)
+
+
+def _read_bool(data: memoryview, offset: int) -> Tuple[bool, int]:
+    return data[offset] != 0, offset + 1
+
+
+def _write_float(value: float, out: bytearray) -> None:
+    # `validate_float` accepts integers as they are, so they are kept as integers
+    if isinstance(value, int):
+        out.append(1)
+        _write_int(value, out)
+    else:
+        out.append(0)
+        out += _DOUBLE.pack(value)
+
+
+def _read_float(data: memoryview, offset: int) -> Tuple[float, int]:
+    if data[offset] == 1:
+        return _read_int(data, offset + 1)
+
+    return _DOUBLE.unpack_from(data, offset + 1)[0], offset + 1 + _DOUBLE.size
+
+
+_PRIMITIVE_CODECS: Dict[type, Tuple[Encoder, Decoder]] = {
+    str: (_write_string, _read_string),
+    int: (_write_int, _read_int),
+    float: (_write_float, _read_float),
+    bool: (_write_bool, _read_bool),
+}
+
+
+def _build_encoder(schema: s.Schema) -> Encoder:
+    if isinstance(schema, s.PrimitiveSchema):
+        return _PRIMITIVE_CODECS[schema.type][0]
+
+    if isinstance(schema, s.LiteralSchema):
+        def encode_literal(value: Any, out: bytearray) -> None:
+            pass
+        return encode_literal
+
+    if isinstance(schema, s.OptionalSchema):
+        def encode_optional(value: Any, out: bytearray) -> None:
+            if value is None:
+                out.append(0)
+            else:
+                out.append(1)
+                encoder_of(schema.inner)(value, out)
+        return encode_optional
+
+    if isinstance(schema, s.ListSchema):
+        def encode_list(value: List[Any], out: bytearray) -> None:
+            encode_item = encoder_of(schema.item)
+            write_varint(len(value), out)
+            for item in value:
+                encode_item(item, out)
+        return encode_list
+
+    if isinstance(schema, s.StringMapSchema):
+        def encode_string_map(value: Dict[str, Any], out: bytearray) -> None:
+            encode_value = encoder_of(schema.value)
+            write_varint(len(value), out)
+            for key, item in value.items():
+                _write_string(key, out)
+                encode_value(item, out)
+        return encode_string_map
+
+    if isinstance(schema, s.EnumSchema):
+        ordinals = {member: i for i, member in enumerate(schema.enumeration)}
+
+        def encode_enumeration(value: Enum, out: bytearray) -> None:
+            write_varint(ordinals[value], out)
+        return encode_enumeration
+
+    if isinstance(schema, s.UnionSchema):
+        def encode_union(value: Any, out: bytearray) -> None:
+            for i, option in enumerate(schema.options):
+                if _matches(value, option):
+                    write_varint(i, out)
+                    encoder_of(option)(value, out)
+                    return
+            raise ValueError(f'Value does not match any union option: {value}')
+        return encode_union
+
+    if isinstance(schema, s.ValidatorSchema):
+        # Only the validator is known, so the value is stored as length-prefixed JSON
+        def encode_opaque(value: Any, out: bytearray) -> None:
+            _write_string(json.dumps(encoding.general_to_json(value)), out)
+        return encode_opaque
+
+    if isinstance(schema, s.InterfaceSchema):
+        return _interface_encoder(schema)
+
+    if isinstance(schema, s.TaggedUnionSchema):
+        def encode_tagged_union(value: Any, out: bytearray) -> None:
+            encoder_of(schema.cases[type(value).__name__])(value, out)
+        return encode_tagged_union
+
+    raise ValueError(f'Unsupported schema: {schema}')
+
+
+def _interface_encoder(schema: s.InterfaceSchema) -> Encoder:
+    ordinal = schema.ordinal
+    names = [k for k, v in schema.fields.items() if not isinstance(v, s.LiteralSchema)]
+    optionals = [k for k in names if isinstance(schema.fields[k], s.OptionalSchema)]
+    bitmap_size = (len(optionals) + 7) // 8
+
+    def encode_interface(value: Any, out: bytearray) -> None:
+        if ordinal is not None:
+            write_varint(ordinal, out)
+        if bitmap_size > 0:
+            bitmap = 0
+            for i, name in enumerate(optionals):
+                if getattr(value, name) is not None:
+                    bitmap |= 1 << i
+            out += bitmap.to_bytes(bitmap_size, 'little')
+        for name in names:
+            field_value = getattr(value, name)
+            field_schema = schema.fields[name]
+            if isinstance(field_schema, s.OptionalSchema):
+                if field_value is not None:
+                    encoder_of(field_schema.inner)(field_value, out)
+            else:
+                encoder_of(field_schema)(field_value, out)
+
+    return encode_interface
+
+
+def _matches(value: Any, schema: s.Schema) -> bool:
+    if isinstance(schema, s.PrimitiveSchema):
+        if schema.type is bool or isinstance(value, bool):
+            return isinstance(value, bool) and schema.type is bool
+        if schema.type is float:
+            return isinstance(value, (int, float))
+        return isinstance(value, schema.type)
+    if isinstance(schema, s.LiteralSchema):
+        return value == schema.value
+    if isinstance(schema, s.OptionalSchema):
+        return value is None or _matches(value, schema.inner)
+    if isinstance(schema, s.ListSchema):
+        return isinstance(value, list)
+    if isinstance(schema, s.StringMapSchema):
+        return isinstance(value, dict)
+    if isinstance(schema, s.EnumSchema):
+        return isinstance(value, schema.enumeration)
+    if isinstance(schema, s.UnionSchema):
+        return any(_matches(value, o) for o in schema.options)
+    if isinstance(schema, s.InterfaceSchema):
+        return isinstance(value, schema.constructor)
+    if isinstance(schema, s.TaggedUnionSchema):
+        return isinstance(value, schema.base)
+
+    return True
+
+
+def _build_decoder(schema: s.Schema) -> Decoder:
+    if isinstance(schema, s.PrimitiveSchema):
+        return _PRIMITIVE_CODECS[schema.type][1]
+
+    if isinstance(schema, s.LiteralSchema):
+        literal = schema.value
+
+        def decode_literal(data: memoryview, offset: int) -> Tuple[Any, int]:
+            return literal, offset
+        return decode_literal
+
+    if isinstance(schema, s.OptionalSchema):
+        def decode_optional(data: memoryview, offset: int) -> Tuple[Any, int]:
+            if data[offset] == 0:
+                return None, offset + 1
+            return decoder_of(schema.inner)(data, offset + 1)
+        return decode_optional
+
+    if isinstance(schema, s.ListSchema):
+        def decode_list(data: memoryview, offset: int) -> Tuple[List[Any], int]:
+            decode_item = decoder_of(schema.item)
+            length, offset = read_varint(data, offset)
+            items = []
+            for _ in range(length):
+                item, offset = decode_item(data, offset)
+                items.append(item)
+            return items, offset
+        return decode_list
+
+    if isinstance(schema, s.StringMapSchema):
+        def decode_string_map(data: memoryview, offset: int) -> Tuple[Dict[str, Any], int]:
+            decode_value = decoder_of(schema.value)
+            length, offset = read_varint(data, offset)
+            items = {}
+            for _ in range(length):
+                key, offset = _read_string(data, offset)
+                items[key], offset = decode_value(data, offset)
+            return items, offset
+        return decode_string_map
+
+    if isinstance(schema, s.EnumSchema):
+        members = list(schema.enumeration)
+
+        def decode_enumeration(data: memoryview, offset: int) -> Tuple[Enum, int]:
+            ordinal, offset = read_varint(data, offset)
+            if ordinal >= len(members):
+                raise BinaryDecodeError(f'Invalid ordinal for {schema.enumeration.__name__}: {ordinal}')
+            return members[ordinal], offset
+        return decode_enumeration
+
+    if isinstance(schema, s.UnionSchema):
+        def decode_union(data: memoryview, offset: int) -> Tuple[Any, int]:
+            index, offset = read_varint(data, offset)
+            if index >= len(schema.options):
+                raise BinaryDecodeError(f'Invalid union option: {index}')
+            return decoder_of(schema.options[index])(data, offset)
+        return decode_union
+
+    if isinstance(schema, s.ValidatorSchema):
+        def decode_opaque(data: memoryview, offset: int) -> Tuple[Any, int]:
+            string, offset = _read_string(data, offset)
+            result = schema.validator(json.loads(string))
+            if isinstance(result, Invalid):
+                raise BinaryDecodeError(result.reason)
+            return result.value, offset
+        return decode_opaque
+
+    if isinstance(schema, s.InterfaceSchema):
+        return _interface_decoder(schema)
+
+    if isinstance(schema, s.TaggedUnionSchema):
+        by_ordinal = {case.ordinal: case for case in schema.cases.values()}
+
+        def decode_tagged_union(data: memoryview, offset: int) -> Tuple[Any, int]:
+            ordinal, _ = read_varint(data, offset)
+            if ordinal not in by_ordinal:
+                raise BinaryDecodeError(f'Invalid case ordinal for {schema.base.__name__}: {ordinal}')
+            return decoder_of(by_ordinal[ordinal])(data, offset)
+        return decode_tagged_union
+
+    raise ValueError(f'Unsupported schema: {schema}')
+
+
+def _interface_decoder(schema: s.InterfaceSchema) -> Decoder:
+    ordinal = schema.ordinal
+    names = list(schema.fields.keys())
+    optionals = [k for k in names if isinstance(schema.fields[k], s.OptionalSchema)]
+    bitmap_size = (len(optionals) + 7) // 8
+    constructor = schema.constructor
+
+    def decode_interface(data: memoryview, offset: int) -> Tuple[Any, int]:
+        if ordinal is not None:
+            found, offset = read_varint(data, offset)
+            if found != ordinal:
+                raise BinaryDecodeError(f'Expected case ordinal {ordinal} for "{schema.tag}", '
+                                        f'got {found}')
+        bitmap = 0
+        if bitmap_size > 0:
+            bitmap = int.from_bytes(data[offset:offset + bitmap_size], 'little')
+            offset += bitmap_size
+        values = {}
+        optional_index = 0
+        for name in names:
+            field_schema = schema.fields[name]
+            if isinstance(field_schema, s.OptionalSchema):
+                present = bitmap & (1 << optional_index)
+                optional_index += 1
+                if not present:
+                    values[name] = None
+                    continue
+                value, offset = decoder_of(field_schema.inner)(data, offset)
+            else:
+                value, offset = decoder_of(field_schema)(data, offset)
+            values[name] = value
+
+        # Constructed like validated values are, so that `interning` applies
+        return validation.construct(constructor, values), offset
+
+    return decode_interface
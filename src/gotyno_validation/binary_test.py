@@ -0,0 +1,87 @@
+import json
+import unittest
+from dataclasses import dataclass
+from gotyno_validation.gotyno_output import (AnotherEvent, Color, Definitely, Event, Holder, Launch, NotReally,
+                                             Possibly, SomeType)
+from gotyno_validation import gotyno_output
+from gotyno_validation.notifications import (CommandFailure, CommandSuccess, Notification, NotificationCommandResult,
+                                             NotificationNotAdded, Notifications, AddNotificationError)
+from gotyno_validation.validation import Invalid, Valid, validate_int
+from gotyno_validation import binary, schema, validation
+
+
+class TestBinary(unittest.TestCase):
+    "A test suite for the binary codec"
+
+    def test_round_trips_give_the_same_values_as_json(self):
+        values = [
+            (SomeType('SomeType', 'a', -5, None), SomeType),
+            (SomeType('SomeType', 'a', 2 ** 70, 'maybe'), SomeType),
+            (AnotherEvent(SomeType('SomeType', 'b', 1, None)), Event),
+            (CommandSuccess(Notifications([Notification(i, f'm{i}', i % 2 == 0) for i in range(5)])),
+             NotificationCommandResult),
+            (CommandFailure(NotificationNotAdded(AddNotificationError(1, Notification(1, 'å', False), 'e'))),
+             NotificationCommandResult),
+        ]
+        for value, type_ in values:
+            encoded = value.to_binary()
+            self.assertEqual(type_.from_binary(encoded), Valid(value))
+            self.assertEqual(type_.from_binary(encoded), type_.decode(value.encode()))
+            self.assertLess(len(encoded), len(value.encode()))
+
+        self.assertEqual(Color.from_binary(Color.green.to_binary()), Valid(Color.green))
+
+    def test_encoded_bytes_are_stable(self):
+        # Case ordinals follow the order the cases are defined in, once per case
+        self.assertEqual(Launch().to_binary(), b'\x01')
+        self.assertEqual(gotyno_output.Notification('x').to_binary(), b'\x00\x01x')
+        self.assertEqual(AnotherEvent(SomeType('SomeType', 'b', 1, None)).to_binary(), b'\x02\x00\x01b\x02')
+        self.assertEqual(CommandFailure(NotificationNotAdded(AddNotificationError(1, Notification(1, 'a', False), 'e')))
+                         .to_binary(), b'\x01\x01\x02\x02\x01a\x00\x01e')
+        self.assertEqual(Event.from_binary(b'\x01'), Valid(Launch()))
+
+    def test_fingerprints_include_case_ordinals(self):
+        def shape(first, second):
+            class Shape:
+                __tag_field__ = 'type'
+
+            cases = {}
+            for name in (first, second):
+                cases[name] = dataclass(frozen=True)(type(name, (Shape,), {'__annotations__': {'size': int}}))
+            return cases['Square']
+
+        self.assertNotEqual(schema.fingerprint(schema.schema_of(shape('Circle', 'Square'))),
+                            schema.fingerprint(schema.schema_of(shape('Square', 'Circle'))))
+
+    def test_generic_types(self):
+        self.assertEqual(Holder.from_binary(Holder(42).to_binary(), validate_int), Valid(Holder(42)))
+        self.assertEqual(Possibly.from_binary(Definitely(1).to_binary(), validate_int), Valid(Definitely(1)))
+        self.assertEqual(Possibly.from_binary(NotReally().to_binary(), validate_int), Valid(NotReally()))
+        self.assertIsInstance(Holder.from_binary(Holder('no').to_binary(), validate_int), Invalid)
+
+    def test_interning_applies_to_binary_decodes(self):
+        encoded = AnotherEvent(SomeType('SomeType', 'b', 1, None)).to_binary()
+        with validation.interning() as table:
+            decoded = [Event.from_binary(encoded).value for _ in range(3)]
+        self.assertTrue(all(d is decoded[0] for d in decoded))
+        self.assertEqual(len(table), 2)
+
+        holder_schema = schema.schema_of(Holder, validate_int)
+        self.assertIs(binary.decoder_of(holder_schema), binary.decoder_of(holder_schema))
+        self.assertIs(binary.encoder_of(holder_schema), binary.encoder_of(holder_schema))
+
+    def test_invalid_data(self):
+        encoded = AnotherEvent(SomeType('SomeType', 'b', 1, None)).to_binary()
+        self.assertIsInstance(Event.from_binary(encoded[:-1]), Invalid)
+        self.assertIsInstance(Event.from_binary(encoded + b'\x00'), Invalid)
+        self.assertIsInstance(Notification.from_binary(encoded), Invalid)
+        self.assertIsInstance(binary.from_binary(b'\x09', Color), Invalid)
+
+    def test_decoding_from_part_of_a_buffer(self):
+        values = [AnotherEvent(SomeType('SomeType', 'x', 1, None)), AnotherEvent(SomeType('SomeType', 'y', 2, 'z'))]
+        encoded = [binary.to_binary(v, Event) for v in values]
+        packed = bytearray(b'\x00'.join(encoded))
+        self.assertEqual(Event.from_binary(packed, length=len(encoded[0])), Valid(values[0]))
+        self.assertEqual(Event.from_binary(memoryview(packed), offset=len(encoded[0]) + 1), Valid(values[1]))
+        self.assertIsInstance(Event.from_binary(packed, length=len(encoded[0]) + 1), Invalid)
+        self.assertRaises(ValueError, Event.from_binary, packed, offset=1, length=len(packed))
@@ -0,0 +1,236 @@
+from typing import Any, Dict, List, Optional, Tuple
+from types import CodeType, ModuleType
+import atexit
+import importlib.util
+import marshal
+import os
+import sys
+import tempfile
+import threading
+
+from gotyno_validation import lazy
+
+# Cache files hold the layout and the compiled class statements of one generated module in `marshal`
+# format: (format version, Python tag, source stamp, layout, {type name: code object}). The stamp is
+# the modification time and size of the source file, as for the bytecode of modules, so a warm
+# load doesn't read the source at all. Code objects are only valid for the interpreter that wrote
+# them and for the exact source they came from; a file that doesn't match either is ignored and
+# rewritten.
+CACHE_SUFFIX = '.gtyc'
+_FORMAT_VERSION = 2
+_PYTHON_TAG = f'{sys.implementation.cache_tag}-{importlib.util.MAGIC_NUMBER.hex()}'
+
+Stamp = Tuple[int, int]
+
+
+def cache_path(layout: lazy.ModuleLayout, cache_dir: Optional[str] = None) -> str:
+    """
+    The cache file of a generated module. By default it sits in the `__pycache__` directory next to
+    the module, like the bytecode of the module itself.
+    """
+    return _cache_path(layout.name, layout.filename, cache_dir)
+
+
+def _cache_path(module_name: str, filename: str, cache_dir: Optional[str]) -> str:
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(filename), '__pycache__')
+    file_name = f'{module_name.rpartition(".")[2]}.{sys.implementation.cache_tag}{CACHE_SUFFIX}'
+
+    return os.path.join(cache_dir, file_name)
+
+
+class _CachedModule:
+    __slots__ = ('stamp', 'layout', 'codes', 'changed')
+
+    def __init__(self, stamp: Stamp, layout: lazy.ModuleLayout, codes: Dict[str, CodeType], changed: bool):
+        self.stamp = stamp
+        self.layout = layout
+        self.codes = codes
+        self.changed = changed
+
+
+class CodeCache:
+    """
+    Gives the layouts of generated modules and compiles their type definitions for the lazy loader,
+    keeping both on disk between runs. The cache file of a module is read when the module is
+    loaded, and a module whose source is unchanged since is not read or split again. Definitions
+    compiled meanwhile are written back with `flush`, which runs at exit, so a cold start writes
+    each cache file once rather than after every compile. A cache can be used from several threads.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir
+        self._modules: Dict[str, _CachedModule] = {}
+        self._lock = threading.Lock()
+
+    def layout_of(self, module_name: str) -> lazy.ModuleLayout:
+        """
+        Gives the layout of a generated module, from the cache file if the source is unchanged.
+        """
+        spec = importlib.util.find_spec(module_name)
+        if spec is None or spec.origin is None:
+            raise ValueError(f'Cannot find generated module: {module_name}')
+        with self._lock:
+            return self._module(module_name, spec.origin).layout
+
+    def __call__(self, layout: lazy.ModuleLayout, definition: lazy.TypeDefinition) -> CodeType:
+        with self._lock:
+            cached = self._modules.get(layout.name)
+            if cached is None or cached.layout.source_hash != layout.source_hash:
+                # A layout that didn't come from `layout_of`
+                cached = self._module(layout.name, layout.filename, layout)
+            code = cached.codes.get(definition.name)
+            if code is None:
+                code = lazy.compile_type_definition(layout, definition)
+                cached.codes[definition.name] = code
+                cached.changed = True
+
+        return code
+
+    def flush(self) -> None:
+        """
+        Writes the cache files of modules that had definitions compiled since they were read.
+        """
+        with self._lock:
+            for cached in self._modules.values():
+                if cached.changed:
+                    _write(_cache_path(cached.layout.name, cached.layout.filename, self.cache_dir), cached)
+                    cached.changed = False
+
+    def _module(self,
+                module_name: str,
+                filename: str,
+                layout: Optional[lazy.ModuleLayout] = None) -> _CachedModule:
+        stamp = _stamp(filename)
+        cached = self._modules.get(module_name)
+        if cached is not None and cached.stamp == stamp and cached.layout.filename == filename and (
+                layout is None or layout.source_hash == cached.layout.source_hash):
+            return cached
+
+        read = _read(_cache_path(module_name, filename, self.cache_dir), stamp)
+        if read is not None and read[0].name == module_name and read[0].filename == filename and (
+                layout is None or layout.source_hash == read[0].source_hash):
+            cached = _CachedModule(stamp, read[0], read[1], False)
+        else:
+            if layout is None:
+                layout = lazy.layout_of(module_name)
+            # Written even before anything is compiled, so that later runs skip reading the source
+            cached = _CachedModule(stamp, layout, {}, True)
+        self._modules[module_name] = cached
+
+        return cached
+
+
+def _stamp(filename: str) -> Stamp:
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return (-1, -1)
+
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _write(path: str, cached: _CachedModule) -> None:
+    layout = cached.layout
+    definitions = [(d.name, d.source, d.first_line, d.bases, d.references) for d in layout.definitions.values()]
+    data = marshal.dumps((_FORMAT_VERSION, _PYTHON_TAG, cached.stamp,
+                          (layout.name, layout.filename, layout.source_hash, layout.preamble, definitions),
+                          cached.codes))
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Written to a temporary file first so that concurrent readers never see half a file
+        fd, temporary_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temporary_path, path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+    except OSError:
+        # Like bytecode caching, a cache that can't be written is simply not used
+        pass
+
+
+def _read(path: str, stamp: Stamp) -> Optional[Tuple[lazy.ModuleLayout, Dict[str, CodeType]]]:
+    """
+    Reads a cache file, giving the layout and code objects in it if it was written for this
+    interpreter and the source file with this stamp.
+    """
+    try:
+        with open(path, 'rb') as f:
+            cached: Any = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    if (not isinstance(cached, tuple) or len(cached) != 5 or cached[0] != _FORMAT_VERSION
+            or cached[1] != _PYTHON_TAG or cached[2] != stamp or not isinstance(cached[4], dict)):
+        return None
+    try:
+        name, filename, source_hash, preamble, definitions = cached[3]
+        layout = lazy.ModuleLayout(name, filename, source_hash, preamble,
+                                   {d[0]: lazy.TypeDefinition(*d) for d in definitions})
+    except (TypeError, ValueError):
+        return None
+
+    return layout, cached[4]
+
+
+# One cache per directory, so that all loads share the writes at exit
+_caches: Dict[Optional[str], CodeCache] = {}
+_caches_lock = threading.Lock()
+
+
+def _cache_for(cache_dir: Optional[str]) -> CodeCache:
+    with _caches_lock:
+        cache = _caches.get(cache_dir)
+        if cache is None:
+            cache = _caches[cache_dir] = CodeCache(cache_dir)
+
+        return cache
+
+
+def flush() -> None:
+    """
+    Writes what was compiled since the cache files were read, for all caches of `load_cached`. This
+    happens at exit anyway; workers that may not exit normally can call it once they're warm.
+    """
+    with _caches_lock:
+        caches: List[CodeCache] = list(_caches.values())
+    for cache in caches:
+        cache.flush()
+
+
+atexit.register(flush)
+
+
+def load_cached(module_name: str,
+                cache_dir: Optional[str] = None,
+                register: bool = True) -> ModuleType:
+    """
+    Loads a generated module lazily, taking its layout and the compiled types from the on-disk
+    cache. A worker that starts from a warm cache neither reads the source of the module nor
+    compiles any of its types.
+
+    :param module_name: The name of the generated module.
+    :param cache_dir: The directory for cache files, `__pycache__` next to the module by default.
+    :param register: Whether to put the module in `sys.modules`, as in `lazy.load_lazily`.
+    """
+    cache = _cache_for(cache_dir)
+
+    return lazy.load_lazily(module_name, register=register, compile_definition=cache,
+                            load_layout=cache.layout_of)
+
+
+def warm_cache(module_name: str, cache_dir: Optional[str] = None) -> int:
+    """
+    Compiles every type of a generated module into the cache, for instance when building a worker
+    image, and writes the cache file. Returns the number of types in the cache.
+    """
+    cache = _cache_for(cache_dir)
+    layout = cache.layout_of(module_name)
+    for definition in layout.definitions.values():
+        cache(layout, definition)
+    cache.flush()
+
+    return len(layout.definitions)
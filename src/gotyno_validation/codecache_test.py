@@ -0,0 +1,84 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from gotyno_validation import codecache, lazy
+from gotyno_validation.validation import Valid
+
+
+class TestCodeCache(unittest.TestCase):
+    "A test suite for the on-disk cache of compiled types"
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.addCleanup(codecache._caches.pop, self.directory.name, None)
+
+    def test_warm_cache_is_used(self):
+        count = codecache.warm_cache('gotyno_validation.notifications', self.directory.name)
+        layout = lazy.layout_of('gotyno_validation.notifications')
+        self.assertEqual(count, len(layout.definitions))
+        self.assertTrue(os.path.exists(codecache.cache_path(layout, self.directory.name)))
+
+        def fail(*arguments):
+            raise AssertionError('Compiled or split despite a warm cache')
+
+        # A new process starts without the caches in memory
+        codecache._caches.pop(self.directory.name)
+        originals = lazy.compile_type_definition, lazy.layout_of
+        lazy.compile_type_definition = lazy.layout_of = fail
+        try:
+            module = codecache.load_cached('gotyno_validation.notifications', self.directory.name,
+                                           register=False)
+            result = module.NotificationCommandResult.validate({'type': 'CommandFailure',
+                                                                'data': {'type': 'InvalidCommand',
+                                                                         'data': 'x'}})
+        finally:
+            lazy.compile_type_definition, lazy.layout_of = originals
+        self.assertIsInstance(result, Valid)
+
+    def test_cache_is_written_once_when_flushed(self):
+        module = codecache.load_cached('gotyno_validation.gotyno_output', self.directory.name,
+                                       register=False)
+        layout = lazy.layout_of('gotyno_validation.gotyno_output')
+        path = codecache.cache_path(layout, self.directory.name)
+        module.SomeType
+        module.Event
+        self.assertFalse(os.path.exists(path))
+
+        codecache.flush()
+        stamp = codecache._stamp(layout.filename)
+        cached_layout, codes = codecache._read(path, stamp)
+        self.assertEqual(cached_layout, layout)
+        self.assertEqual(set(codes), {'SomeType', 'Event', 'AnotherEvent', 'Launch', 'Notification'})
+        modified = os.stat(path).st_mtime_ns
+        codecache.flush()
+        self.assertEqual(os.stat(path).st_mtime_ns, modified)
+
+    def test_changed_module_invalidates_cache(self):
+        source_directory = os.path.join(self.directory.name, 'source')
+        os.makedirs(source_directory)
+        original = lazy.layout_of('gotyno_validation.gotyno_output').filename
+        shutil.copy(original, os.path.join(source_directory, 'copied_output.py'))
+        sys.path.insert(0, source_directory)
+        self.addCleanup(sys.path.remove, source_directory)
+        cache_dir = os.path.join(self.directory.name, 'cache')
+        self.addCleanup(codecache._caches.pop, cache_dir, None)
+
+        codecache.warm_cache('copied_output', cache_dir)
+        layout = lazy.layout_of('copied_output')
+        path = codecache.cache_path(layout, cache_dir)
+        stamp = codecache._stamp(layout.filename)
+        self.assertEqual(len(codecache._read(path, stamp)[1]), len(layout.definitions))
+        self.assertIsNone(codecache._read(path, (stamp[0], stamp[1] + 1)))
+
+        with open(layout.filename, 'a', encoding='utf-8') as f:
+            f.write('\n\nclass Added:\n    pass\n')
+        codecache._caches.pop(cache_dir)
+        module = codecache.load_cached('copied_output', cache_dir, register=False)
+        self.assertIsInstance(module.Added, type)
+
+        with open(path, 'wb') as f:
+            f.write(b'not marshal data')
+        self.assertIsNone(codecache._read(path, stamp))
@@ -0,0 +1,270 @@
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, Optional, Union
+import bz2
+import gzip
+import itertools
+import lzma
+import multiprocessing
+import os
+import queue
+import threading
+
+from gotyno_validation.framing import DEFAULT_MAX_FRAME_SIZE, NEWLINE_DELIMITED, FrameDecoder, frame_chunks
+from gotyno_validation.validation import ValidationResult, Validator
+
+# Compressed archives of newline delimited JSON are decompressed in chunks that feed the decoder
+# straight away, so that only a chunk of decompressed data and the line being decoded are held at a
+# time. Decompression can also run in a thread or a process of its own, handing over chunks through
+# a bounded queue or a pipe; the stdlib decompressors release the GIL, so a thread already lets
+# decompression and validation overlap.
+GZIP = 'gzip'
+BZ2 = 'bz2'
+LZMA = 'lzma'
+
+THREAD = 'thread'
+PROCESS = 'process'
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+# The most decompressed chunks waiting for the decoder when decompressing in a thread
+DEFAULT_QUEUE_SIZE = 8
+DEFAULT_BATCH_SIZE = 256
+
+Source = Union[str, os.PathLike, BinaryIO]
+
+_OPENERS = {GZIP: gzip.open, BZ2: bz2.open, LZMA: lzma.open}
+_MAGIC = [(b'\x1f\x8b', GZIP), (b'BZh', BZ2), (b'\xfd7zXZ\x00', LZMA), (b'\x5d\x00\x00', LZMA)]
+_SUFFIXES = {'.gz': GZIP, '.gzip': GZIP, '.bz2': BZ2, '.xz': LZMA, '.lzma': LZMA}
+_END = object()
+
+
+def _encode_value(value: Any) -> str:
+    return value.encode()
+
+
+def detect_compression(source: Source) -> str:
+    """
+    Detects the compression of an archive from its first bytes. Streams need to support `peek`,
+    like buffered files do.
+
+    :raises ValueError: If the compression is not recognized.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            start = f.read(6)
+    elif hasattr(source, 'peek'):
+        start = source.peek(6)[:6]
+    else:
+        raise ValueError('The compression of a stream without `peek` must be given')
+
+    for magic, compression in _MAGIC:
+        if start.startswith(magic):
+            return compression
+
+    raise ValueError(f'Unknown compression of {source}')
+
+
+def open_compressed(source: Source,
+                    mode: str = 'rb',
+                    compression: Optional[str] = None,
+                    level: Optional[int] = None) -> BinaryIO:
+    """
+    Opens a compressed file or stream. When reading, the compression is detected from the data if it
+    is not given; when writing, from the suffix of the path.
+
+    :param source: A path or a binary stream.
+    :param mode: `'rb'` or `'wb'`.
+    :param compression: `GZIP`, `BZ2` or `LZMA`.
+    :param level: The compression level, or the preset for `LZMA`, when writing.
+    """
+    if compression is None:
+        if mode.startswith('r'):
+            compression = detect_compression(source)
+        elif isinstance(source, (str, os.PathLike)):
+            compression = _SUFFIXES.get(os.path.splitext(os.fspath(source))[1])
+        if compression is None:
+            raise ValueError(f'The compression of {source} must be given')
+    opener = _OPENERS.get(compression)
+    if opener is None:
+        raise ValueError(f'Unknown compression: {compression}')
+    if level is None:
+        return opener(source, mode)
+
+    return opener(source, mode, **({'preset': level} if compression == LZMA else {'compresslevel': level}))
+
+
+def read_ndjson(source: Source,
+                validator: Validator[Any],
+                compression: Optional[str] = None,
+                background: Optional[str] = None,
+                max_line_size: int = DEFAULT_MAX_FRAME_SIZE,
+                chunk_size: int = DEFAULT_CHUNK_SIZE,
+                queue_size: int = DEFAULT_QUEUE_SIZE) -> Iterator[ValidationResult[Any]]:
+    """
+    Decodes and validates a compressed archive of newline delimited JSON, one result per line,
+    without decompressing it as a whole. The last line needs no newline.
+
+    :param source: A path or a binary stream of compressed data.
+    :param validator: The validator to use for each line.
+    :param compression: `GZIP`, `BZ2` or `LZMA`, detected from the data by default.
+    :param background: `THREAD` or `PROCESS` to decompress in the background; processes need a path.
+    :param max_line_size: The longest line accepted, in bytes.
+    :param chunk_size: The size of the decompressed chunks that are decoded at a time.
+    :param queue_size: The most chunks waiting to be decoded when decompressing in a thread.
+    :raises ValueError: If a line is longer than `max_line_size`. Errors from decompression, like
+                        `EOFError` for truncated archives, are raised as they are.
+    """
+    if background is None:
+        chunks = _read_chunks(source, compression, chunk_size)
+    elif background == THREAD:
+        chunks = _read_chunks_in_thread(source, compression, chunk_size, queue_size)
+    elif background == PROCESS:
+        if not isinstance(source, (str, os.PathLike)):
+            raise ValueError('Decompressing in a process needs a path')
+        chunks = _read_chunks_in_process(source, compression, chunk_size)
+    else:
+        raise ValueError(f'Unknown background: {background}')
+
+    return _decode_lines(chunks, FrameDecoder(validator, NEWLINE_DELIMITED, max_line_size))
+
+
+def _decode_lines(chunks: Iterator[Any], decoder: FrameDecoder) -> Iterator[ValidationResult[Any]]:
+    try:
+        for chunk in chunks:
+            yield from decoder.feed(chunk)
+        if decoder.buffered > 0:
+            yield from decoder.feed(b'\n')
+    finally:
+        # Stops background decompression when decoding is stopped early
+        chunks.close()
+
+
+def _read_chunks(source: Source, compression: Optional[str], chunk_size: int) -> Iterator[memoryview]:
+    with open_compressed(source, 'rb', compression) as f:
+        chunk = bytearray(chunk_size)
+        view = memoryview(chunk)
+        while True:
+            size = f.readinto(chunk)
+            if not size:
+                break
+            yield view[:size]
+
+
+def _read_chunks_in_thread(source: Source,
+                           compression: Optional[str],
+                           chunk_size: int,
+                           queue_size: int) -> Iterator[bytes]:
+    chunks: 'queue.Queue[Any]' = queue.Queue(queue_size)
+    stopped = threading.Event()
+
+    def put(item: Any) -> None:
+        while not stopped.is_set():
+            try:
+                chunks.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def decompress() -> None:
+        try:
+            with open_compressed(source, 'rb', compression) as f:
+                while not stopped.is_set():
+                    chunk = f.read(chunk_size)
+                    if not chunk:
+                        break
+                    put(chunk)
+            put(_END)
+        except BaseException as e:
+            put(e)
+
+    thread = threading.Thread(target=decompress, name='gotyno-decompress', daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = chunks.get()
+            if item is _END:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stopped.set()
+        thread.join()
+
+
+def _send_chunks(path: Union[str, os.PathLike], compression: Optional[str], chunk_size: int, connection: Any) -> None:
+    # Runs in the decompressing process: chunks are sent as they come, then an empty message marks
+    # the end, followed by the exception that ended decompression early, if any
+    error = None
+    try:
+        with open_compressed(path, 'rb', compression) as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                connection.send_bytes(chunk)
+    except BrokenPipeError:
+        return
+    except Exception as e:
+        error = e
+    try:
+        connection.send_bytes(b'')
+        try:
+            connection.send(error)
+        except Exception:
+            # Exceptions that can't be pickled
+            connection.send(RuntimeError(f'{type(error).__name__}: {error}'))
+    except BrokenPipeError:
+        pass
+    finally:
+        connection.close()
+
+
+def _read_chunks_in_process(path: Union[str, os.PathLike], compression: Optional[str], chunk_size: int) -> Iterator[bytes]:
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=_send_chunks, args=(path, compression, chunk_size, sender),
+                                      name='gotyno-decompress', daemon=True)
+    process.start()
+    sender.close()
+    try:
+        while True:
+            chunk = receiver.recv_bytes()
+            if len(chunk) == 0:
+                break
+            yield chunk
+        error = receiver.recv()
+        if error is not None:
+            raise error
+    finally:
+        receiver.close()
+        if process.is_alive():
+            process.terminate()
+        process.join()
+
+
+def write_ndjson(destination: Source,
+                 values: Iterable[Any],
+                 compression: Optional[str] = None,
+                 encode: Callable[[Any], str] = _encode_value,
+                 level: Optional[int] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    Encodes values into a compressed archive of newline delimited JSON, a batch at a time, returning
+    the number of values written.
+
+    :param destination: A path or a binary stream.
+    :param values: The values to write; any iterable, which is consumed as it is written.
+    :param compression: `GZIP`, `BZ2` or `LZMA`, detected from the suffix of a path by default.
+    :param encode: Encodes a value as a JSON string; calls `encode()` on the value by default.
+    :param level: The compression level, or the preset for `LZMA`.
+    :param batch_size: How many values are encoded and written at a time.
+    """
+    written = 0
+    iterator = iter(values)
+    with open_compressed(destination, 'wb', compression, level) as f:
+        while True:
+            batch = list(itertools.islice(iterator, batch_size))
+            if len(batch) == 0:
+                break
+            f.writelines(frame_chunks(batch, NEWLINE_DELIMITED, encode))
+            written += len(batch)
+
+    return written
@@ -0,0 +1,86 @@
+import gzip
+import io
+import os
+import tempfile
+import unittest
+from gotyno_validation import compression
+from gotyno_validation.gotyno_output import SomeType
+from gotyno_validation.validation import Invalid, Valid
+
+
+def some_type(i):
+    return SomeType(type='SomeType', some_field=f'ø {i}', some_other_field=i, maybe_some_field=None)
+
+
+class TestCompression(unittest.TestCase):
+    "A test suite for decoding and encoding compressed archives"
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.values = [some_type(i) for i in range(1000)]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_round_trips(self):
+        for suffix in ('.gz', '.bz2', '.xz'):
+            path = self.path(f'values.ndjson{suffix}')
+            self.assertEqual(compression.write_ndjson(path, iter(self.values), batch_size=100), 1000)
+            for background in (None, compression.THREAD, compression.PROCESS):
+                results = list(compression.read_ndjson(path, SomeType.validate, background=background,
+                                                       chunk_size=1000, queue_size=2))
+                self.assertEqual(results, [Valid(v) for v in self.values], (suffix, background))
+
+    def test_streams(self):
+        stream = io.BytesIO()
+        compression.write_ndjson(stream, self.values[:10], compression.LZMA, level=1)
+        stream.seek(0)
+        self.assertRaises(ValueError, compression.read_ndjson, stream, SomeType.validate,
+                          background=compression.PROCESS)
+        self.assertRaises(ValueError, compression.detect_compression, stream)
+        buffered = io.BufferedReader(stream)
+        self.assertEqual(compression.detect_compression(buffered), compression.LZMA)
+        self.assertEqual(list(compression.read_ndjson(buffered, SomeType.validate)),
+                         [Valid(v) for v in self.values[:10]])
+
+        self.assertRaises(ValueError, compression.write_ndjson, self.path('values.ndjson'), self.values)
+        self.assertRaises(ValueError, compression.write_ndjson, io.BytesIO(), self.values, 'zip')
+        self.assertRaises(ValueError, compression.read_ndjson, stream, SomeType.validate, background='fiber')
+
+    def test_invalid_lines(self):
+        path = self.path('values.gz')
+        with gzip.open(path, 'wb') as f:
+            f.write(self.values[0].encode().encode() + b'\nnot json\n{"type": "SomeType"}\n'
+                    + self.values[1].encode().encode())
+        results = list(compression.read_ndjson(path, SomeType.validate))
+        self.assertEqual(results[0], Valid(self.values[0]))
+        self.assertEqual(results[1], Invalid('Invalid JSON'))
+        self.assertIsInstance(results[2], Invalid)
+        self.assertEqual(results[3], Valid(self.values[1]))
+
+        for background in (None, compression.THREAD):
+            with self.assertRaises(ValueError):
+                list(compression.read_ndjson(path, SomeType.validate, background=background, max_line_size=10))
+
+    def test_truncated_archives(self):
+        path = self.path('values.bz2')
+        compression.write_ndjson(path, self.values)
+        with open(path, 'rb') as f:
+            data = f.read()
+        with open(path, 'wb') as f:
+            f.write(data[:len(data) // 2])
+        for background in (None, compression.THREAD, compression.PROCESS):
+            with self.assertRaises(EOFError):
+                list(compression.read_ndjson(path, SomeType.validate, background=background))
+
+    def test_stopping_early(self):
+        path = self.path('values.gz')
+        compression.write_ndjson(path, self.values)
+        for background in (compression.THREAD, compression.PROCESS):
+            results = compression.read_ndjson(path, SomeType.validate, background=background,
+                                              chunk_size=100, queue_size=1)
+            self.assertEqual(next(results), Valid(self.values[0]))
+            results.close()
@@ -0,0 +1,87 @@
+from typing import Callable, Iterable, List, Optional, TypeVar
+from concurrent.futures import Executor, ThreadPoolExecutor
+import contextvars
+
+from gotyno_validation.validation import JSONText, ValidationResult, Validator, validate_from_string
+
+# Validators are pure functions, and every cache shared between threads is safe to use from several
+# of them at once, including on free-threaded builds of CPython:
+#
+# - Schemas are built under a lock and only published once complete (`schema`).
+# - Validators, parsers and binary codecs for schemas, and union candidates, are created without a
+#   lock; threads racing on one entry create equivalent values and store them in one assignment.
+# - Specializations of generic validators are memoized per thread while they're being created.
+# - Intern tables, sampling reports, lazily loaded types and code caches take a lock.
+#
+# Modes like `interning`, `sampling` and `parsed_json_source` are context variables. The batch
+# functions below run each chunk in a copy of the caller's context, so that an active mode applies
+# to the whole batch and, for intern tables and sampling reports, is shared by all workers.
+
+T = TypeVar('T')
+U = TypeVar('U')
+
+DEFAULT_CHUNK_SIZE = 256
+
+
+def validate_batch(values: Iterable[object],
+                   validator: Validator[T],
+                   max_workers: Optional[int] = None,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE,
+                   executor: Optional[Executor] = None) -> List[ValidationResult[T]]:
+    """
+    Validates a batch of values on a thread pool, giving the results in the order of the values.
+    The results are the same as validating the values one by one.
+
+    :param values: The values to validate.
+    :param validator: The validator to use.
+    :param max_workers: The number of threads of the pool, as for `ThreadPoolExecutor`.
+    :param chunk_size: How many values each task validates.
+    :param executor: An executor to use instead of a new pool, which is then not shut down.
+    """
+    return _map_chunks(validator, values, max_workers, chunk_size, executor)
+
+
+def decode_batch(strings: Iterable[JSONText],
+                 validator: Validator[T],
+                 max_workers: Optional[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 executor: Optional[Executor] = None,
+                 parsed_json: bool = True) -> List[ValidationResult[T]]:
+    """
+    Parses and validates a batch of JSON strings on a thread pool, as `validate_from_string` does.
+    See `validate_batch` for the other parameters.
+    """
+    def decode(string: JSONText) -> ValidationResult[T]:
+        return validate_from_string(string, validator, parsed_json)
+
+    return _map_chunks(decode, strings, max_workers, chunk_size, executor)
+
+
+def _map_chunks(function: Callable[[T], U],
+                items: Iterable[T],
+                max_workers: Optional[int],
+                chunk_size: int,
+                executor: Optional[Executor]) -> List[U]:
+    if chunk_size < 1:
+        raise ValueError(f'Chunk size must be positive, got {chunk_size}')
+    items = list(items)
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    if executor is not None:
+        return _run_chunks(executor, function, chunks)
+
+    with ThreadPoolExecutor(max_workers) as pool:
+        return _run_chunks(pool, function, chunks)
+
+
+def _run_chunks(executor: Executor, function: Callable[[T], U], chunks: List[List[T]]) -> List[U]:
+    # A context can only be entered by one thread at a time, so each chunk gets its own copy
+    futures = [executor.submit(contextvars.copy_context().run, _apply, function, chunk) for chunk in chunks]
+    results: List[U] = []
+    for future in futures:
+        results.extend(future.result())
+
+    return results
+
+
+def _apply(function: Callable[[T], U], chunk: List[T]) -> List[U]:
+    return [function(item) for item in chunk]
@@ -0,0 +1,117 @@
+import json
+import sys
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from gotyno_validation import binary, lazy, parsing, schema, validation
+from gotyno_validation.concurrency import decode_batch, validate_batch
+from gotyno_validation.gotyno_output import Event, Possibly
+from gotyno_validation.loadgen import LoadProfile, generate_payloads
+from gotyno_validation.notifications import NotificationCommandResult
+
+THREADS = 8
+ROUNDS = 20
+
+
+def contend(work):
+    """
+    Runs `work` in several threads that all start at once, returning what each one returned.
+    """
+    barrier = threading.Barrier(THREADS)
+
+    def run(_):
+        barrier.wait()
+        return work()
+
+    with ThreadPoolExecutor(THREADS) as pool:
+        return list(pool.map(run, range(THREADS)))
+
+
+class TestConcurrentValidation(unittest.TestCase):
+    "A test suite for validating batches on thread pools"
+
+    def setUp(self):
+        # Switching threads as often as possible makes races show up under the GIL as well
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.payloads = generate_payloads(500, NotificationCommandResult,
+                                          profile=LoadProfile(seed=3, invalid_field_rate=0.05))
+
+    def tearDown(self):
+        sys.setswitchinterval(self.switch_interval)
+
+    def test_same_results_as_sequential_validation(self):
+        expected = [NotificationCommandResult.validate(p) for p in self.payloads]
+        self.assertEqual(validate_batch(self.payloads, NotificationCommandResult.validate,
+                                        max_workers=THREADS, chunk_size=7), expected)
+
+        strings = [json.dumps(p) for p in self.payloads] + ['{']
+        expected = [NotificationCommandResult.decode(s) for s in strings]
+        with ThreadPoolExecutor(THREADS) as pool:
+            self.assertEqual(decode_batch(strings, NotificationCommandResult.validate, executor=pool,
+                                          chunk_size=3), expected)
+        self.assertEqual(validate_batch([], NotificationCommandResult.validate), [])
+        self.assertRaises(ValueError, validate_batch, self.payloads, NotificationCommandResult.validate,
+                          chunk_size=0)
+
+    def test_modes_apply_to_all_workers(self):
+        payload = {'type': 'AnotherEvent',
+                   'data': {'type': 'SomeType', 'some_field': 'x', 'some_other_field': 1}}
+        for _ in range(ROUNDS):
+            with validation.interning() as table:
+                results = validate_batch([dict(payload) for _ in range(200)], Event.validate,
+                                         max_workers=THREADS, chunk_size=1)
+            first = results[0].value
+            self.assertTrue(all(r.value is first for r in results))
+            self.assertEqual(len(table), 2)
+
+        lists = [[str(i) for i in range(100)] for _ in range(50)]
+        with validation.sampling(fraction=0.1, seed=1) as report:
+            results = validate_batch(lists, validation.validate_list(validation.validate_string),
+                                     max_workers=THREADS, chunk_size=1)
+        self.assertEqual(report.checked + report.skipped, 5000)
+        self.assertEqual([r.value for r in results], lists)
+
+    def test_cold_caches_under_contention(self):
+        strings = [json.dumps(p) for p in self.payloads[:50]]
+        expected = [NotificationCommandResult.decode(s) for s in strings]
+        for _ in range(ROUNDS):
+            for cache in (schema._schemas, schema._argument_schemas):
+                cache.clear()
+
+            def work():
+                result_schema = schema.schema_of(NotificationCommandResult)
+                validator = schema.validator_of(result_schema)
+                results = [validation.validate_from_string(s, validator) for s in strings]
+                parsed = [parsing.decode_one_pass(s, NotificationCommandResult) for s in strings]
+                encoded = [binary.to_binary(r.value, NotificationCommandResult)
+                           for r in results if isinstance(r, validation.Valid)]
+                return result_schema, results, parsed, encoded
+
+            outcomes = contend(work)
+            self.assertTrue(all(o[0] is outcomes[0][0] for o in outcomes))
+            for _, results, parsed, encoded in outcomes:
+                self.assertEqual(results, expected)
+                self.assertEqual(parsed, expected)
+                self.assertEqual(encoded, outcomes[0][3])
+
+    def test_specializations_under_contention(self):
+        payloads = generate_payloads(20, Possibly, validation.validate_int, profile=LoadProfile(seed=5))
+        for _ in range(ROUNDS):
+            def validate_item(value):
+                return validation.validate_int(value)
+
+            def work():
+                validator = Possibly.validate(validate_item)
+                return [validator(p) for p in payloads]
+
+            outcomes = contend(work)
+            self.assertTrue(all(o == outcomes[0] for o in outcomes))
+            self.assertTrue(all(isinstance(r, validation.Valid) for r in outcomes[0]))
+
+    def test_lazy_types_under_contention(self):
+        for _ in range(ROUNDS):
+            module = lazy.load_lazily('gotyno_validation.gotyno_output', register=False)
+            classes = contend(lambda: (module.Event, module.AnotherEvent, module.Possibly))
+            self.assertTrue(all(c == classes[0] for c in classes))
+            self.assertTrue(issubclass(classes[0][1], classes[0][0]))
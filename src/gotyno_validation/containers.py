@@ -0,0 +1,166 @@
+from typing import Any, Dict, Iterable, List, SupportsIndex, TypeVar, Union
+
+from gotyno_validation.validation import (Invalid, Unknown, Validator, validate_list, validate_string,
+                                          validate_string_map_of)
+
+T = TypeVar('T')
+
+# Validated containers only ever hold values that their item validator accepted, so validating one
+# again with a list or string map validator for the same item validator gives a copy of it without
+# validating its items, see `validate_list` and `validate_dict_of`. The copy keeps later changes to
+# the container out of the values it was validated into. Their items should be immutable, like
+# generated classes, since changes made inside of an item can't be checked. Items put in through the
+# methods of `list` or `dict` themselves, like `list.append(container, item)`, aren't checked either;
+# containers that may have been changed that way should be validated in `strict_instances` mode.
+#
+# Containers are plain lists and dicts otherwise, so `json.dumps`, `to_json` and the functions in
+# `encoding` serialize them like any other list or dict.
+
+
+class InvalidItemError(ValueError):
+    """
+    Raised when a value put into a validated container is invalid. `invalid` holds the result of
+    validating it.
+    """
+
+    def __init__(self, invalid: Invalid):
+        super().__init__(invalid.reason)
+        self.invalid = invalid
+
+
+class ValidatedMap(Dict[str, T]):
+    """
+    A string map whose values are validated as they are put in, keeping the validated value like
+    `validate_string_map_of` does. The map is never changed by an invalid update, in which case an
+    `InvalidItemError` is raised.
+    """
+    __slots__ = ('item_validator',)
+    __validates_items__ = True
+
+    def __init__(self, item_validator: Validator[T], values: Union[Dict[str, Unknown], Iterable[Any]] = ()):
+        super().__init__()
+        self.item_validator = item_validator
+        self.update(values)
+
+    def __setitem__(self, key: str, value: Unknown) -> None:
+        key_result = validate_string(key)
+        if isinstance(key_result, Invalid):
+            raise InvalidItemError(key_result)
+        result = self.item_validator(value)
+        if isinstance(result, Invalid):
+            raise InvalidItemError(Invalid({key: result.reason}))
+
+        super().__setitem__(key_result.value, result.value)
+
+    def update(self, *arguments: Any, **values: Unknown) -> None:
+        """
+        Validates all of the new values before putting any of them in.
+        """
+        if len(arguments) == 1 and len(values) == 0 and isinstance(arguments[0], dict):
+            new_values = arguments[0]
+        else:
+            new_values = dict(*arguments, **values)
+        result = validate_string_map_of(self.item_validator)(new_values)
+        if isinstance(result, Invalid):
+            raise InvalidItemError(result)
+
+        super().update(result.value)
+
+    def setdefault(self, key: str, default: Unknown = None) -> T:
+        if key not in self:
+            self[key] = default
+
+        return self[key]
+
+    def __ior__(self, values: Any) -> 'ValidatedMap[T]':
+        self.update(values)
+
+        return self
+
+    def copy(self) -> 'ValidatedMap[T]':
+        # The values are known to be valid
+        copy: ValidatedMap[T] = ValidatedMap.__new__(ValidatedMap)
+        copy.item_validator = self.item_validator
+        super(ValidatedMap, copy).update(self)
+
+        return copy
+
+    @classmethod
+    def fromkeys(cls, keys: Iterable[str], value: Unknown = None) -> 'ValidatedMap[T]':
+        raise TypeError('ValidatedMap.fromkeys takes no item validator, use '
+                        'ValidatedMap(item_validator, dict.fromkeys(keys, value)) instead')
+
+    def __reduce__(self) -> Any:
+        # Pickling would otherwise put the items back before the item validator
+        return (type(self), (self.item_validator, dict(self)))
+
+    def __repr__(self) -> str:
+        return f'ValidatedMap({super().__repr__()})'
+
+
+class ValidatedList(List[T]):
+    """
+    A list whose items are validated as they are added or replaced, keeping the validated value like
+    `validate_list` does. The list is never changed by an invalid update, in which case an
+    `InvalidItemError` is raised.
+    """
+    __slots__ = ('item_validator',)
+    __validates_items__ = True
+
+    def __init__(self, item_validator: Validator[T], values: Iterable[Unknown] = ()):
+        super().__init__()
+        self.item_validator = item_validator
+        self.extend(values)
+
+    def _validate(self, value: Unknown) -> T:
+        result = self.item_validator(value)
+        if isinstance(result, Invalid):
+            raise InvalidItemError(result)
+
+        return result.value
+
+    def _validate_all(self, values: Iterable[Unknown]) -> List[T]:
+        # Errors are keyed by the position among the new values
+        result = validate_list(self.item_validator)(values if isinstance(values, list) else list(values))
+        if isinstance(result, Invalid):
+            raise InvalidItemError(result)
+
+        return result.value
+
+    def append(self, value: Unknown) -> None:
+        super().append(self._validate(value))
+
+    def insert(self, index: SupportsIndex, value: Unknown) -> None:
+        super().insert(index, self._validate(value))
+
+    def extend(self, values: Iterable[Unknown]) -> None:
+        """
+        Validates all of the new values before adding any of them.
+        """
+        super().extend(self._validate_all(values))
+
+    def __setitem__(self, index: Union[SupportsIndex, slice], value: Any) -> None:
+        if isinstance(index, slice):
+            super().__setitem__(index, self._validate_all(value))
+        else:
+            super().__setitem__(index, self._validate(value))
+
+    def __iadd__(self, values: Iterable[Unknown]) -> 'ValidatedList[T]':
+        self.extend(values)
+
+        return self
+
+    def copy(self) -> 'ValidatedList[T]':
+        # The items are known to be valid
+        copy: ValidatedList[T] = ValidatedList.__new__(ValidatedList)
+        copy.item_validator = self.item_validator
+        super(ValidatedList, copy).extend(self)
+
+        return copy
+
+    def __reduce__(self) -> Any:
+        # Pickling would otherwise put the items back before the item validator
+        return (type(self), (self.item_validator, list(self)))
+
+    def __repr__(self) -> str:
+        return f'ValidatedList({super().__repr__()})'
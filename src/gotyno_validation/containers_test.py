@@ -0,0 +1,124 @@
+import json
+import pickle
+import unittest
+from gotyno_validation import encoding, validation
+from gotyno_validation.containers import InvalidItemError, ValidatedList, ValidatedMap
+from gotyno_validation.notifications import Notification, Notifications
+from gotyno_validation.validation import Invalid, Valid, validate_list, validate_string_map_of
+
+
+def counting(validator):
+    calls = []
+
+    def validate(value):
+        calls.append(value)
+        return validator(value)
+    return validate, calls
+
+
+class TestValidatedContainers(unittest.TestCase):
+    "A test suite for incrementally validated containers"
+
+    def setUp(self):
+        self.payloads = {str(i): {'id': i, 'message': f'm{i}', 'seen': i % 2 == 0} for i in range(10)}
+
+    def test_map_validates_changes_only(self):
+        validate_notification, calls = counting(Notification.validate)
+        notifications = ValidatedMap(validate_notification, self.payloads)
+        self.assertEqual(notifications, validate_string_map_of(Notification.validate)(self.payloads).value)
+        self.assertEqual(len(calls), 10)
+
+        notifications['10'] = {'id': 10, 'message': 'new', 'seen': False}
+        self.assertEqual(notifications['10'], Notification(10, 'new', False))
+        notifications.setdefault('10', {'id': 11})
+        notifications |= {'11': Notification(11, 'x', True)}
+        self.assertEqual(len(calls), 12)
+
+        validate_map = validate_string_map_of(validate_notification)
+        validated = validate_map(notifications).value
+        self.assertEqual(validated, notifications)
+        self.assertIsNot(validated, notifications)
+        self.assertIsInstance(validated, ValidatedMap)
+        self.assertEqual(len(calls), 12)
+        with validation.strict_instances():
+            self.assertEqual(validate_map(notifications), Valid(dict(notifications)))
+        self.assertEqual(len(calls), 24)
+
+        self.assertEqual(json.loads(json.dumps(encoding.general_to_json(notifications))),
+                         dict(self.payloads, **{'10': {'id': 10, 'message': 'new', 'seen': False},
+                                                '11': {'id': 11, 'message': 'x', 'seen': True}}))
+        copy = notifications.copy()
+        self.assertIsInstance(copy, ValidatedMap)
+        self.assertEqual(copy, notifications)
+
+    def test_invalid_map_changes_are_rejected(self):
+        notifications = ValidatedMap(Notification.validate, self.payloads)
+        with self.assertRaises(InvalidItemError) as raised:
+            notifications['0'] = {'id': 'x'}
+        self.assertEqual(raised.exception.invalid,
+                         Invalid({'0': Notification.validate({'id': 'x'}).reason}))
+        self.assertRaises(InvalidItemError, notifications.__setitem__, 1, self.payloads['1'])
+        self.assertRaises(InvalidItemError, notifications.update, {'20': self.payloads['1'], '21': None})
+        self.assertRaises(InvalidItemError, ValidatedMap, Notification.validate, {'0': None})
+        self.assertNotIn('20', notifications)
+        self.assertEqual(notifications['0'], Notification(0, 'm0', True))
+
+    def test_list_validates_changes_only(self):
+        validate_notification, calls = counting(Notification.validate)
+        notifications = ValidatedList(validate_notification, self.payloads.values())
+        notifications.append(self.payloads['0'])
+        notifications.insert(0, self.payloads['1'])
+        notifications[0] = self.payloads['2']
+        notifications[1:3] = [self.payloads['3']]
+        notifications += [self.payloads['4']]
+        self.assertEqual(len(calls), 15)
+        self.assertEqual([n.id for n in notifications], [2, 3, 2, 3, 4, 5, 6, 7, 8, 9, 0, 4])
+
+        validated = validate_list(validate_notification)(notifications).value
+        self.assertEqual(validated, notifications)
+        self.assertIsNot(validated, notifications)
+        result = Notifications.validate({'type': 'Notifications', 'data': ValidatedList(Notification.validate)})
+        self.assertIsInstance(result.value.data, ValidatedList)
+        self.assertEqual(len(calls), 15)
+        self.assertEqual(Notifications(notifications).encode(), Notifications(list(notifications)).encode())
+
+        self.assertRaises(InvalidItemError, notifications.append, {'id': 1})
+        self.assertRaises(InvalidItemError, notifications.extend, [self.payloads['0'], None])
+        self.assertRaises(InvalidItemError, notifications.__setitem__, slice(0, 1), [None])
+        self.assertEqual(len(notifications), 12)
+
+    def test_validated_values_keep_later_changes_out(self):
+        notifications = ValidatedList(Notification.validate, self.payloads.values())
+        value = Notifications.validate({'type': 'Notifications', 'data': notifications}).value
+        notifications.append(self.payloads['0'])
+        self.assertEqual(len(value.data), 10)
+
+    def test_only_validated_containers_themselves_are_trusted(self):
+        class Unchecked(ValidatedList):
+            def append(self, value):
+                list.append(self, value)
+
+        notifications = Unchecked(Notification.validate, self.payloads.values())
+        notifications.append(None)
+        self.assertIsInstance(validate_list(Notification.validate)(notifications), Invalid)
+
+        # Items put in past the checks are caught in strict mode
+        notifications = ValidatedMap(Notification.validate, self.payloads)
+        dict.__setitem__(notifications, '10', None)
+        with validation.strict_instances():
+            self.assertIsInstance(validate_string_map_of(Notification.validate)(notifications), Invalid)
+        with self.assertRaisesRegex(TypeError, 'item validator'):
+            ValidatedMap.fromkeys(['a'], Notification(1, 'a', False))
+
+    def test_pickling(self):
+        notifications = ValidatedMap(Notification.validate, self.payloads)
+        unpickled = pickle.loads(pickle.dumps(notifications))
+        self.assertIsInstance(unpickled, ValidatedMap)
+        self.assertEqual(unpickled, notifications)
+        self.assertIs(unpickled.item_validator, Notification.validate)
+
+        items = ValidatedList(validation.validate_int, [1, 2, 3])
+        unpickled = pickle.loads(pickle.dumps(items))
+        self.assertIsInstance(unpickled, ValidatedList)
+        self.assertEqual(unpickled, [1, 2, 3])
+        self.assertRaises(InvalidItemError, unpickled.append, 'x')
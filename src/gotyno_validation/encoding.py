@@ -1,5 +1,6 @@
 from enum import Enum
-from typing import Any, Callable, Dict, Type, TypeVar, Union, Optional, List
+from typing import Any, Callable, Dict, Tuple, Type, TypeVar, Union, Optional, List
+import json
 
 from gotyno_validation.validation import Unknown
 
@@ -8,6 +9,23 @@ Encoder = Callable[[T], str]
 ToJSON = Callable[[T], Any]
 ToJSONInterface = Dict[Type[T], Any]
 
+# Memoized encodings are kept on the instances themselves, in these attributes. Encodings longer
+# than this are not kept unless asked for, to bound the memory spent on them.
+ENCODED_ATTRIBUTE = '_encoded'
+ENCODED_BYTES_ATTRIBUTE = '_encoded_bytes'
+MEMOIZE_MAX_LENGTH = 64 * 1024
+
+
+class MemoizedEncoding:
+    """
+    The base of generated classes. Generated classes are slotted, so this gives them the slots that
+    memoized encodings are kept in. Slotted classes without them are encoded without memoizing.
+
+    The two slots cost 16 bytes on every instance, whether its encoding is memoized or not: a
+    `SomeType` takes 80 bytes instead of 64, against 352 for the same class with a `__dict__`.
+    """
+    __slots__ = (ENCODED_ATTRIBUTE, ENCODED_BYTES_ATTRIBUTE)
+
 
 def encode_basic(value: Union[str, int, float, bool]) -> str:
     """
@@ -128,4 +146,96 @@ def general_to_json(value: Unknown) -> Any:
     elif hasattr(value, "to_json"):
         return value.to_json()
     else:
-        raise ValueError(f"Unsupported type for 'general_to_json': {type(value)}")
\ No newline at end of file
+        raise ValueError(f"Unsupported type for 'general_to_json': {type(value)}")
+
+
+def memoized_encode(value: Any, *to_json_arguments: ToJSON[Any], max_length: int = MEMOIZE_MAX_LENGTH) -> str:
+    """
+    Encodes a generated value with its `encode()`, but keeps the encoding on the value so that
+    encoding it again costs nothing. Values are frozen, but lists and dicts in them can still be
+    changed in place, so only values without lists or dicts anywhere in them are memoized; others are
+    encoded every time. Generic values take the same `to_json` functions for their type parameters
+    as their `encode()`, and the encoding is only reused for the same functions.
+
+    Values nested in a value are encoded along with it rather than from their own memoized
+    encodings, so memoizing pays off for values that are encoded as a whole many times.
+
+    :param value: The value to encode.
+    :param to_json_arguments: The `to_json` functions for the type parameters of a generic value.
+    :param max_length: Encodings longer than this are returned but not kept.
+    :return: The encoded value.
+    """
+    encoded = _kept(value, ENCODED_ATTRIBUTE, to_json_arguments)
+    if encoded is not None:
+        return encoded
+
+    encoded = value.encode(*to_json_arguments)
+    if len(encoded) <= max_length and _immutable(value):
+        _keep(value, ENCODED_ATTRIBUTE, to_json_arguments, encoded)
+
+    return encoded
+
+
+def memoized_encode_bytes(value: Any, *to_json_arguments: ToJSON[Any], max_length: int = MEMOIZE_MAX_LENGTH) -> bytes:
+    """
+    Like `memoized_encode`, but keeps and returns the UTF-8 encoded bytes, ready to be written to
+    any number of sockets.
+    """
+    encoded = _kept(value, ENCODED_BYTES_ATTRIBUTE, to_json_arguments)
+    if encoded is not None:
+        return encoded
+
+    encoded = memoized_encode(value, *to_json_arguments, max_length=max_length).encode('utf-8')
+    if len(encoded) <= max_length and _immutable(value):
+        _keep(value, ENCODED_BYTES_ATTRIBUTE, to_json_arguments, encoded)
+
+    return encoded
+
+
+def _immutable(value: Any) -> bool:
+    """
+    Whether nothing in a value can be changed, as with frozen values that hold no lists or dicts.
+    """
+    if value is None or type(value) in (str, int, float, bool) or isinstance(value, Enum):
+        return True
+    if getattr(value, ENCODED_ATTRIBUTE, None) is not None or getattr(value, ENCODED_BYTES_ATTRIBUTE, None) is not None:
+        # Only immutable values have their encodings kept
+        return True
+    dataclass_fields = getattr(type(value), '__dataclass_fields__', None)
+    if dataclass_fields is None or not type(value).__dataclass_params__.frozen:
+        return False
+
+    return all(_immutable(getattr(value, name)) for name in dataclass_fields)
+
+
+def _kept(value: Any, attribute: str, to_json_arguments: Tuple[ToJSON[Any], ...]) -> Any:
+    kept = getattr(value, attribute, None)
+    if not isinstance(kept, tuple):
+        return kept if len(to_json_arguments) == 0 else None
+    # Encodings of generic values are kept along with the functions they were made with
+    arguments, encoded = kept
+    if len(arguments) == len(to_json_arguments) and all(a is b for a, b in zip(arguments, to_json_arguments)):
+        return encoded
+
+    return None
+
+
+def _keep(value: Any,
+          attribute: str,
+          to_json_arguments: Tuple[ToJSON[Any], ...],
+          encoded: Union[str, bytes]) -> None:
+    try:
+        object.__setattr__(value, attribute, (to_json_arguments, encoded) if len(to_json_arguments) > 0 else encoded)
+    except AttributeError:
+        # A slotted class without slots for encodings
+        pass
+
+
+def forget_encoding(value: Any) -> None:
+    """
+    Drops the memoized encodings of a value, but not those of the values nested in it.
+    """
+    for attribute in (ENCODED_ATTRIBUTE, ENCODED_BYTES_ATTRIBUTE):
+        if getattr(value, attribute, None) is not None:
+            object.__setattr__(value, attribute, None)
+
@@ -0,0 +1,100 @@
+import inspect
+import unittest
+from gotyno_validation import encoding, gotyno_output, notifications, validation
+from gotyno_validation.gotyno_output import (AnotherEvent, AnotherEventWithKind, Color, Definitely, Holder,
+                                             Launch, NotReally, SomeType)
+from gotyno_validation.loadgen import LoadProfile, generate_payloads
+from gotyno_validation.notifications import (AddNotificationError, CommandFailure, CommandSuccess, Notification,
+                                             NotificationNotAdded, Notifications)
+
+
+def generated_types():
+    for module in (gotyno_output, notifications):
+        for type_ in vars(module).values():
+            if isinstance(type_, type) and type_.__module__ == module.__name__ and hasattr(type_, 'validate'):
+                yield type_
+
+
+def to_json_arguments(value, to_json):
+    parameters = inspect.signature(type(value).encode).parameters
+
+    return [to_json for p in parameters if p.endswith('_to_json')]
+
+
+class TestEncoding(unittest.TestCase):
+    "A test suite for memoized encoding"
+
+    def test_same_output_as_encode(self):
+        values = [
+            SomeType('SomeType', 'å "quoted"', -5, None),
+            SomeType('SomeType', 'a', 2 ** 70, 'maybe'),
+            AnotherEvent(SomeType('SomeType', 'b', 1, None)),
+            AnotherEventWithKind(SomeType('SomeType', 'b', 1, None)),
+            Launch(),
+            CommandSuccess(Notifications([Notification(i, f'm{i}', i % 2 == 0) for i in range(5)])),
+            CommandFailure(NotificationNotAdded(AddNotificationError(1, Notification(1, 'å', False), 'e'))),
+        ]
+        for value in values:
+            self.assertEqual(encoding.memoized_encode(value), value.encode())
+            self.assertEqual(encoding.memoized_encode_bytes(value), value.encode().encode('utf-8'))
+
+        self.assertEqual(encoding.memoized_encode(Holder(Color.red), Color.to_json), Holder(Color.red).encode(Color.to_json))
+        list_to_json = encoding.list_to_json(encoding.basic_to_json)
+        self.assertEqual(encoding.memoized_encode(Definitely([1, 2]), list_to_json),
+                         Definitely([1, 2]).encode(list_to_json))
+        self.assertEqual(encoding.memoized_encode(NotReally()), NotReally().encode())
+
+    def test_same_output_as_encode_for_all_generated_types(self):
+        for type_ in generated_types():
+            parameters = [p for p in inspect.signature(type_.validate).parameters if p.startswith('validate_')]
+            # Type parameters are bigints, which `encode()` writes as strings
+            arguments = [validation.validate_bigint for _ in parameters]
+            validator = type_.validate(*arguments) if len(arguments) > 0 else type_.validate
+            payloads = generate_payloads(20, type_, *arguments, profile=LoadProfile(seed=3))
+            for payload in payloads:
+                value = validator(payload).value
+                arguments = to_json_arguments(value, encoding.bigint_to_json)
+                self.assertEqual(encoding.memoized_encode(value, *arguments), value.encode(*arguments))
+                self.assertEqual(encoding.memoized_encode_bytes(value, *arguments),
+                                 value.encode(*arguments).encode('utf-8'))
+
+    def test_encodings_are_kept_for_the_functions_they_were_made_with(self):
+        holder = Holder(2 ** 80)
+        self.assertEqual(encoding.memoized_encode(holder, encoding.bigint_to_json), f'{{"value": "{2 ** 80}"}}')
+        self.assertEqual(encoding.memoized_encode(holder, encoding.basic_to_json), f'{{"value": {2 ** 80}}}')
+        self.assertEqual(encoding.memoized_encode(holder, encoding.bigint_to_json), holder.encode(encoding.bigint_to_json))
+        self.assertEqual(encoding.memoized_encode_bytes(holder, encoding.basic_to_json),
+                         holder.encode(encoding.basic_to_json).encode('utf-8'))
+        kept = encoding.memoized_encode(holder, encoding.basic_to_json)
+        self.assertIs(encoding.memoized_encode(holder, encoding.basic_to_json), kept)
+
+    def test_encodings_are_kept_and_reused(self):
+        payload = SomeType('SomeType', 'b', 1, None)
+        first = encoding.memoized_encode(payload)
+        self.assertIs(encoding.memoized_encode(payload), first)
+        self.assertIs(encoding.memoized_encode_bytes(payload), encoding.memoized_encode_bytes(payload))
+
+        encoding.forget_encoding(payload)
+        self.assertEqual(encoding.memoized_encode(payload), first)
+        self.assertEqual(payload, SomeType('SomeType', 'b', 1, None))
+
+    def test_long_encodings_are_not_kept(self):
+        value = SomeType('SomeType', 'x' * 100, 1, None)
+        encoded = encoding.memoized_encode(value, max_length=50)
+        self.assertEqual(encoded, value.encode())
+        self.assertIsNone(getattr(value, encoding.ENCODED_ATTRIBUTE, None))
+
+    def test_values_holding_lists_or_dicts_are_not_kept(self):
+        notifications = Notifications([Notification(1, 'a', False)])
+        value = CommandSuccess(notifications)
+        self.assertEqual(encoding.memoized_encode(value), value.encode())
+        self.assertEqual(encoding.memoized_encode_bytes(notifications), notifications.encode().encode('utf-8'))
+        notifications.data.append(Notification(2, 'b', True))
+        self.assertEqual(encoding.memoized_encode(value), value.encode())
+        self.assertEqual(encoding.memoized_encode(notifications), notifications.encode())
+        self.assertEqual(encoding.memoized_encode_bytes(notifications), notifications.encode().encode('utf-8'))
+        self.assertIsNone(getattr(value, encoding.ENCODED_ATTRIBUTE, None))
+
+        # Values nested in them still are
+        kept = encoding.memoized_encode(notifications.data[0])
+        self.assertIs(encoding.memoized_encode(notifications.data[0]), kept)
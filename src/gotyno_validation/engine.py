@@ -0,0 +1,364 @@
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from gotyno_validation import errors
+from gotyno_validation import schema as s
+from gotyno_validation import validation
+from gotyno_validation.validation import Invalid, Unknown, Valid, ValidationResult, Validator
+
+# The iterative engine validates values against a schema with an explicit stack of frames instead
+# of Python recursion. Interfaces, lists and string maps get a frame each, everything else is
+# validated in place with the validator of its schema. Results, including error maps, are the same
+# as those of the recursive validators.
+#
+# With an error report the engine records errors as it finds them, with the JSON pointer of each
+# frame, and stops as soon as the report overflows.
+
+# Passed to frames in place of results that were already added to the error report
+_REPORTED = Invalid('reported')
+
+
+class _Frame:
+    """
+    A container being validated. `next_child` returns the next `(schema, value)` to validate, or
+    `None` once all children are done; `accept` receives the result for the last child.
+    """
+    __slots__ = ('path', 'report')
+
+    def __init__(self) -> None:
+        self.path = ''
+        self.report: Optional[errors.ErrorReport] = None
+
+    def next_child(self) -> Optional[Tuple[s.Schema, Unknown]]:
+        raise NotImplementedError()
+
+    def accept(self, result: ValidationResult[Any]) -> None:
+        raise NotImplementedError()
+
+    def finish(self) -> ValidationResult[Any]:
+        raise NotImplementedError()
+
+    def child_path(self) -> str:
+        raise NotImplementedError()
+
+    def child_code(self) -> str:
+        return errors.INVALID
+
+
+class _ListFrame(_Frame):
+    __slots__ = ('item_schema', 'items', 'index', 'errors', 'new_value')
+
+    def __init__(self, item_schema: s.Schema, items: List[Unknown]):
+        super().__init__()
+        self.item_schema = item_schema
+        self.items = items
+        self.index = -1
+        self.errors: Dict[str, Any] = dict()
+        self.new_value: List[Any] = list()
+
+    def next_child(self) -> Optional[Tuple[s.Schema, Unknown]]:
+        self.index += 1
+        if self.index >= len(self.items):
+            return None
+        return self.item_schema, self.items[self.index]
+
+    def accept(self, result: ValidationResult[Any]) -> None:
+        if isinstance(result, Invalid):
+            self.errors[str(self.index)] = result.reason
+        else:
+            self.new_value.append(result.value)
+
+    def child_path(self) -> str:
+        return errors.pointer(self.path, self.index)
+
+    def finish(self) -> ValidationResult[Any]:
+        if len(self.errors) > 0:
+            return Invalid(self.errors)
+        return Valid(self.new_value)
+
+
+class _StringMapFrame(_Frame):
+    __slots__ = ('value_schema', 'items', 'key', 'validated_key', 'errors', 'new_value',
+                 'check_keys')
+
+    def __init__(self, value_schema: s.Schema, value: Dict[Unknown, Unknown]):
+        super().__init__()
+        self.value_schema = value_schema
+        self.items = iter(value.items())
+        self.key: Unknown = None
+        self.validated_key: Unknown = None
+        self.errors: Dict[Unknown, Any] = dict()
+        self.new_value: Dict[str, Any] = dict()
+        self.check_keys = not validation._parsed_json.get()
+
+    def next_child(self) -> Optional[Tuple[s.Schema, Unknown]]:
+        for key, item in self.items:
+            self.key = key
+            self.validated_key = key
+            if self.check_keys:
+                key_result = validation.validate_string(key)
+                if isinstance(key_result, Invalid):
+                    self.errors[key] = key_result.reason
+                    if self.report is not None and not self.report.add(
+                            errors.pointer(self.path, key), errors.INVALID_KEY, key_result.reason):
+                        return None
+                    continue
+                self.validated_key = key_result.value
+            return self.value_schema, item
+
+        return None
+
+    def accept(self, result: ValidationResult[Any]) -> None:
+        if isinstance(result, Invalid):
+            self.errors[self.key] = result.reason
+        else:
+            self.new_value[self.validated_key] = result.value
+
+    def child_path(self) -> str:
+        return errors.pointer(self.path, self.key)
+
+    def finish(self) -> ValidationResult[Any]:
+        if len(self.errors) > 0:
+            return Invalid(self.errors)
+        return Valid(self.new_value)
+
+
+class _InterfaceFrame(_Frame):
+    __slots__ = ('schema', 'string_map', 'fields', 'key', 'missing', 'errors', 'new_value')
+
+    def __init__(self, schema: s.InterfaceSchema, string_map: Dict[str, Unknown]):
+        super().__init__()
+        self.schema = schema
+        self.string_map = string_map
+        self.fields = iter(schema.fields.items())
+        self.key: Optional[str] = None
+        self.missing = False
+        self.errors: Dict[str, Any] = dict()
+        self.new_value: Dict[str, Any] = dict()
+
+    def next_child(self) -> Optional[Tuple[s.Schema, Unknown]]:
+        for key, field_schema in self.fields:
+            self.key = key
+            self.missing = key not in self.string_map
+            return field_schema, None if self.missing else self.string_map[key]
+
+        return None
+
+    def accept(self, result: ValidationResult[Any]) -> None:
+        if isinstance(result, Invalid):
+            # `validate_interface` keeps the whole result for present fields but only the reason
+            # for missing ones
+            self.errors[self.key] = result.reason if self.missing else result
+            if self.report is not None and not self.missing:
+                self.report.wrap(self.child_path())
+        else:
+            self.new_value[self.key] = result.value
+
+    def child_path(self) -> str:
+        return errors.pointer(self.path, self.key)
+
+    def child_code(self) -> str:
+        return errors.MISSING if self.missing else errors.INVALID
+
+    def finish(self) -> ValidationResult[Any]:
+        if len(self.errors) > 0:
+            return Invalid(self.errors)
+        return Valid(validation.construct(self.schema.constructor, self.new_value))
+
+
+def _start(schema: s.Schema, value: Unknown) -> Union[_Frame, ValidationResult[Any]]:
+    """
+    Starts validating a value: containers give a frame, everything else a result right away.
+    """
+    while True:
+        if isinstance(schema, s.OptionalSchema):
+            if value is None:
+                return Valid(None)
+            schema = schema.inner
+            continue
+
+        if isinstance(schema, s.TaggedUnionSchema):
+            case = schema.cases.get(type(value).__name__)
+            if case is not None and type(value) is case.constructor:
+                return s.validator_of(case)(value)
+            as_string_map = validation.validate_string_map(value, validation.validate_unknown)
+            if isinstance(as_string_map, Invalid):
+                return as_string_map
+            value = as_string_map.value
+            if schema.tag_field not in value:
+                return Invalid(f'Missing tag field: {schema.tag_field}')
+            tag = value[schema.tag_field]
+            if tag not in schema.cases:
+                valid_type_tags = [t for t in schema.cases.keys()]
+                return Invalid(f'Invalid tag: {tag}, expecting one of {valid_type_tags}')
+            schema = schema.cases[tag]
+            continue
+
+        break
+
+    if isinstance(schema, s.InterfaceSchema):
+        if type(value) is schema.constructor:
+            return s.validator_of(schema)(value)
+        if schema.tag_field is not None:
+            has_type_tag = validation.validate_has_type_tag(value, schema.tag_field, schema.tag)
+            if isinstance(has_type_tag, Invalid):
+                return has_type_tag
+        as_string_map = validation.validate_string_map(value, validation.validate_unknown)
+        if isinstance(as_string_map, Invalid):
+            return as_string_map
+        return _InterfaceFrame(schema, as_string_map.value)
+
+    if isinstance(schema, s.ListSchema):
+        if not isinstance(value, list):
+            return Invalid(f'Expected list, got: {value} ({type(value)})')
+        return _ListFrame(schema.item, value)
+
+    if isinstance(schema, s.StringMapSchema):
+        if not isinstance(value, dict):
+            return Invalid('Expected dict')
+        return _StringMapFrame(schema.value, value)
+
+    return s.validator_of(schema)(value)
+
+
+class Validation:
+    """
+    A validation in progress. `run` advances it by a number of steps, so long validations can be
+    interleaved with other work; a step validates one child of a container.
+
+    If a report is given, errors are added to it as they are found instead of being collected in
+    nested error maps, and the validation stops once the report is full. The reason of an invalid
+    result is then the report itself.
+    """
+
+    def __init__(self,
+                 value: Unknown,
+                 schema: s.Schema,
+                 report: Optional[errors.ErrorReport] = None):
+        self._stack: List[_Frame] = []
+        self._result: Optional[ValidationResult[Any]] = None
+        self._report = report
+        self._parsed_json = validation._parsed_json.get()
+        started = _start(schema, value)
+        if isinstance(started, _Frame):
+            started.report = report
+            self._stack.append(started)
+        elif report is not None and isinstance(started, Invalid):
+            report.add_reason('', errors.INVALID, started.reason)
+            self._result = Invalid(report)
+        else:
+            self._result = started
+
+    @property
+    def done(self) -> bool:
+        """
+        Whether the validation has finished.
+        """
+        return self._result is not None
+
+    @property
+    def result(self) -> Optional[ValidationResult[Any]]:
+        """
+        The result of the validation, or `None` if it hasn't finished yet.
+        """
+        return self._result
+
+    def run(self, steps: Optional[int] = None) -> Optional[ValidationResult[Any]]:
+        """
+        Runs the validation for at most `steps` steps, or until it's done if `steps` is `None`.
+
+        :return: The result if the validation is done, otherwise `None`.
+        """
+        if self._result is not None:
+            return self._result
+
+        # Resumed validations keep the mode they were started in
+        token = validation._parsed_json.set(self._parsed_json)
+        try:
+            self._run(steps)
+        finally:
+            validation._parsed_json.reset(token)
+
+        return self._result
+
+    def _run(self, steps: Optional[int]) -> None:
+        stack = self._stack
+        report = self._report
+        while steps is None or steps > 0:
+            if steps is not None:
+                steps -= 1
+            frame = stack[-1]
+            child = frame.next_child()
+            if report is not None and report.truncated:
+                self._stop()
+                return
+            if child is None:
+                result = frame.finish()
+                stack.pop()
+                if report is not None and isinstance(result, Invalid):
+                    result = _REPORTED
+                if len(stack) == 0:
+                    self._result = Invalid(report) if result is _REPORTED else result
+                    return
+                stack[-1].accept(result)
+                continue
+
+            started = _start(child[0], child[1])
+            if isinstance(started, _Frame):
+                if report is not None:
+                    started.path = frame.child_path()
+                    started.report = report
+                stack.append(started)
+            elif report is not None and isinstance(started, Invalid):
+                if not report.add_reason(frame.child_path(), frame.child_code(), started.reason):
+                    self._stop()
+                    return
+                frame.accept(_REPORTED)
+            else:
+                frame.accept(started)
+
+    def _stop(self) -> None:
+        self._stack.clear()
+        self._result = Invalid(self._report)
+
+
+def validate_iteratively(value: Unknown, schema: s.Schema) -> ValidationResult[Any]:
+    """
+    Validates a value against a schema without recursion, giving the same result as the validator
+    of the schema. Nesting depth is only limited by memory.
+    """
+    return Validation(value, schema).run()
+
+
+def iterative_validator(type_: Any, *arguments: Any) -> Validator[Any]:
+    """
+    Creates a validator for a generated type that uses the iterative engine.
+
+    :param type_: The generated type to validate as.
+    :param arguments: Type arguments for generic types, as types or validators.
+    """
+    schema = s.schema_of(type_, *arguments)
+
+    def validate_iteratively_as_type(value: Unknown) -> ValidationResult[Any]:
+        return Validation(value, schema).run()
+
+    return validate_iteratively_as_type
+
+
+def validate_with_report(value: Unknown,
+                         type_: Any,
+                         *arguments: Any,
+                         max_errors: int = errors.DEFAULT_MAX_ERRORS) -> ValidationResult[Any]:
+    """
+    Validates a value as a generated type, reporting errors as a flat `errors.ErrorReport` of at
+    most `max_errors` entries. Validation stops at the first error that does not fit, so large
+    invalid payloads cost no more than the errors that are kept.
+
+    :param value: The value to validate.
+    :param type_: The generated type to validate as.
+    :param arguments: Type arguments for generic types, as types or validators.
+    :param max_errors: The most errors to keep.
+    :return: The validated value, or `Invalid` with the report as its reason.
+    """
+    report = errors.ErrorReport(max_errors)
+
+    return Validation(value, s.schema_of(type_, *arguments), report).run()
@@ -0,0 +1,85 @@
+import unittest
+from gotyno_validation import schema as s
+from gotyno_validation.engine import Validation, iterative_validator, validate_iteratively
+from gotyno_validation.gotyno_output import Event, Holder, Possibly, SomeType
+from gotyno_validation.notifications import NotificationCommandResult
+from gotyno_validation.validation import Invalid, Valid, parsed_json_source, validate_int
+
+
+class TestEngine(unittest.TestCase):
+    "A test suite for the iterative validation engine"
+
+    def assertSameAsValidate(self, value, type_, *arguments):
+        expected = s.validator_of(s.schema_of(type_, *arguments))(value)
+        self.assertEqual(iterative_validator(type_, *arguments)(value), expected)
+
+        return expected
+
+    def test_same_results_as_recursive_validators(self):
+        notifications = [{'id': i, 'message': f'{i}', 'seen': i % 2 == 0} for i in range(5)]
+        result = self.assertSameAsValidate({'type': 'CommandSuccess',
+                                            'data': {'type': 'Notifications', 'data': notifications}},
+                                           NotificationCommandResult)
+        self.assertIsInstance(result, Valid)
+        self.assertSameAsValidate({'type': 'AnotherEvent',
+                                   'data': {'type': 'SomeType', 'some_field': 'x', 'some_other_field': 1}},
+                                  Event)
+        self.assertSameAsValidate({'type': 'Definitely', 'data': 5}, Possibly, validate_int)
+        self.assertSameAsValidate({'value': 5}, Holder, validate_int)
+
+    def test_same_errors_as_recursive_validators(self):
+        result = self.assertSameAsValidate({'type': 'SomeType', 'some_field': 1}, SomeType)
+        self.assertIsInstance(result, Invalid)
+        self.assertSameAsValidate({'type': 'Unknown'}, Event)
+        self.assertSameAsValidate({'data': 'x'}, Event)
+        self.assertSameAsValidate([], Event)
+        self.assertSameAsValidate({'type': 'AnotherEvent', 'data': {'type': 'Other'}}, Event)
+        self.assertSameAsValidate({'type': 'Definitely', 'data': '5'}, Possibly, validate_int)
+        self.assertSameAsValidate({'type': 'CommandSuccess',
+                                   'data': {'type': 'Notifications',
+                                            'data': [{'id': 1}, 'x', {'id': 'a', 'message': 'm', 'seen': 1}]}},
+                                  NotificationCommandResult)
+
+        string_map = s.StringMapSchema(s.PrimitiveSchema(int))
+        value = {'a': 1, 'b': 'x', 1: 2}
+        self.assertEqual(validate_iteratively(value, string_map), s.validator_of(string_map)(value))
+        with parsed_json_source():
+            self.assertEqual(validate_iteratively(value, string_map), s.validator_of(string_map)(value))
+
+    def test_deep_nesting(self):
+        depth = 10000
+        schema = s.PrimitiveSchema(int)
+        value = 1
+        for _ in range(depth):
+            schema = s.ListSchema(schema)
+            value = [value]
+
+        result = validate_iteratively(value, schema)
+        self.assertIsInstance(result, Valid)
+        validated = result.value
+        for _ in range(depth):
+            self.assertEqual(len(validated), 1)
+            validated = validated[0]
+        self.assertEqual(validated, 1)
+
+        innermost = value
+        while isinstance(innermost[0], list):
+            innermost = innermost[0]
+        innermost[0] = 'x'
+        reason = validate_iteratively(value, schema).reason
+        for _ in range(depth - 1):
+            reason = reason['0']
+        self.assertEqual(reason, {'0': validate_int('x').reason})
+
+    def test_pause_and_resume(self):
+        value = {'type': 'CommandSuccess',
+                 'data': {'type': 'Notifications',
+                          'data': [{'id': i, 'message': f'{i}', 'seen': True} for i in range(20)]}}
+        validation = Validation(value, s.schema_of(NotificationCommandResult))
+        steps = 0
+        while validation.run(3) is None:
+            self.assertFalse(validation.done)
+            steps += 1
+        self.assertTrue(validation.done)
+        self.assertGreater(steps, 10)
+        self.assertEqual(validation.result, NotificationCommandResult.validate(value))
@@ -0,0 +1,158 @@
+from typing import Any, Dict, List, Set, Union
+from dataclasses import dataclass, field
+
+from gotyno_validation.validation import Invalid
+
+DEFAULT_MAX_ERRORS = 100
+
+MISSING = 'missing'
+INVALID = 'invalid'
+INVALID_KEY = 'invalid_key'
+
+# The key that `ErrorReport.to_reason` adds to the reasons of truncated reports
+TRUNCATED = '...'
+
+
+@dataclass(frozen=True)
+class ValidationError:
+    """
+    A single validation error. `path` is a JSON pointer to the invalid value, `code` tells what
+    kind of error it is and `message` is the reason given by the validator.
+    """
+    path: str
+    code: str
+    message: str
+
+
+@dataclass
+class ErrorReport:
+    """
+    A flat list of validation errors, holding at most `max_errors` of them. `truncated` is set
+    when more errors were found than could be kept.
+    """
+    max_errors: int = DEFAULT_MAX_ERRORS
+    errors: List[ValidationError] = field(default_factory=list)
+    truncated: bool = False
+    # The paths whose reasons are wrapped in `Invalid`, see `wrap`
+    _wrapped: Set[str] = field(default_factory=set, repr=False, compare=False)
+
+    @property
+    def full(self) -> bool:
+        """
+        Whether the report holds as many errors as it can.
+        """
+        return len(self.errors) >= self.max_errors
+
+    def add(self, path: str, code: str, message: str) -> bool:
+        """
+        Adds an error to the report.
+
+        :return: Whether there was room for the error; if not, the report is marked as truncated.
+        """
+        if self.full:
+            self.truncated = True
+            return False
+        self.errors.append(ValidationError(path, code, message))
+
+        return True
+
+    def add_reason(self, path: str, code: str, reason: Any) -> bool:
+        """
+        Adds the errors in a nested reason, as found in `Invalid`, under `path`.
+
+        :return: Whether there was room for all of the errors.
+        """
+        if isinstance(reason, Invalid):
+            self.wrap(path)
+            reason = reason.reason
+        if not isinstance(reason, dict):
+            return self.add(path, code, str(reason))
+
+        for key, value in reason.items():
+            if not self.add_reason(pointer(path, key), code, value):
+                return False
+
+        return True
+
+    def wrap(self, path: str) -> None:
+        """
+        Marks the reason at `path` as wrapped in `Invalid`, the way `validate_interface` keeps the
+        results of fields that are present but invalid, so that `to_reason` does the same.
+        """
+        self._wrapped.add(path)
+
+    def to_reason(self) -> Union[str, Dict[str, Any]]:
+        """
+        Converts the report to the nested shape of `Invalid.reason`, with the messages as leaves.
+        For a report that isn't truncated, this is the reason the validator gives, except that keys
+        which aren't strings come back as strings. The reason of a truncated report holds the
+        errors that were kept, and a message under the `TRUNCATED` key.
+
+        :raises ValueError: If an error is at the path of another error or one of its parents.
+        """
+        if len(self.errors) == 1 and self.errors[0].path == '' and not self.truncated:
+            return self.errors[0].message
+
+        reason: Dict[str, Any] = {}
+        # The error maps of the paths built so far, which nested errors are added to
+        maps: Dict[str, Dict[str, Any]] = {'': reason}
+        for error in self.errors:
+            if error.path == '' or error.path in maps:
+                raise ValueError(f'Error at "{error.path}" conflicts with other errors in the report')
+            parent_path, _, segment = error.path.rpartition('/')
+            node = self._map_at(parent_path, maps)
+            key = unescape(segment)
+            if key in node:
+                raise ValueError(f'Error at "{error.path}" conflicts with other errors in the report')
+            node[key] = Invalid(error.message) if error.path in self._wrapped else error.message
+        if self.truncated:
+            reason[TRUNCATED] = f'More than {self.max_errors} errors, the rest were left out'
+
+        return reason
+
+    def _map_at(self, path: str, maps: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        node = maps.get(path)
+        if node is not None:
+            return node
+        parent_path, _, segment = path.rpartition('/')
+        parent = self._map_at(parent_path, maps)
+        key = unescape(segment)
+        if key in parent:
+            raise ValueError(f'Errors below "{path}" conflict with the error at it')
+        node = maps[path] = {}
+        parent[key] = Invalid(node) if path in self._wrapped else node
+
+        return node
+
+    def to_json(self) -> Dict[str, Any]:
+        return {'errors': [{'path': e.path, 'code': e.code, 'message': e.message}
+                           for e in self.errors],
+                'truncated': self.truncated}
+
+
+def escape(key: Any) -> str:
+    """
+    Escapes a key for use as a JSON pointer segment.
+    """
+    return str(key).replace('~', '~0').replace('/', '~1')
+
+
+def unescape(segment: str) -> str:
+    return segment.replace('~1', '/').replace('~0', '~')
+
+
+def pointer(path: str, key: Any) -> str:
+    """
+    Extends a JSON pointer with a key.
+    """
+    return f'{path}/{escape(key)}'
+
+
+def report_of(reason: Any, max_errors: int = DEFAULT_MAX_ERRORS) -> ErrorReport:
+    """
+    Flattens the reason of an existing `Invalid` into a report.
+    """
+    report = ErrorReport(max_errors)
+    report.add_reason('', INVALID, reason)
+
+    return report
@@ -0,0 +1,71 @@
+import unittest
+from gotyno_validation import errors
+from gotyno_validation.engine import validate_with_report
+from gotyno_validation.errors import ErrorReport, ValidationError, report_of
+from gotyno_validation.loadgen import LoadProfile, generate_payloads
+from gotyno_validation.gotyno_output import Event, SomeType
+from gotyno_validation.notifications import NotificationCommandResult
+from gotyno_validation.validation import Invalid, Valid, validate_int, validate_string
+
+
+class TestErrors(unittest.TestCase):
+    "A test suite for structured error reports"
+
+    def test_valid_values_are_returned(self):
+        value = {'type': 'SomeType', 'some_field': 'x', 'some_other_field': 1}
+        self.assertEqual(validate_with_report(value, SomeType), SomeType.validate(value))
+        self.assertIsInstance(validate_with_report(value, SomeType), Valid)
+
+    def test_errors_have_paths_and_codes(self):
+        value = {'type': 'AnotherEvent', 'data': {'type': 'SomeType', 'some_field': 1, 'a/b': 2}}
+        result = validate_with_report(value, Event)
+        self.assertIsInstance(result, Invalid)
+        self.assertEqual(result.reason.errors,
+                         [ValidationError('/data/some_field', 'invalid', validate_string(1).reason),
+                          ValidationError('/data/some_other_field', 'missing', validate_int(None).reason)])
+        self.assertFalse(result.reason.truncated)
+
+        result = validate_with_report([], Event)
+        self.assertEqual(result.reason.errors, [ValidationError('', 'invalid', Event.validate([]).reason)])
+        self.assertEqual(result.reason.to_reason(), Event.validate([]).reason)
+
+    def test_errors_are_capped(self):
+        notifications = [{'id': 'x', 'message': 'm', 'seen': True} for _ in range(1000)]
+        value = {'type': 'CommandSuccess', 'data': {'type': 'Notifications', 'data': notifications}}
+        result = validate_with_report(value, NotificationCommandResult, max_errors=10)
+        self.assertEqual(len(result.reason.errors), 10)
+        self.assertTrue(result.reason.truncated)
+        self.assertEqual(result.reason.errors[9].path, '/data/data/9/id')
+
+    def test_nested_reason_adapter(self):
+        reason = {'data': Invalid({'items': {'0': 'bad', '1': 'worse'}, 'x/y': 'bad'})}
+        report = report_of(reason)
+        self.assertEqual([e.path for e in report.errors], ['/data/items/0', '/data/items/1', '/data/x~1y'])
+        self.assertEqual(report.to_reason(), {'data': Invalid({'items': {'0': 'bad', '1': 'worse'}, 'x/y': 'bad'})})
+
+        truncated = report_of(reason, max_errors=1)
+        self.assertTrue(truncated.truncated)
+        self.assertEqual(truncated.to_json(), {'errors': [{'path': '/data/items/0', 'code': 'invalid',
+                                                           'message': 'bad'}],
+                                               'truncated': True})
+        self.assertEqual(ErrorReport().to_reason(), {})
+        self.assertEqual(truncated.to_reason(), {'data': Invalid({'items': {'0': 'bad'}}),
+                                                 errors.TRUNCATED: 'More than 1 errors, the rest were left out'})
+
+    def test_reasons_are_those_of_the_validator(self):
+        profile = LoadProfile(seed=7, invalid_field_rate=0.3)
+        for type_ in (Event, NotificationCommandResult, SomeType):
+            for value in generate_payloads(100, type_, profile=profile):
+                expected = type_.validate(value)
+                result = validate_with_report(value, type_, max_errors=1000)
+                if isinstance(expected, Valid):
+                    self.assertEqual(result, expected)
+                else:
+                    self.assertFalse(result.reason.truncated)
+                    self.assertEqual(result.reason.to_reason(), expected.reason)
+                    self.assertEqual(report_of(expected.reason).to_reason(), expected.reason)
+
+        conflicting = ErrorReport()
+        conflicting.add('', errors.INVALID, 'bad')
+        conflicting.add('/a', errors.INVALID, 'bad')
+        self.assertRaises(ValueError, conflicting.to_reason)
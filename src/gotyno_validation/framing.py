@@ -0,0 +1,237 @@
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+import asyncio
+import socket
+import struct
+
+from gotyno_validation.validation import ValidationResult, Validator, validate_from_string
+
+# Frames are either a 4 byte big-endian length followed by that many bytes of JSON, or JSON
+# followed by a newline. Encoded JSON never contains a raw newline, so the latter needs no escaping.
+LENGTH_PREFIXED = 'length_prefixed'
+NEWLINE_DELIMITED = 'newline_delimited'
+
+DEFAULT_MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+_LENGTH = struct.Struct('>I')
+_NEWLINE = b'\n'
+_READ_SIZE = 64 * 1024
+# The most buffers a single `sendmsg` call takes
+_MAX_CHUNKS = 1024
+
+
+def _encode_value(value: Any) -> str:
+    return value.encode()
+
+
+def _check_framing(framing: str) -> None:
+    if framing not in (LENGTH_PREFIXED, NEWLINE_DELIMITED):
+        raise ValueError(f'Unknown framing: {framing}')
+
+
+def frame_chunks(values: Iterable[Any],
+                 framing: str = LENGTH_PREFIXED,
+                 encode: Callable[[Any], str] = _encode_value) -> List[bytes]:
+    """
+    Encodes values into frames, as a list of chunks meant for a single `writelines` or `sendmsg`
+    call. Payloads are not copied into one buffer; their headers or delimiters are separate chunks.
+
+    :param values: The values to frame.
+    :param framing: `LENGTH_PREFIXED` or `NEWLINE_DELIMITED`.
+    :param encode: Encodes a value as a JSON string; calls `encode()` on the value by default.
+    """
+    _check_framing(framing)
+    chunks = []
+    for value in values:
+        payload = encode(value).encode('utf-8')
+        if framing == LENGTH_PREFIXED:
+            chunks.append(_LENGTH.pack(len(payload)))
+            chunks.append(payload)
+        else:
+            chunks.append(payload)
+            chunks.append(_NEWLINE)
+
+    return chunks
+
+
+class FrameDecoder:
+    """
+    Decodes frames from a stream of bytes, validating each one with a validator. Received data goes
+    into one reusable buffer and frames are decoded straight from views of it.
+    """
+
+    def __init__(self,
+                 validator: Validator[Any],
+                 framing: str = LENGTH_PREFIXED,
+                 max_frame_size: int = DEFAULT_MAX_FRAME_SIZE):
+        _check_framing(framing)
+        self.validator = validator
+        self.framing = framing
+        self.max_frame_size = max_frame_size
+        self._buffer = bytearray()
+        # Where to continue looking for a newline, so that partial frames aren't searched twice
+        self._search_from = 0
+
+    @property
+    def buffered(self) -> int:
+        """
+        The number of bytes received that don't make up a whole frame yet.
+        """
+        return len(self._buffer)
+
+    def feed(self, data: bytes) -> List[ValidationResult[Any]]:
+        """
+        Adds received data and returns the results for all frames completed by it.
+
+        :raises ValueError: If a frame is larger than `max_frame_size`. Frames before it are returned
+                            first, and the error is raised by the next call, with no new data too.
+        """
+        self._buffer += data
+
+        return self._decode_frames()
+
+    def _decode_frames(self) -> List[ValidationResult[Any]]:
+        results = []
+        buffer = self._buffer
+        start = 0
+        with memoryview(buffer) as view:
+            while True:
+                if self.framing == LENGTH_PREFIXED:
+                    if len(buffer) - start < _LENGTH.size:
+                        break
+                    (length,) = _LENGTH.unpack_from(buffer, start)
+                    if length > self.max_frame_size:
+                        if len(results) > 0:
+                            break
+                        raise ValueError(f'Frame of {length} bytes exceeds the maximum of {self.max_frame_size}')
+                    end = start + _LENGTH.size + length
+                    if end > len(buffer):
+                        break
+                    results.append(self._decode(view[start + _LENGTH.size:end]))
+                    start = end
+                else:
+                    newline = buffer.find(_NEWLINE, max(start, self._search_from))
+                    end = len(buffer) if newline == -1 else newline
+                    if end - start > self.max_frame_size:
+                        if len(results) > 0:
+                            break
+                        raise ValueError(f'Frame exceeds the maximum of {self.max_frame_size} bytes')
+                    if newline == -1:
+                        self._search_from = len(buffer)
+                        break
+                    results.append(self._decode(view[start:newline]))
+                    start = newline + 1
+
+        # Deleting from the front of a bytearray doesn't move the rest of the data
+        del buffer[:start]
+        self._search_from = max(0, self._search_from - start)
+
+        return results
+
+    def _decode(self, frame: memoryview) -> ValidationResult[Any]:
+        return validate_from_string(frame, self.validator)
+
+
+def write_frames(stream: Any,
+                 values: Iterable[Any],
+                 framing: str = LENGTH_PREFIXED,
+                 encode: Callable[[Any], str] = _encode_value) -> None:
+    """
+    Writes values as frames in one vectored write to a socket, or one `writelines` call to a file.
+    Where sockets have no `sendmsg`, as on Windows, the frames are joined and sent with `sendall`.
+    """
+    chunks = frame_chunks(values, framing, encode)
+    if isinstance(stream, socket.socket):
+        _send_all(stream, chunks)
+    else:
+        stream.writelines(chunks)
+
+
+def _send_all(sock: socket.socket, chunks: List[bytes]) -> None:
+    if not hasattr(sock, 'sendmsg'):
+        # Windows has no `sendmsg`
+        sock.sendall(b''.join(chunks))
+        return
+
+    views = [memoryview(chunk) for chunk in chunks]
+    first = 0
+    while first < len(views):
+        sent = sock.sendmsg(views[first:first + _MAX_CHUNKS])
+        # Skip what was sent, which may end partway through a chunk
+        while sent > 0:
+            if sent >= len(views[first]):
+                sent -= len(views[first])
+                first += 1
+            else:
+                views[first] = views[first][sent:]
+                sent = 0
+
+
+def read_frames(stream: Any,
+                validator: Validator[Any],
+                framing: str = LENGTH_PREFIXED,
+                max_frame_size: int = DEFAULT_MAX_FRAME_SIZE) -> Iterator[ValidationResult[Any]]:
+    """
+    Reads and validates frames from a socket or binary file until it's exhausted. Reads go into a
+    single reusable buffer.
+
+    :raises ValueError: If the stream ends within a frame or a frame is too large.
+    """
+    decoder = FrameDecoder(validator, framing, max_frame_size)
+    chunk = bytearray(_READ_SIZE)
+    with memoryview(chunk) as view:
+        while True:
+            if isinstance(stream, socket.socket):
+                size = stream.recv_into(chunk)
+            else:
+                size = stream.readinto(chunk)
+            if not size:
+                break
+            yield from decoder.feed(view[:size])
+
+    if decoder.buffered > 0:
+        # Raises for a frame that is too large rather than only unfinished
+        decoder.feed(b'')
+        raise ValueError('Stream ended within a frame')
+
+
+class FrameProtocol(asyncio.Protocol):
+    """
+    An asyncio protocol for framed messages. `on_message` is called with the validation result of
+    each frame received; `send` writes any number of values with a single `writelines` call.
+    """
+
+    def __init__(self,
+                 validator: Validator[Any],
+                 on_message: Callable[[ValidationResult[Any]], None],
+                 framing: str = LENGTH_PREFIXED,
+                 encode: Callable[[Any], str] = _encode_value,
+                 max_frame_size: int = DEFAULT_MAX_FRAME_SIZE):
+        self.decoder = FrameDecoder(validator, framing, max_frame_size)
+        self.on_message = on_message
+        self.encode = encode
+        self.transport: Optional[asyncio.Transport] = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport
+
+    def data_received(self, data: bytes) -> None:
+        results = []
+        failed = False
+        try:
+            results = self.decoder.feed(data)
+            if len(results) > 0 and self.decoder.buffered > 0:
+                # A frame that is too large after these raises now rather than with the next data
+                self.decoder.feed(b'')
+        except ValueError:
+            failed = True
+        for result in results:
+            self.on_message(result)
+        if failed:
+            # The stream can't be resynchronized after a bad frame header
+            self.transport.close()
+
+    def send(self, values: Iterable[Any]) -> None:
+        """
+        Writes values as frames in one call to the transport.
+        """
+        self.transport.writelines(frame_chunks(values, self.decoder.framing, self.encode))
@@ -0,0 +1,133 @@
+import asyncio
+import io
+import socket
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from gotyno_validation import framing
+from gotyno_validation.gotyno_output import SomeType
+from gotyno_validation.validation import Invalid, Valid
+
+
+def some_type(i):
+    return SomeType(type='SomeType', some_field=f'ø {i}', some_other_field=i, maybe_some_field=None)
+
+
+class TestFraming(unittest.TestCase):
+    "A test suite for framing of encoded values"
+
+    def test_decoder_handles_partial_frames(self):
+        for mode in (framing.LENGTH_PREFIXED, framing.NEWLINE_DELIMITED):
+            values = [some_type(i) for i in range(5)]
+            data = b''.join(framing.frame_chunks(values, mode))
+            decoder = framing.FrameDecoder(SomeType.validate, mode)
+            results = []
+            for i in range(0, len(data), 7):
+                results.extend(decoder.feed(data[i:i + 7]))
+            self.assertEqual(results, [Valid(v) for v in values])
+            self.assertEqual(decoder.buffered, 0)
+
+    def test_invalid_frames(self):
+        decoder = framing.FrameDecoder(SomeType.validate, framing.NEWLINE_DELIMITED)
+        results = decoder.feed(b'{"type": "SomeType"}\nnot json\n\xff\n')
+        self.assertEqual([type(r) for r in results], [Invalid, Invalid, Invalid])
+        self.assertEqual(results[1], Invalid('Invalid JSON'))
+        self.assertEqual(results[2], Invalid('Invalid JSON'))
+
+        decoder = framing.FrameDecoder(SomeType.validate, max_frame_size=10)
+        with self.assertRaises(ValueError):
+            decoder.feed(b'\x00\x00\x00\xff')
+        with self.assertRaises(ValueError):
+            framing.FrameDecoder(SomeType.validate, 'other')
+
+    def test_frames_before_a_frame_that_is_too_large(self):
+        values = [some_type(i) for i in range(2)]
+        for mode in (framing.LENGTH_PREFIXED, framing.NEWLINE_DELIMITED):
+            size = max(len(v.encode().encode('utf-8')) for v in values)
+            large = b''.join(framing.frame_chunks([some_type(10 ** 20)], mode))
+            data = b''.join(framing.frame_chunks(values, mode)) + large
+
+            # Every frame is checked, even when its end arrives with the same data
+            decoder = framing.FrameDecoder(SomeType.validate, mode, max_frame_size=size)
+            self.assertEqual(decoder.feed(data), [Valid(v) for v in values])
+            with self.assertRaises(ValueError):
+                decoder.feed(b'')
+            with self.assertRaises(ValueError):
+                framing.FrameDecoder(SomeType.validate, mode, max_frame_size=size).feed(large)
+
+            results = []
+            with self.assertRaisesRegex(ValueError, 'exceeds the maximum'):
+                for result in framing.read_frames(io.BytesIO(data), SomeType.validate, mode, max_frame_size=size):
+                    results.append(result)
+            self.assertEqual(results, [Valid(v) for v in values])
+
+            received = []
+            protocol = framing.FrameProtocol(SomeType.validate, received.append, mode, max_frame_size=size)
+            protocol.connection_made(mock.Mock())
+            protocol.data_received(data)
+            self.assertEqual(received, [Valid(v) for v in values])
+            protocol.transport.close.assert_called_once_with()
+
+    def test_files_and_sockets(self):
+        values = [some_type(i) for i in range(1000)]
+        stream = io.BytesIO()
+        framing.write_frames(stream, values)
+        stream.seek(0)
+        self.assertEqual(list(framing.read_frames(stream, SomeType.validate)), [Valid(v) for v in values])
+
+        truncated = io.BytesIO(stream.getvalue()[:-1])
+        with self.assertRaises(ValueError):
+            list(framing.read_frames(truncated, SomeType.validate))
+
+        left, right = socket.socketpair()
+        with left, right:
+            framing.write_frames(left, values, framing.NEWLINE_DELIMITED)
+            left.shutdown(socket.SHUT_WR)
+            results = list(framing.read_frames(right, SomeType.validate, framing.NEWLINE_DELIMITED))
+        self.assertEqual(results, [Valid(v) for v in values])
+
+    def test_sockets_with_partial_or_no_vectored_sends(self):
+        class PartialSends(socket.socket):
+            def sendmsg(self, buffers):
+                return super().sendmsg([b''.join(buffers)[:7]])
+
+        class NoVectoredSends(socket.socket):
+            @property
+            def sendmsg(self):
+                raise AttributeError('sendmsg')
+
+        values = [some_type(i) for i in range(200)]
+        for class_ in (PartialSends, NoVectoredSends):
+            left, right = socket.socketpair()
+            with class_(fileno=left.detach()) as left, right, ThreadPoolExecutor(1) as executor:
+                # Small sends fill the socket buffer quickly, so frames are read while they're sent
+                results = executor.submit(lambda: list(framing.read_frames(right, SomeType.validate)))
+                framing.write_frames(left, values)
+                left.shutdown(socket.SHUT_WR)
+                self.assertEqual(results.result(timeout=10), [Valid(v) for v in values])
+
+    def test_protocol(self):
+        values = [some_type(i) for i in range(10)]
+
+        async def exchange():
+            received = []
+            done = asyncio.get_running_loop().create_future()
+
+            def on_message(result):
+                received.append(result)
+                if len(received) == len(values):
+                    done.set_result(None)
+
+            server = await asyncio.get_running_loop().create_server(
+                lambda: framing.FrameProtocol(SomeType.validate, on_message), '127.0.0.1', 0)
+            async with server:
+                port = server.sockets[0].getsockname()[1]
+                transport, protocol = await asyncio.get_running_loop().create_connection(
+                    lambda: framing.FrameProtocol(SomeType.validate, lambda result: None), '127.0.0.1', port)
+                protocol.send(values)
+                await asyncio.wait_for(done, 5)
+                transport.close()
+
+            return received
+
+        self.assertEqual(asyncio.run(exchange()), [Valid(v) for v in values])
@@ -4,10 +4,12 @@ import enum
 from dataclasses import dataclass
 from gotyno_validation import validation
 from gotyno_validation import encoding
+binary = validation.import_on_first_use('gotyno_validation.binary')
+views = validation.import_on_first_use('gotyno_validation.views')
 
 
-@dataclass(frozen=True)
-class SomeType:
+@dataclass(frozen=True, slots=True)
+class SomeType(encoding.MemoizedEncoding):
     type: typing.Literal['SomeType']
     some_field: str
     some_other_field: int
@@ -18,8 +20,10 @@ class SomeType:
         return validation.validate_interface(value, {'type': validation.validate_literal('SomeType'), 'some_field': validation.validate_string, 'some_other_field': validation.validate_int, 'maybe_some_field': validation.validate_optional(validation.validate_string)}, SomeType)
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes]) -> validation.ValidationResult['SomeType']:
-        return validation.validate_from_string(string, SomeType.validate)
+    def decode(string: validation.JSONText, lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['SomeType']:
+        if lazy:
+            return views.decode_view(string, SomeType, offset=offset, length=length)
+        return validation.validate_from_string(string, SomeType.validate, offset=offset, length=length)
 
     def to_json(self) -> typing.Dict[str, typing.Any]:
         return {'type': 'SomeType', 'some_field': self.some_field, 'some_other_field': self.some_other_field, 'maybe_some_field': encoding.optional_to_json(encoding.basic_to_json)(self.maybe_some_field)}
@@ -27,23 +31,35 @@ class SomeType:
     def encode(self) -> str:
         return json.dumps(self.to_json())
 
+    @staticmethod
+    def from_binary(data: validation.Buffer, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['SomeType']:
+        return binary.from_binary(data, SomeType, offset=offset, length=length)
+
+    def to_binary(self) -> bytes:
+        return binary.to_binary(self, SomeType)
+
 
 T = typing.TypeVar('T')
 
 
-@dataclass(frozen=True)
-class Holder(typing.Generic[T]):
+@dataclass(frozen=True, slots=True)
+class Holder(encoding.MemoizedEncoding, typing.Generic[T]):
     value: T
 
     @staticmethod
+    @validation.specialized
     def validate(validate_T: validation.Validator[T]) -> validation.Validator['Holder[T]']:
+        interface = {'value': validate_T}
+
         def validate_HolderT(value: validation.Unknown) -> validation.ValidationResult['Holder[T]']:
-            return validation.validate_interface(value, {'value': validate_T}, Holder)
+            return validation.validate_interface(value, interface, Holder)
         return validate_HolderT
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes], validate_T: validation.Validator[T]) -> validation.ValidationResult['Holder[T]']:
-        return validation.validate_from_string(string, Holder.validate(validate_T))
+    def decode(string: validation.JSONText, validate_T: validation.Validator[T], lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['Holder[T]']:
+        if lazy:
+            return views.decode_view(string, Holder, validate_T, offset=offset, length=length)
+        return validation.validate_from_string(string, Holder.validate(validate_T), offset=offset, length=length)
 
     def to_json(self, T_to_json: encoding.ToJSON[T]) -> typing.Dict[str, typing.Any]:
         return {'value': T_to_json(self.value)}
@@ -51,15 +67,27 @@ class Holder(typing.Generic[T]):
     def encode(self, T_to_json: encoding.ToJSON[T]) -> str:
         return json.dumps(self.to_json(T_to_json))
 
+    @staticmethod
+    def from_binary(data: validation.Buffer, validate_T: validation.Validator[T], offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['Holder[T]']:
+        return binary.from_binary(data, Holder, validate_T, offset=offset, length=length)
+
+    def to_binary(self) -> bytes:
+        return binary.to_binary(self, Holder, validation.validate_unknown)
+
+
+class Event(encoding.MemoizedEncoding):
+    __tag_field__ = 'type'
+    __slots__ = ()
 
-class Event:
     @staticmethod
     def validate(value: validation.Unknown) -> validation.ValidationResult['Event']:
         return validation.validate_with_type_tags(value, 'type', {'Notification': Notification.validate, 'Launch': Launch.validate, 'AnotherEvent': AnotherEvent.validate})
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes]) -> validation.ValidationResult['Event']:
-        return validation.validate_from_string(string, Event.validate)
+    def decode(string: validation.JSONText, lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['Event']:
+        if lazy:
+            return views.decode_view(string, Event, offset=offset, length=length)
+        return validation.validate_from_string(string, Event.validate, offset=offset, length=length)
 
     def to_json(self) -> typing.Dict[str, typing.Any]:
         raise NotImplementedError(
@@ -69,8 +97,16 @@ class Event:
         raise NotImplementedError(
             '`encode` is not implemented for base class `Event`')
 
+    @staticmethod
+    def from_binary(data: validation.Buffer, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['Event']:
+        return binary.from_binary(data, Event, offset=offset, length=length)
+
+    def to_binary(self) -> bytes:
+        raise NotImplementedError(
+            '`to_binary` is not implemented for base class `Event`')
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Notification(Event):
     data: str
 
@@ -79,8 +115,10 @@ class Notification(Event):
         return validation.validate_with_type_tag(value, 'type', 'Notification', {'data': validation.validate_string}, Notification)
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes]) -> validation.ValidationResult['Notification']:
-        return validation.validate_from_string(string, Notification.validate)
+    def decode(string: validation.JSONText, lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['Notification']:
+        if lazy:
+            return views.decode_view(string, Notification, offset=offset, length=length)
+        return validation.validate_from_string(string, Notification.validate, offset=offset, length=length)
 
     def to_json(self) -> typing.Dict[str, typing.Any]:
         return {'type': 'Notification', 'data': self.data}
@@ -88,16 +126,25 @@ class Notification(Event):
     def encode(self) -> str:
         return json.dumps(self.to_json())
 
+    @staticmethod
+    def from_binary(data: validation.Buffer, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['Notification']:
+        return binary.from_binary(data, Notification, offset=offset, length=length)
+
+    def to_binary(self) -> bytes:
+        return binary.to_binary(self, Notification)
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Launch(Event):
     @staticmethod
     def validate(value: validation.Unknown) -> validation.ValidationResult['Launch']:
         return validation.validate_with_type_tag(value, 'type', 'Launch', {}, Launch)
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes]) -> validation.ValidationResult['Launch']:
-        return validation.validate_from_string(string, Launch.validate)
+    def decode(string: validation.JSONText, lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['Launch']:
+        if lazy:
+            return views.decode_view(string, Launch, offset=offset, length=length)
+        return validation.validate_from_string(string, Launch.validate, offset=offset, length=length)
 
     def to_json(self) -> typing.Dict[str, typing.Any]:
         return {'type': 'Launch'}
@@ -105,8 +152,15 @@ class Launch(Event):
     def encode(self) -> str:
         return json.dumps(self.to_json())
 
+    @staticmethod
+    def from_binary(data: validation.Buffer, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['Launch']:
+        return binary.from_binary(data, Launch, offset=offset, length=length)
+
+    def to_binary(self) -> bytes:
+        return binary.to_binary(self, Launch)
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class AnotherEvent(Event):
     data: SomeType
 
@@ -115,8 +169,10 @@ class AnotherEvent(Event):
         return validation.validate_with_type_tag(value, 'type', 'AnotherEvent', {'data': SomeType.validate}, AnotherEvent)
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes]) -> validation.ValidationResult['AnotherEvent']:
-        return validation.validate_from_string(string, AnotherEvent.validate)
+    def decode(string: validation.JSONText, lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['AnotherEvent']:
+        if lazy:
+            return views.decode_view(string, AnotherEvent, offset=offset, length=length)
+        return validation.validate_from_string(string, AnotherEvent.validate, offset=offset, length=length)
 
     def to_json(self) -> typing.Dict[str, typing.Any]:
         return {'type': 'AnotherEvent', 'data': self.data.to_json()}
@@ -124,15 +180,27 @@ class AnotherEvent(Event):
     def encode(self) -> str:
         return json.dumps(self.to_json())
 
+    @staticmethod
+    def from_binary(data: validation.Buffer, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['AnotherEvent']:
+        return binary.from_binary(data, AnotherEvent, offset=offset, length=length)
+
+    def to_binary(self) -> bytes:
+        return binary.to_binary(self, AnotherEvent)
+
+
+class EventWithKind(encoding.MemoizedEncoding):
+    __tag_field__ = 'kind'
+    __slots__ = ()
 
-class EventWithKind:
     @staticmethod
     def validate(value: validation.Unknown) -> validation.ValidationResult['EventWithKind']:
         return validation.validate_with_type_tags(value, 'kind', {'NotificationWithKind': NotificationWithKind.validate, 'LaunchWithKind': LaunchWithKind.validate, 'AnotherEventWithKind': AnotherEventWithKind.validate})
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes]) -> validation.ValidationResult['EventWithKind']:
-        return validation.validate_from_string(string, EventWithKind.validate)
+    def decode(string: validation.JSONText, lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['EventWithKind']:
+        if lazy:
+            return views.decode_view(string, EventWithKind, offset=offset, length=length)
+        return validation.validate_from_string(string, EventWithKind.validate, offset=offset, length=length)
 
     def to_json(self) -> typing.Dict[str, typing.Any]:
         raise NotImplementedError(
@@ -142,8 +210,16 @@ class EventWithKind:
         raise NotImplementedError(
             '`encode` is not implemented for base class `EventWithKind`')
 
+    @staticmethod
+    def from_binary(data: validation.Buffer, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['EventWithKind']:
+        return binary.from_binary(data, EventWithKind, offset=offset, length=length)
+
+    def to_binary(self) -> bytes:
+        raise NotImplementedError(
+            '`to_binary` is not implemented for base class `EventWithKind`')
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NotificationWithKind(EventWithKind):
     data: str
 
@@ -152,8 +228,10 @@ class NotificationWithKind(EventWithKind):
         return validation.validate_with_type_tag(value, 'kind', 'NotificationWithKind', {'data': validation.validate_string}, NotificationWithKind)
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes]) -> validation.ValidationResult['NotificationWithKind']:
-        return validation.validate_from_string(string, NotificationWithKind.validate)
+    def decode(string: validation.JSONText, lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['NotificationWithKind']:
+        if lazy:
+            return views.decode_view(string, NotificationWithKind, offset=offset, length=length)
+        return validation.validate_from_string(string, NotificationWithKind.validate, offset=offset, length=length)
 
     def to_json(self) -> typing.Dict[str, typing.Any]:
         return {'kind': 'NotificationWithKind', 'data': self.data}
@@ -161,16 +239,25 @@ class NotificationWithKind(EventWithKind):
     def encode(self) -> str:
         return json.dumps(self.to_json())
 
+    @staticmethod
+    def from_binary(data: validation.Buffer, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['NotificationWithKind']:
+        return binary.from_binary(data, NotificationWithKind, offset=offset, length=length)
+
+    def to_binary(self) -> bytes:
+        return binary.to_binary(self, NotificationWithKind)
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class LaunchWithKind(EventWithKind):
     @staticmethod
     def validate(value: validation.Unknown) -> validation.ValidationResult['LaunchWithKind']:
         return validation.validate_with_type_tag(value, 'kind', 'LaunchWithKind', {}, LaunchWithKind)
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes]) -> validation.ValidationResult['LaunchWithKind']:
-        return validation.validate_from_string(string, LaunchWithKind.validate)
+    def decode(string: validation.JSONText, lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['LaunchWithKind']:
+        if lazy:
+            return views.decode_view(string, LaunchWithKind, offset=offset, length=length)
+        return validation.validate_from_string(string, LaunchWithKind.validate, offset=offset, length=length)
 
     def to_json(self) -> typing.Dict[str, typing.Any]:
         return {'kind': 'LaunchWithKind'}
@@ -178,8 +265,15 @@ class LaunchWithKind(EventWithKind):
     def encode(self) -> str:
         return json.dumps(self.to_json())
 
+    @staticmethod
+    def from_binary(data: validation.Buffer, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['LaunchWithKind']:
+        return binary.from_binary(data, LaunchWithKind, offset=offset, length=length)
 
-@dataclass(frozen=True)
+    def to_binary(self) -> bytes:
+        return binary.to_binary(self, LaunchWithKind)
+
+
+@dataclass(frozen=True, slots=True)
 class AnotherEventWithKind(EventWithKind):
     data: SomeType
 
@@ -188,8 +282,10 @@ class AnotherEventWithKind(EventWithKind):
         return validation.validate_with_type_tag(value, 'kind', 'AnotherEventWithKind', {'data': SomeType.validate}, AnotherEventWithKind)
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes]) -> validation.ValidationResult['AnotherEventWithKind']:
-        return validation.validate_from_string(string, AnotherEventWithKind.validate)
+    def decode(string: validation.JSONText, lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['AnotherEventWithKind']:
+        if lazy:
+            return views.decode_view(string, AnotherEventWithKind, offset=offset, length=length)
+        return validation.validate_from_string(string, AnotherEventWithKind.validate, offset=offset, length=length)
 
     def to_json(self) -> typing.Dict[str, typing.Any]:
         return {'kind': 'AnotherEventWithKind', 'data': self.data.to_json()}
@@ -197,20 +293,35 @@ class AnotherEventWithKind(EventWithKind):
     def encode(self) -> str:
         return json.dumps(self.to_json())
 
+    @staticmethod
+    def from_binary(data: validation.Buffer, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['AnotherEventWithKind']:
+        return binary.from_binary(data, AnotherEventWithKind, offset=offset, length=length)
+
+    def to_binary(self) -> bytes:
+        return binary.to_binary(self, AnotherEventWithKind)
+
 
 T = typing.TypeVar('T')
 
 
-class Possibly(typing.Generic[T]):
+class Possibly(encoding.MemoizedEncoding, typing.Generic[T]):
+    __tag_field__ = 'type'
+    __slots__ = ()
+
     @staticmethod
+    @validation.specialized
     def validate(validate_T: validation.Validator[T]) -> validation.Validator['Possibly[T]']:
+        tagged_validators = {'NotReally': NotReally.validate, 'Definitely': Definitely.validate(validate_T)}
+
         def validate_PossiblyT(value: validation.Unknown) -> validation.ValidationResult['Possibly[T]']:
-            return validation.validate_with_type_tags(value, 'type', {'NotReally': NotReally.validate, 'Definitely': Definitely.validate(validate_T)})
+            return validation.validate_with_type_tags(value, 'type', tagged_validators)
         return validate_PossiblyT
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes], validate_T: validation.Validator[T]) -> validation.ValidationResult['Possibly[T]']:
-        return validation.validate_from_string(string, Possibly.validate(validate_T))
+    def decode(string: validation.JSONText, validate_T: validation.Validator[T], lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['Possibly[T]']:
+        if lazy:
+            return views.decode_view(string, Possibly, validate_T, offset=offset, length=length)
+        return validation.validate_from_string(string, Possibly.validate(validate_T), offset=offset, length=length)
 
     def to_json(self) -> typing.Dict[str, typing.Any]:
         raise NotImplementedError(
@@ -220,16 +331,26 @@ class Possibly(typing.Generic[T]):
         raise NotImplementedError(
             '`encode` is not implemented for base class `Possibly`')
 
+    @staticmethod
+    def from_binary(data: validation.Buffer, validate_T: validation.Validator[T], offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['Possibly[T]']:
+        return binary.from_binary(data, Possibly, validate_T, offset=offset, length=length)
 
-@dataclass(frozen=True)
+    def to_binary(self) -> bytes:
+        raise NotImplementedError(
+            '`to_binary` is not implemented for base class `Possibly`')
+
+
+@dataclass(frozen=True, slots=True)
 class NotReally(Possibly[T]):
     @staticmethod
     def validate(value: validation.Unknown) -> validation.ValidationResult['NotReally']:
         return validation.validate_with_type_tag(value, 'type', 'NotReally', {}, NotReally)
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes]) -> validation.ValidationResult['NotReally']:
-        return validation.validate_from_string(string, NotReally.validate)
+    def decode(string: validation.JSONText, lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['NotReally']:
+        if lazy:
+            return views.decode_view(string, NotReally, offset=offset, length=length)
+        return validation.validate_from_string(string, NotReally.validate, offset=offset, length=length)
 
     def to_json(self) -> typing.Dict[str, typing.Any]:
         return {'type': 'NotReally'}
@@ -237,20 +358,32 @@ class NotReally(Possibly[T]):
     def encode(self) -> str:
         return json.dumps(self.to_json())
 
+    @staticmethod
+    def from_binary(data: validation.Buffer, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['NotReally']:
+        return binary.from_binary(data, NotReally, offset=offset, length=length)
+
+    def to_binary(self) -> bytes:
+        return binary.to_binary(self, NotReally)
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Definitely(Possibly[T]):
     data: T
 
     @staticmethod
+    @validation.specialized
     def validate(validate_T: validation.Validator[T]) -> validation.Validator['Definitely[T]']:
+        interface = {'data': validate_T}
+
         def validate_DefinitelyT(value: validation.Unknown) -> validation.ValidationResult['Definitely[T]']:
-            return validation.validate_with_type_tag(value, 'type', 'Definitely', {'data': validate_T}, Definitely)
+            return validation.validate_with_type_tag(value, 'type', 'Definitely', interface, Definitely)
         return validate_DefinitelyT
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes], validate_T: validation.Validator[T]) -> validation.ValidationResult['Definitely[T]']:
-        return validation.validate_from_string(string, Definitely.validate(validate_T))
+    def decode(string: validation.JSONText, validate_T: validation.Validator[T], lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['Definitely[T]']:
+        if lazy:
+            return views.decode_view(string, Definitely, validate_T, offset=offset, length=length)
+        return validation.validate_from_string(string, Definitely.validate(validate_T), offset=offset, length=length)
 
     def to_json(self, T_to_json: encoding.ToJSON[T]) -> typing.Dict[str, typing.Any]:
         return {'type': 'Definitely', 'data': T_to_json(self.data)}
@@ -258,6 +391,13 @@ class Definitely(Possibly[T]):
     def encode(self, T_to_json: encoding.ToJSON[T]) -> str:
         return json.dumps(self.to_json(T_to_json))
 
+    @staticmethod
+    def from_binary(data: validation.Buffer, validate_T: validation.Validator[T], offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['Definitely[T]']:
+        return binary.from_binary(data, Definitely, validate_T, offset=offset, length=length)
+
+    def to_binary(self) -> bytes:
+        return binary.to_binary(self, Definitely, validation.validate_unknown)
+
 
 class Color(enum.Enum):
     red = 'ff0000'
@@ -269,11 +409,18 @@ class Color(enum.Enum):
         return validation.validate_enumeration_member(value, Color)
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes]) -> validation.ValidationResult['Color']:
-        return validation.validate_from_string(string, Color.validate)
+    def decode(string: validation.JSONText, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['Color']:
+        return validation.validate_from_string(string, Color.validate, offset=offset, length=length)
 
     def to_json(self) -> typing.Any:
         return self.value
 
     def encode(self) -> str:
         return str(self.value)
+
+    @staticmethod
+    def from_binary(data: validation.Buffer, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['Color']:
+        return binary.from_binary(data, Color, offset=offset, length=length)
+
+    def to_binary(self) -> bytes:
+        return binary.to_binary(self, Color)
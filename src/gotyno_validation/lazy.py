@@ -0,0 +1,268 @@
+from typing import Any, Callable, Dict, List, Set, Tuple
+from dataclasses import dataclass
+from types import CodeType, ModuleType
+import ast
+import hashlib
+import importlib.util
+import inspect
+import sys
+import threading
+import time
+
+# Generated modules are a run of top-level statements: imports and type variables, then one class
+# per type, each optionally preceded by decorators. A lazily loaded module runs everything but the
+# classes right away and defines a class when it is first referenced, through the module
+# `__getattr__`. Functions look up other types in the module globals, where `__getattr__` does not
+# apply, so defining a class also defines every type it refers to.
+#
+# Modules are split with `ast`, which gives the lines of each top-level class statement. Classes
+# that aren't top-level statements, like ones defined under an `if`, stay in the preamble.
+
+
+@dataclass(frozen=True)
+class TypeDefinition:
+    """
+    The source of one generated type and the other types it refers to. Types in `bases` are needed
+    to create the class; `references` are only needed once its methods are called.
+    """
+    name: str
+    source: str
+    first_line: int
+    bases: Tuple[str, ...]
+    references: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class ModuleLayout:
+    """
+    A generated module split into its preamble and its type definitions.
+    """
+    name: str
+    filename: str
+    source_hash: str
+    preamble: str
+    definitions: Dict[str, TypeDefinition]
+
+
+def layout_of(module_name: str) -> ModuleLayout:
+    """
+    Reads the source of a generated module and splits it into type definitions, without importing
+    it.
+    """
+    spec = importlib.util.find_spec(module_name)
+    if spec is None or spec.origin is None:
+        raise ValueError(f'Cannot find generated module: {module_name}')
+    with open(spec.origin, encoding='utf-8') as f:
+        source = f.read()
+
+    return split_module(module_name, spec.origin, source)
+
+
+def split_module(module_name: str, filename: str, source: str) -> ModuleLayout:
+    """
+    Splits the source of a generated module into its preamble and type definitions.
+
+    :raises SyntaxError: If the source doesn't parse.
+    """
+    tree = ast.parse(source, filename)
+    lines = source.splitlines(keepends=True)
+    classes = [node for node in tree.body if isinstance(node, ast.ClassDef)]
+    names = {node.name for node in classes}
+    definitions = dict()
+    for node in classes:
+        first_line = min([node.lineno] + [d.lineno for d in node.decorator_list])
+        statement = ''.join(lines[first_line - 1:node.end_lineno])
+        creation_names, all_names = _referenced_names(node)
+        bases = _referenced_types(creation_names, names, node.name)
+        references = _referenced_types(all_names, names, node.name)
+        definitions[node.name] = TypeDefinition(node.name, statement, first_line, bases,
+                                                tuple(r for r in references if r not in bases))
+        # Blank lines are kept in the preamble so that line numbers in tracebacks stay right
+        for i in range(first_line - 1, node.end_lineno):
+            lines[i] = '\n'
+
+    source_hash = hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+    return ModuleLayout(module_name, filename, source_hash, ''.join(lines), definitions)
+
+
+def _referenced_names(node: ast.ClassDef) -> Tuple[List[str], List[str]]:
+    """
+    The names used by a class in source order, in one pass over it: first those used when it is
+    created, in its decorators, bases and body, including method signatures and decorators but not
+    method bodies, then all of them.
+    """
+    creation: List[str] = []
+    names: List[str] = []
+    stack: List[Tuple[ast.AST, bool]] = [(node, True)]
+    while len(stack) > 0:
+        node, creating = stack.pop()
+        if isinstance(node, ast.Name):
+            if creating:
+                creation.append(node.id)
+            names.append(node.id)
+            continue
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            signature = node.decorator_list + [node.args] + ([node.returns] if node.returns else [])
+            children = [(c, creating) for c in signature] + [(c, False) for c in node.body]
+        elif isinstance(node, ast.Lambda):
+            children = [(node.args, creating), (node.body, False)]
+        else:
+            children = [(c, creating) for c in ast.iter_child_nodes(node)]
+        # Reversed so that children are taken off the stack in order
+        stack.extend(reversed(children))
+
+    return creation, names
+
+
+def _referenced_types(found: List[str], names: Set[str], own_name: str) -> Tuple[str, ...]:
+    return tuple(dict.fromkeys(n for n in found if n in names and n != own_name))
+
+
+def compile_type_definition(layout: ModuleLayout, definition: TypeDefinition) -> CodeType:
+    """
+    Compiles the class statement of a type. Padding keeps its line numbers the same as in the
+    module.
+    """
+    source = '\n' * (definition.first_line - 1) + definition.source
+
+    return compile(source, layout.filename, 'exec')
+
+
+class _LazyTypes:
+    """
+    Defines the types of a lazily loaded module on demand. Definitions happen under a lock, so that
+    threads referring to the same type at once all get the one class.
+    """
+
+    def __init__(self,
+                 layout: ModuleLayout,
+                 namespace: Dict[str, Any],
+                 compile_definition: Callable[[ModuleLayout, TypeDefinition], CodeType]):
+        self.layout = layout
+        self.namespace = namespace
+        self.compile_definition = compile_definition
+        self.started: Set[str] = set()
+        self._lock = threading.RLock()
+
+    def define(self, name: str) -> Any:
+        definition = self.layout.definitions.get(name)
+        if definition is None:
+            raise AttributeError(f'module {self.layout.name!r} has no attribute {name!r}')
+        with self._lock:
+            self._define(definition)
+
+            return self.namespace[name]
+
+    def _define(self, definition: TypeDefinition) -> None:
+        if definition.name in self.started:
+            return
+        self.started.add(definition.name)
+        try:
+            for base in definition.bases:
+                self._define(self.layout.definitions[base])
+            exec(self.compile_definition(self.layout, definition), self.namespace)
+        except BaseException:
+            # Not defined after all, so the next reference tries again
+            self.started.discard(definition.name)
+            raise
+        for reference in definition.references:
+            self._define(self.layout.definitions[reference])
+
+    def names(self) -> List[str]:
+        return sorted(set(self.namespace.keys()) | set(self.layout.definitions.keys()))
+
+
+def load_lazily(module_name: str,
+                register: bool = True,
+                compile_definition: Callable[[ModuleLayout, TypeDefinition], CodeType] = compile_type_definition,
+                load_layout: Callable[[str], ModuleLayout] = layout_of) -> ModuleType:
+    """
+    Loads a generated module so that each type is only defined on first reference. Imports and
+    other top-level statements run right away.
+
+    :param module_name: The name of the generated module.
+    :param register: Whether to put the module in `sys.modules`, so that later imports of it get
+                     the lazy module. A module that is imported already is returned as is.
+    :param compile_definition: Compiles the class statement of a type.
+    :param load_layout: Gives the layout of the module, by reading its source by default.
+    :return: The lazily loaded module.
+    """
+    if register and module_name in sys.modules:
+        return sys.modules[module_name]
+
+    layout = load_layout(module_name)
+    module = ModuleType(module_name)
+    module.__file__ = layout.filename
+    module.__package__ = module_name.rpartition('.')[0]
+    types = _LazyTypes(layout, module.__dict__, compile_definition)
+    module.__getattr__ = types.define
+    module.__dir__ = types.names
+    if register:
+        sys.modules[module_name] = module
+    try:
+        exec(compile(layout.preamble, layout.filename, 'exec'), module.__dict__)
+    except BaseException:
+        if register:
+            del sys.modules[module_name]
+        raise
+
+    return module
+
+
+@dataclass(frozen=True)
+class TypeCost:
+    """
+    The time in seconds it takes to define a type in a freshly loaded module, including the types
+    it refers to, and to then validate a first value with it.
+    """
+    name: str
+    definition: float
+    first_validation: float
+
+
+def type_costs(module_name: str) -> List[TypeCost]:
+    """
+    Measures the cost of each type in a generated module, most expensive first. Every type is
+    measured in a module of its own, so that costs of shared dependencies are counted for each type
+    that needs them.
+    """
+    from gotyno_validation import validation
+
+    layout = layout_of(module_name)
+    costs = []
+    for name in layout.definitions:
+        module = load_lazily(module_name, register=False)
+        start = time.perf_counter()
+        type_ = getattr(module, name)
+        defined = time.perf_counter()
+        validate = getattr(type_, 'validate', None)
+        if validate is not None:
+            # Generic types take a validator per type parameter before the value
+            parameters = [p for p in inspect.signature(validate).parameters if p.startswith('validate_')]
+            if len(parameters) > 0:
+                validate = validate(*[validation.validate_unknown for _ in parameters])
+            validate({})
+        validated = time.perf_counter()
+        costs.append(TypeCost(name, defined - start, validated - defined))
+
+    return sorted(costs, key=lambda c: c.definition + c.first_validation, reverse=True)
+
+
+def format_costs(costs: List[TypeCost]) -> str:
+    """
+    Formats type costs as a table, in microseconds.
+    """
+    width = max([len('type')] + [len(c.name) for c in costs])
+    lines = [f'{"type":<{width}}  {"definition":>12}  {"first validation":>16}']
+    for cost in costs:
+        lines.append(f'{cost.name:<{width}}  {cost.definition * 1e6:>10.0f}us'
+                     f'  {cost.first_validation * 1e6:>14.0f}us')
+
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    for name in sys.argv[1:]:
+        print(name)
+        print(format_costs(type_costs(name)))
@@ -0,0 +1,111 @@
+import os
+import subprocess
+import sys
+import unittest
+from dataclasses import dataclass
+from gotyno_validation import gotyno_output
+from gotyno_validation.lazy import compile_type_definition, format_costs, load_lazily, split_module, type_costs
+from gotyno_validation.validation import Valid, validate_int
+
+SOURCE_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestLazy(unittest.TestCase):
+    "A test suite for lazy loading of generated modules"
+
+    def test_types_are_defined_on_first_reference(self):
+        module = load_lazily('gotyno_validation.gotyno_output', register=False)
+        self.assertNotIn('SomeType', vars(module))
+        self.assertNotIn('Event', vars(module))
+
+        some_type = module.SomeType
+        self.assertIn('SomeType', vars(module))
+        self.assertNotIn('Event', vars(module))
+        self.assertIsNot(some_type, gotyno_output.SomeType)
+        self.assertEqual(some_type.__module__, 'gotyno_validation.gotyno_output')
+
+        # Cases of a union are defined along with it, as its validator refers to them
+        event = module.Event
+        self.assertIn('AnotherEvent', vars(module))
+        result = event.decode('{"type": "AnotherEvent", "data": {"type": "SomeType", "some_field": "x", '
+                              '"some_other_field": 1}}')
+        self.assertIsInstance(result, Valid)
+        self.assertIsInstance(result.value, module.AnotherEvent)
+        self.assertIsInstance(result.value.data, some_type)
+
+        self.assertEqual(module.Possibly.validate(validate_int)({'type': 'Definitely', 'data': 1}),
+                         Valid(module.Definitely(1)))
+        self.assertIn('Color', dir(module))
+        with self.assertRaises(AttributeError):
+            module.Missing
+
+    def test_failed_definitions_are_tried_again(self):
+        failures = ['Event']
+
+        def compile_definition(layout, definition):
+            if definition.name in failures:
+                failures.remove(definition.name)
+                raise MemoryError
+            return compile_type_definition(layout, definition)
+
+        module = load_lazily('gotyno_validation.gotyno_output', register=False, compile_definition=compile_definition)
+        with self.assertRaises(MemoryError):
+            module.AnotherEvent
+        self.assertNotIn('Event', vars(module))
+        self.assertTrue(issubclass(module.AnotherEvent, module.Event))
+        self.assertEqual(module.Event.validate({'type': 'Launch'}), Valid(module.Launch()))
+
+    def test_generated_modules_import_binary_and_views_on_first_use(self):
+        # `binary`, `views` and the `schema` they build on are only imported once they are needed
+        code = ('import sys\n'
+                'from gotyno_validation import notifications\n'
+                'modules = ("gotyno_validation.binary", "gotyno_validation.views", "gotyno_validation.schema")\n'
+                'print(sorted(m for m in modules if m in sys.modules))\n'
+                'notification = notifications.Notification(1, "hello", False)\n'
+                'print(notifications.Notification.from_binary(notification.to_binary()).value == notification)\n'
+                'print(sorted(m for m in modules if m in sys.modules))\n')
+        environment = dict(os.environ, PYTHONPATH=SOURCE_DIRECTORY)
+        output = subprocess.run([sys.executable, '-c', code], env=environment, capture_output=True, check=True).stdout
+        self.assertEqual(output.decode().splitlines(),
+                         ['[]', 'True', "['gotyno_validation.binary', 'gotyno_validation.schema']"])
+
+    def test_split_module(self):
+        source = ('import typing\n\n\n@dataclass(frozen=True)\nclass A(B):\n    c: C\n\n'
+                  '    def f(self) -> None:\n        return D()\n\n\nclass B:\n    pass\n\n\n'
+                  'class C:\n    pass\n\n\nclass D:\n    pass\n')
+        layout = split_module('m', 'm.py', source)
+        self.assertEqual(list(layout.definitions), ['A', 'B', 'C', 'D'])
+        self.assertEqual(layout.definitions['A'].bases, ('B', 'C'))
+        self.assertEqual(layout.definitions['A'].references, ('D',))
+        self.assertEqual(layout.definitions['A'].first_line, 4)
+        self.assertEqual(layout.preamble.count('\n'), source.count('\n'))
+
+    def test_split_module_with_statements_of_any_shape(self):
+        source = ('DOC = """\nclass NotAType:\n"""\n\n\n@dataclass(\n    frozen=True,\n)\nclass A:\n'
+                  '    text = """\nclass B:\n"""\n\n    def f(self) -> None:\n        return B()\n\n\n'
+                  'if DOC:\n    class C:\n        pass\n\n\nclass B(\n    A,\n):\n    pass\n')
+        layout = split_module('m', 'm.py', source)
+        self.assertEqual(list(layout.definitions), ['A', 'B'])
+        self.assertEqual(layout.definitions['A'].first_line, 6)
+        self.assertTrue(layout.definitions['A'].source.startswith('@dataclass(\n'))
+        self.assertEqual(layout.definitions['A'].references, ('B',))
+        self.assertEqual(layout.definitions['B'].bases, ('A',))
+        self.assertIn('class NotAType', layout.preamble)
+        self.assertIn('class C', layout.preamble)
+        self.assertNotIn('class B', layout.preamble)
+        self.assertEqual(layout.preamble.count('\n'), source.count('\n'))
+
+        namespace = {'dataclass': dataclass}
+        exec(compile(layout.preamble, 'm.py', 'exec'), namespace)
+        for name in ('A', 'B'):
+            exec(compile_type_definition(layout, layout.definitions[name]), namespace)
+        self.assertIsInstance(namespace['A']().f(), namespace['B'])
+        self.assertIn('C', namespace)
+
+    def test_type_costs(self):
+        costs = type_costs('gotyno_validation.gotyno_output')
+        self.assertEqual({c.name for c in costs},
+                         {'SomeType', 'Holder', 'Event', 'Notification', 'Launch', 'AnotherEvent',
+                          'EventWithKind', 'NotificationWithKind', 'LaunchWithKind', 'AnotherEventWithKind',
+                          'Possibly', 'NotReally', 'Definitely', 'Color'})
+        self.assertIn('first validation', format_costs(costs))
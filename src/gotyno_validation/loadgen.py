@@ -0,0 +1,205 @@
+from typing import Any, Dict, Iterator, List, Tuple, Union
+from dataclasses import dataclass, field
+import json
+import os
+import random
+
+from gotyno_validation import schema as s
+from gotyno_validation import validation
+
+_ALPHABET = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 åäöé'
+# Type arguments given as validators are only known by the primitive they validate, or the generated
+# class they belong to
+_PRIMITIVE_TYPES = {
+    validation.validate_string: str,
+    validation.validate_int: int,
+    validation.validate_bigint: int,
+    validation.validate_float: float,
+    validation.validate_bool: bool,
+    validation.validate_unknown: int,
+}
+# Marks a field that no invalid value is known for
+_NO_INVALID_VALUE = object()
+
+
+@dataclass(frozen=True)
+class LoadProfile:
+    """
+    Describes the shape of generated payloads. Ranges are inclusive. Beyond `max_depth` nested
+    lists and maps are empty and optional values are `None`. `tag_weights` gives the relative
+    weight of union case tags, 1 for tags that aren't listed. Each interface field is replaced
+    with a value of the wrong type with a chance of `invalid_field_rate`, unless its type accepts
+    anything we'd replace it with, like a type argument given as `validate_unknown`.
+    """
+    seed: int = 0
+    string_length: Tuple[int, int] = (1, 16)
+    list_length: Tuple[int, int] = (0, 8)
+    map_size: Tuple[int, int] = (0, 4)
+    max_depth: int = 8
+    none_rate: float = 0.2
+    invalid_field_rate: float = 0.0
+    tag_weights: Dict[str, float] = field(default_factory=dict)
+
+
+class _Generator:
+    def __init__(self, profile: LoadProfile):
+        self.profile = profile
+        self.random = random.Random(profile.seed)
+        # The schemas of generated classes that type arguments given as validators belong to
+        self.validator_schemas: Dict[Any, s.Schema] = {}
+
+    def payload(self, schema: s.Schema, depth: int = 0) -> Any:
+        rng = self.random
+        profile = self.profile
+        if isinstance(schema, s.PrimitiveSchema):
+            return self.primitive(schema.type)
+        if isinstance(schema, s.LiteralSchema):
+            return schema.value
+        if isinstance(schema, s.EnumSchema):
+            return rng.choice([member.value for member in schema.enumeration])
+        if isinstance(schema, s.OptionalSchema):
+            if depth >= profile.max_depth or rng.random() < profile.none_rate:
+                return None
+            return self.payload(schema.inner, depth)
+        if isinstance(schema, s.ListSchema):
+            if depth >= profile.max_depth:
+                return []
+            return [self.payload(schema.item, depth + 1)
+                    for _ in range(rng.randint(*profile.list_length))]
+        if isinstance(schema, s.StringMapSchema):
+            if depth >= profile.max_depth:
+                return {}
+            return {self.string(): self.payload(schema.value, depth + 1)
+                    for _ in range(rng.randint(*profile.map_size))}
+        if isinstance(schema, s.UnionSchema):
+            return self.payload(rng.choice(schema.options), depth)
+        if isinstance(schema, s.TaggedUnionSchema):
+            tags = list(schema.cases.keys())
+            weights = [profile.tag_weights.get(tag, 1.0) for tag in tags]
+            return self.payload(schema.cases[rng.choices(tags, weights)[0]], depth)
+        if isinstance(schema, s.InterfaceSchema):
+            payload = {}
+            if schema.tag_field is not None:
+                payload[schema.tag_field] = schema.tag
+            for name, field_schema in schema.fields.items():
+                if rng.random() < profile.invalid_field_rate:
+                    invalid = self.invalid(field_schema)
+                    if invalid is not _NO_INVALID_VALUE:
+                        payload[name] = invalid
+                        continue
+                payload[name] = self.payload(field_schema, depth + 1)
+            return payload
+        if isinstance(schema, s.ValidatorSchema):
+            return self.accepted_by(schema.validator, depth)
+
+        raise ValueError(f'Unsupported schema: {schema}')
+
+    def primitive(self, type_: type) -> Any:
+        if type_ is str:
+            return self.string()
+        if type_ is bool:
+            return self.random.random() < 0.5
+        if type_ is int:
+            return self.random.randint(-2 ** 31, 2 ** 31)
+        if type_ is float:
+            return self.random.uniform(-1e6, 1e6)
+
+        raise ValueError(f'Unsupported primitive type: {type_}')
+
+    def string(self) -> str:
+        length = self.random.randint(*self.profile.string_length)
+
+        return ''.join(self.random.choices(_ALPHABET, k=length))
+
+    def accepted_by(self, validator: validation.Validator[Any], depth: int) -> Any:
+        try:
+            type_ = _PRIMITIVE_TYPES.get(validator)
+        except TypeError:
+            type_ = None
+        if type_ is not None:
+            return self.primitive(type_)
+
+        schema = self.validator_schemas.get(id(validator))
+        if schema is None:
+            class_ = validation._generated_class_of(validator)
+            # Validators of generic types were created for type arguments that aren't known here
+            if class_ is None or getattr(class_, 'validate', None) is not validator:
+                raise ValueError(f'Unsupported validator for payloads: {validator}')
+            schema = self.validator_schemas[id(validator)] = s.schema_of(class_)
+
+        return self.payload(schema, depth)
+
+    def invalid(self, schema: s.Schema) -> Any:
+        """
+        A value that the schema rejects, or `_NO_INVALID_VALUE` if none is known.
+        """
+        value = self.invalid_candidate(schema)
+        if isinstance(s.validator_of(schema)(value), validation.Valid):
+            return _NO_INVALID_VALUE
+
+        return value
+
+    def invalid_candidate(self, schema: s.Schema) -> Any:
+        if isinstance(schema, s.OptionalSchema):
+            return self.invalid_candidate(schema.inner)
+        if isinstance(schema, s.PrimitiveSchema) and schema.type is str:
+            return self.random.randint(0, 100)
+        if isinstance(schema, (s.PrimitiveSchema, s.EnumSchema)):
+            return '\u0000invalid'
+        if isinstance(schema, s.LiteralSchema):
+            return [schema.value]
+        if isinstance(schema, s.ListSchema):
+            return {}
+
+        return []
+
+
+def iter_payloads(count: int,
+                  type_: Any,
+                  *arguments: Any,
+                  profile: LoadProfile = LoadProfile()) -> Iterator[Any]:
+    """
+    Generates `count` JSON compatible payloads shaped like `type_`. The same profile, including the
+    seed, always gives the same payloads.
+
+    :param count: The number of payloads.
+    :param type_: The generated type to shape payloads like.
+    :param arguments: Type arguments for generic types, as types or validators. Validators have to
+                      be those of primitives, `validate_unknown`, or the `validate` of a generated
+                      type that isn't generic.
+    :param profile: The shape of the payloads.
+    :raises ValueError: If payloads can't be made for a type argument given as a validator.
+    """
+    schema = s.schema_of(type_, *arguments)
+    generator = _Generator(profile)
+    for _ in range(count):
+        yield generator.payload(schema)
+
+
+def generate_payloads(count: int,
+                      type_: Any,
+                      *arguments: Any,
+                      profile: LoadProfile = LoadProfile()) -> List[Any]:
+    """
+    Generates an in-memory batch of payloads, see `iter_payloads`.
+    """
+    return list(iter_payloads(count, type_, *arguments, profile=profile))
+
+
+def write_ndjson(path: Union[str, os.PathLike],
+                 count: int,
+                 type_: Any,
+                 *arguments: Any,
+                 profile: LoadProfile = LoadProfile()) -> int:
+    """
+    Writes generated payloads to a file, one JSON document per line, returning the number of bytes
+    written.
+    """
+    written = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        for payload in iter_payloads(count, type_, *arguments, profile=profile):
+            line = json.dumps(payload) + '\n'
+            f.write(line)
+            written += len(line.encode('utf-8'))
+
+    return written
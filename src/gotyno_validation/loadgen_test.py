@@ -0,0 +1,75 @@
+import json
+import os
+import tempfile
+import unittest
+from collections import Counter
+from gotyno_validation.gotyno_output import Event, Holder, Possibly, SomeType
+from gotyno_validation.loadgen import LoadProfile, generate_payloads, write_ndjson
+from gotyno_validation.notifications import NotificationCommand, NotificationCommandResult
+from gotyno_validation.validation import (Invalid, Valid, validate_bigint, validate_int, validate_string,
+                                          validate_unknown)
+
+
+class TestLoadGenerator(unittest.TestCase):
+    "A test suite for the synthetic load generator"
+
+    def test_payloads_are_valid(self):
+        for type_, arguments in [(NotificationCommand, ()), (NotificationCommandResult, ()), (Event, ()),
+                                 (Possibly, (validate_int,))]:
+            validator = type_.validate(*arguments) if arguments else type_.validate
+            for payload in generate_payloads(200, type_, *arguments):
+                self.assertIsInstance(validator(payload), Valid, payload)
+
+    def test_payloads_are_deterministic(self):
+        profile = LoadProfile(seed=7)
+        self.assertEqual(generate_payloads(50, NotificationCommandResult, profile=profile),
+                         generate_payloads(50, NotificationCommandResult, profile=profile))
+        self.assertNotEqual(generate_payloads(50, NotificationCommandResult, profile=profile),
+                            generate_payloads(50, NotificationCommandResult, profile=LoadProfile(seed=8)))
+
+    def test_tag_weights_and_invalid_fields(self):
+        payloads = generate_payloads(1000, Event, profile=LoadProfile(tag_weights={'Launch': 0, 'Notification': 3}))
+        tags = Counter(p['type'] for p in payloads)
+        self.assertEqual(tags['Launch'], 0)
+        self.assertGreater(tags['Notification'], 2 * tags['AnotherEvent'])
+
+        payloads = generate_payloads(200, NotificationCommand, profile=LoadProfile(invalid_field_rate=1.0))
+        for payload in payloads:
+            if len(payload) > 1:
+                self.assertIsInstance(NotificationCommand.validate(payload), Invalid, payload)
+
+    def test_invalid_fields_of_type_arguments(self):
+        profile = LoadProfile(invalid_field_rate=1.0)
+        for type_, validator in [(Holder, validate_int), (Holder, validate_string), (Holder, validate_bigint),
+                                 (Possibly, validate_int), (Holder, Holder.validate(validate_int))]:
+            for payload in generate_payloads(50, type_, validator, profile=profile):
+                if len(payload) > 1 or type_ is Holder:
+                    self.assertIsInstance(type_.validate(validator)(payload), Invalid, payload)
+
+        # Fields that accept anything are left valid rather than made up
+        for payload in generate_payloads(50, Holder, validate_unknown, profile=profile):
+            self.assertIsInstance(Holder.validate(validate_unknown)(payload), Valid, payload)
+
+        self.assertTrue(all(p['data']['data'] == [] for p in generate_payloads(
+            20, NotificationCommandResult, profile=LoadProfile(max_depth=2, tag_weights={'CommandFailure': 0}))
+            if p['data']['type'] == 'Notifications'))
+
+    def test_type_arguments_of_generated_types(self):
+        for type_ in (SomeType, Event):
+            validator = Holder.validate(type_.validate)
+            for payload in generate_payloads(50, Holder, type_.validate):
+                self.assertIsInstance(validator(payload), Valid, payload)
+
+        with self.assertRaises(ValueError):
+            generate_payloads(1, Holder, Holder.validate(validate_int))
+        with self.assertRaises(ValueError):
+            generate_payloads(1, Holder, lambda value: Valid(value))
+
+    def test_ndjson(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'payloads.ndjson')
+            written = write_ndjson(path, 100, Event)
+            self.assertEqual(os.path.getsize(path), written)
+            with open(path, encoding='utf-8') as f:
+                lines = [json.loads(line) for line in f]
+        self.assertEqual(lines, generate_payloads(100, Event))
@@ -3,10 +3,12 @@ import typing
 from dataclasses import dataclass
 from gotyno_validation import validation
 from gotyno_validation import encoding
+binary = validation.import_on_first_use('gotyno_validation.binary')
+views = validation.import_on_first_use('gotyno_validation.views')
 
 
-@dataclass(frozen=True)
-class NotifyUserPayload:
+@dataclass(frozen=True, slots=True)
+class NotifyUserPayload(encoding.MemoizedEncoding):
     id: int
     message: str
 
@@ -15,8 +17,10 @@ class NotifyUserPayload:
         return validation.validate_interface(value, {'id': validation.validate_int, 'message': validation.validate_string}, NotifyUserPayload)
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes]) -> validation.ValidationResult['NotifyUserPayload']:
-        return validation.validate_from_string(string, NotifyUserPayload.validate)
+    def decode(string: validation.JSONText, lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['NotifyUserPayload']:
+        if lazy:
+            return views.decode_view(string, NotifyUserPayload, offset=offset, length=length)
+        return validation.validate_from_string(string, NotifyUserPayload.validate, offset=offset, length=length)
 
     def to_json(self) -> typing.Dict[str, typing.Any]:
         return {'id': self.id, 'message': self.message}
@@ -24,9 +28,16 @@ class NotifyUserPayload:
     def encode(self) -> str:
         return json.dumps(self.to_json())
 
+    @staticmethod
+    def from_binary(data: validation.Buffer, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['NotifyUserPayload']:
+        return binary.from_binary(data, NotifyUserPayload, offset=offset, length=length)
+
+    def to_binary(self) -> bytes:
+        return binary.to_binary(self, NotifyUserPayload)
+
 
-@dataclass(frozen=True)
-class Notification:
+@dataclass(frozen=True, slots=True)
+class Notification(encoding.MemoizedEncoding):
     id: int
     message: str
     seen: bool
@@ -36,8 +47,10 @@ class Notification:
         return validation.validate_interface(value, {'id': validation.validate_int, 'message': validation.validate_string, 'seen': validation.validate_bool}, Notification)
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes]) -> validation.ValidationResult['Notification']:
-        return validation.validate_from_string(string, Notification.validate)
+    def decode(string: validation.JSONText, lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['Notification']:
+        if lazy:
+            return views.decode_view(string, Notification, offset=offset, length=length)
+        return validation.validate_from_string(string, Notification.validate, offset=offset, length=length)
 
     def to_json(self) -> typing.Dict[str, typing.Any]:
         return {'id': self.id, 'message': self.message, 'seen': self.seen}
@@ -45,9 +58,16 @@ class Notification:
     def encode(self) -> str:
         return json.dumps(self.to_json())
 
+    @staticmethod
+    def from_binary(data: validation.Buffer, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['Notification']:
+        return binary.from_binary(data, Notification, offset=offset, length=length)
+
+    def to_binary(self) -> bytes:
+        return binary.to_binary(self, Notification)
+
 
-@dataclass(frozen=True)
-class AddNotificationError:
+@dataclass(frozen=True, slots=True)
+class AddNotificationError(encoding.MemoizedEncoding):
     userId: int
     notification: Notification
     error: str
@@ -57,8 +77,10 @@ class AddNotificationError:
         return validation.validate_interface(value, {'userId': validation.validate_int, 'notification': Notification.validate, 'error': validation.validate_string}, AddNotificationError)
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes]) -> validation.ValidationResult['AddNotificationError']:
-        return validation.validate_from_string(string, AddNotificationError.validate)
+    def decode(string: validation.JSONText, lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['AddNotificationError']:
+        if lazy:
+            return views.decode_view(string, AddNotificationError, offset=offset, length=length)
+        return validation.validate_from_string(string, AddNotificationError.validate, offset=offset, length=length)
 
     def to_json(self) -> typing.Dict[str, typing.Any]:
         return {'userId': self.userId, 'notification': Notification.to_json(self.notification), 'error': self.error}
@@ -66,9 +88,16 @@ class AddNotificationError:
     def encode(self) -> str:
         return json.dumps(self.to_json())
 
+    @staticmethod
+    def from_binary(data: validation.Buffer, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['AddNotificationError']:
+        return binary.from_binary(data, AddNotificationError, offset=offset, length=length)
+
+    def to_binary(self) -> bytes:
+        return binary.to_binary(self, AddNotificationError)
+
 
-@dataclass(frozen=True)
-class RemoveNotificationError:
+@dataclass(frozen=True, slots=True)
+class RemoveNotificationError(encoding.MemoizedEncoding):
     userId: int
     notificationId: int
     error: str
@@ -78,8 +107,10 @@ class RemoveNotificationError:
         return validation.validate_interface(value, {'userId': validation.validate_int, 'notificationId': validation.validate_int, 'error': validation.validate_string}, RemoveNotificationError)
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes]) -> validation.ValidationResult['RemoveNotificationError']:
-        return validation.validate_from_string(string, RemoveNotificationError.validate)
+    def decode(string: validation.JSONText, lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['RemoveNotificationError']:
+        if lazy:
+            return views.decode_view(string, RemoveNotificationError, offset=offset, length=length)
+        return validation.validate_from_string(string, RemoveNotificationError.validate, offset=offset, length=length)
 
     def to_json(self) -> typing.Dict[str, typing.Any]:
         return {'userId': self.userId, 'notificationId': self.notificationId, 'error': self.error}
@@ -87,9 +118,16 @@ class RemoveNotificationError:
     def encode(self) -> str:
         return json.dumps(self.to_json())
 
+    @staticmethod
+    def from_binary(data: validation.Buffer, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['RemoveNotificationError']:
+        return binary.from_binary(data, RemoveNotificationError, offset=offset, length=length)
+
+    def to_binary(self) -> bytes:
+        return binary.to_binary(self, RemoveNotificationError)
 
-@dataclass(frozen=True)
-class RemoveNotificationResult:
+
+@dataclass(frozen=True, slots=True)
+class RemoveNotificationResult(encoding.MemoizedEncoding):
     remainingNotifications: typing.List[Notification]
     removedNotification: Notification
 
@@ -98,8 +136,10 @@ class RemoveNotificationResult:
         return validation.validate_interface(value, {'remainingNotifications': validation.validate_list(Notification.validate), 'removedNotification': Notification.validate}, RemoveNotificationResult)
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes]) -> validation.ValidationResult['RemoveNotificationResult']:
-        return validation.validate_from_string(string, RemoveNotificationResult.validate)
+    def decode(string: validation.JSONText, lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['RemoveNotificationResult']:
+        if lazy:
+            return views.decode_view(string, RemoveNotificationResult, offset=offset, length=length)
+        return validation.validate_from_string(string, RemoveNotificationResult.validate, offset=offset, length=length)
 
     def to_json(self) -> typing.Dict[str, typing.Any]:
         return {'remainingNotifications': encoding.list_to_json(Notification.to_json)(self.remainingNotifications), 'removedNotification': Notification.to_json(self.removedNotification)}
@@ -107,9 +147,16 @@ class RemoveNotificationResult:
     def encode(self) -> str:
         return json.dumps(self.to_json())
 
+    @staticmethod
+    def from_binary(data: validation.Buffer, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['RemoveNotificationResult']:
+        return binary.from_binary(data, RemoveNotificationResult, offset=offset, length=length)
+
+    def to_binary(self) -> bytes:
+        return binary.to_binary(self, RemoveNotificationResult)
 
-@dataclass(frozen=True)
-class RemoveNotificationPayload:
+
+@dataclass(frozen=True, slots=True)
+class RemoveNotificationPayload(encoding.MemoizedEncoding):
     userId: int
     id: int
 
@@ -118,8 +165,10 @@ class RemoveNotificationPayload:
         return validation.validate_interface(value, {'userId': validation.validate_int, 'id': validation.validate_int}, RemoveNotificationPayload)
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes]) -> validation.ValidationResult['RemoveNotificationPayload']:
-        return validation.validate_from_string(string, RemoveNotificationPayload.validate)
+    def decode(string: validation.JSONText, lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['RemoveNotificationPayload']:
+        if lazy:
+            return views.decode_view(string, RemoveNotificationPayload, offset=offset, length=length)
+        return validation.validate_from_string(string, RemoveNotificationPayload.validate, offset=offset, length=length)
 
     def to_json(self) -> typing.Dict[str, typing.Any]:
         return {'userId': self.userId, 'id': self.id}
@@ -127,15 +176,27 @@ class RemoveNotificationPayload:
     def encode(self) -> str:
         return json.dumps(self.to_json())
 
+    @staticmethod
+    def from_binary(data: validation.Buffer, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['RemoveNotificationPayload']:
+        return binary.from_binary(data, RemoveNotificationPayload, offset=offset, length=length)
+
+    def to_binary(self) -> bytes:
+        return binary.to_binary(self, RemoveNotificationPayload)
+
+
+class NotificationCommand(encoding.MemoizedEncoding):
+    __tag_field__ = 'type'
+    __slots__ = ()
 
-class NotificationCommand:
     @staticmethod
     def validate(value: validation.Unknown) -> validation.ValidationResult['NotificationCommand']:
         return validation.validate_with_type_tags(value, 'type', {'GetNotifications': GetNotifications.validate, 'NotifyUser': NotifyUser.validate, 'RemoveNotification': RemoveNotification.validate, 'ClearNotifications': ClearNotifications.validate, 'ClearAllNotifications': ClearAllNotifications.validate})
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes]) -> validation.ValidationResult['NotificationCommand']:
-        return validation.validate_from_string(string, NotificationCommand.validate)
+    def decode(string: validation.JSONText, lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['NotificationCommand']:
+        if lazy:
+            return views.decode_view(string, NotificationCommand, offset=offset, length=length)
+        return validation.validate_from_string(string, NotificationCommand.validate, offset=offset, length=length)
 
     def to_json(self) -> typing.Dict[str, typing.Any]:
         raise NotImplementedError(
@@ -145,8 +206,16 @@ class NotificationCommand:
         raise NotImplementedError(
             '`encode` is not implemented for base class `NotificationCommand`')
 
+    @staticmethod
+    def from_binary(data: validation.Buffer, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['NotificationCommand']:
+        return binary.from_binary(data, NotificationCommand, offset=offset, length=length)
+
+    def to_binary(self) -> bytes:
+        raise NotImplementedError(
+            '`to_binary` is not implemented for base class `NotificationCommand`')
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GetNotifications(NotificationCommand):
     data: int
 
@@ -155,8 +224,10 @@ class GetNotifications(NotificationCommand):
         return validation.validate_with_type_tag(value, 'type', 'GetNotifications', {'data': validation.validate_int}, GetNotifications)
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes]) -> validation.ValidationResult['GetNotifications']:
-        return validation.validate_from_string(string, GetNotifications.validate)
+    def decode(string: validation.JSONText, lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['GetNotifications']:
+        if lazy:
+            return views.decode_view(string, GetNotifications, offset=offset, length=length)
+        return validation.validate_from_string(string, GetNotifications.validate, offset=offset, length=length)
 
     def to_json(self) -> typing.Dict[str, typing.Any]:
         return {'type': 'GetNotifications', 'data': self.data}
@@ -164,8 +235,15 @@ class GetNotifications(NotificationCommand):
     def encode(self) -> str:
         return json.dumps(self.to_json())
 
+    @staticmethod
+    def from_binary(data: validation.Buffer, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['GetNotifications']:
+        return binary.from_binary(data, GetNotifications, offset=offset, length=length)
+
+    def to_binary(self) -> bytes:
+        return binary.to_binary(self, GetNotifications)
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NotifyUser(NotificationCommand):
     data: NotifyUserPayload
 
@@ -174,8 +252,10 @@ class NotifyUser(NotificationCommand):
         return validation.validate_with_type_tag(value, 'type', 'NotifyUser', {'data': NotifyUserPayload.validate}, NotifyUser)
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes]) -> validation.ValidationResult['NotifyUser']:
-        return validation.validate_from_string(string, NotifyUser.validate)
+    def decode(string: validation.JSONText, lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['NotifyUser']:
+        if lazy:
+            return views.decode_view(string, NotifyUser, offset=offset, length=length)
+        return validation.validate_from_string(string, NotifyUser.validate, offset=offset, length=length)
 
     def to_json(self) -> typing.Dict[str, typing.Any]:
         return {'type': 'NotifyUser', 'data': self.data.to_json()}
@@ -183,8 +263,15 @@ class NotifyUser(NotificationCommand):
     def encode(self) -> str:
         return json.dumps(self.to_json())
 
+    @staticmethod
+    def from_binary(data: validation.Buffer, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['NotifyUser']:
+        return binary.from_binary(data, NotifyUser, offset=offset, length=length)
 
-@dataclass(frozen=True)
+    def to_binary(self) -> bytes:
+        return binary.to_binary(self, NotifyUser)
+
+
+@dataclass(frozen=True, slots=True)
 class RemoveNotification(NotificationCommand):
     data: RemoveNotificationPayload
 
@@ -193,8 +280,10 @@ class RemoveNotification(NotificationCommand):
         return validation.validate_with_type_tag(value, 'type', 'RemoveNotification', {'data': RemoveNotificationPayload.validate}, RemoveNotification)
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes]) -> validation.ValidationResult['RemoveNotification']:
-        return validation.validate_from_string(string, RemoveNotification.validate)
+    def decode(string: validation.JSONText, lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['RemoveNotification']:
+        if lazy:
+            return views.decode_view(string, RemoveNotification, offset=offset, length=length)
+        return validation.validate_from_string(string, RemoveNotification.validate, offset=offset, length=length)
 
     def to_json(self) -> typing.Dict[str, typing.Any]:
         return {'type': 'RemoveNotification', 'data': self.data.to_json()}
@@ -202,8 +291,15 @@ class RemoveNotification(NotificationCommand):
     def encode(self) -> str:
         return json.dumps(self.to_json())
 
+    @staticmethod
+    def from_binary(data: validation.Buffer, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['RemoveNotification']:
+        return binary.from_binary(data, RemoveNotification, offset=offset, length=length)
+
+    def to_binary(self) -> bytes:
+        return binary.to_binary(self, RemoveNotification)
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ClearNotifications(NotificationCommand):
     data: int
 
@@ -212,8 +308,10 @@ class ClearNotifications(NotificationCommand):
         return validation.validate_with_type_tag(value, 'type', 'ClearNotifications', {'data': validation.validate_int}, ClearNotifications)
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes]) -> validation.ValidationResult['ClearNotifications']:
-        return validation.validate_from_string(string, ClearNotifications.validate)
+    def decode(string: validation.JSONText, lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['ClearNotifications']:
+        if lazy:
+            return views.decode_view(string, ClearNotifications, offset=offset, length=length)
+        return validation.validate_from_string(string, ClearNotifications.validate, offset=offset, length=length)
 
     def to_json(self) -> typing.Dict[str, typing.Any]:
         return {'type': 'ClearNotifications', 'data': self.data}
@@ -221,16 +319,25 @@ class ClearNotifications(NotificationCommand):
     def encode(self) -> str:
         return json.dumps(self.to_json())
 
+    @staticmethod
+    def from_binary(data: validation.Buffer, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['ClearNotifications']:
+        return binary.from_binary(data, ClearNotifications, offset=offset, length=length)
+
+    def to_binary(self) -> bytes:
+        return binary.to_binary(self, ClearNotifications)
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ClearAllNotifications(NotificationCommand):
     @staticmethod
     def validate(value: validation.Unknown) -> validation.ValidationResult['ClearAllNotifications']:
         return validation.validate_with_type_tag(value, 'type', 'ClearAllNotifications', {}, ClearAllNotifications)
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes]) -> validation.ValidationResult['ClearAllNotifications']:
-        return validation.validate_from_string(string, ClearAllNotifications.validate)
+    def decode(string: validation.JSONText, lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['ClearAllNotifications']:
+        if lazy:
+            return views.decode_view(string, ClearAllNotifications, offset=offset, length=length)
+        return validation.validate_from_string(string, ClearAllNotifications.validate, offset=offset, length=length)
 
     def to_json(self) -> typing.Dict[str, typing.Any]:
         return {'type': 'ClearAllNotifications'}
@@ -238,15 +345,27 @@ class ClearAllNotifications(NotificationCommand):
     def encode(self) -> str:
         return json.dumps(self.to_json())
 
+    @staticmethod
+    def from_binary(data: validation.Buffer, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['ClearAllNotifications']:
+        return binary.from_binary(data, ClearAllNotifications, offset=offset, length=length)
+
+    def to_binary(self) -> bytes:
+        return binary.to_binary(self, ClearAllNotifications)
+
+
+class NotificationCommandSuccess(encoding.MemoizedEncoding):
+    __tag_field__ = 'type'
+    __slots__ = ()
 
-class NotificationCommandSuccess:
     @staticmethod
     def validate(value: validation.Unknown) -> validation.ValidationResult['NotificationCommandSuccess']:
         return validation.validate_with_type_tags(value, 'type', {'Notifications': Notifications.validate, 'NotificationAdded': NotificationAdded.validate, 'NotificationRemoved': NotificationRemoved.validate, 'NotificationsCleared': NotificationsCleared.validate, 'AllNotificationsCleared': AllNotificationsCleared.validate})
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes]) -> validation.ValidationResult['NotificationCommandSuccess']:
-        return validation.validate_from_string(string, NotificationCommandSuccess.validate)
+    def decode(string: validation.JSONText, lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['NotificationCommandSuccess']:
+        if lazy:
+            return views.decode_view(string, NotificationCommandSuccess, offset=offset, length=length)
+        return validation.validate_from_string(string, NotificationCommandSuccess.validate, offset=offset, length=length)
 
     def to_json(self) -> typing.Dict[str, typing.Any]:
         raise NotImplementedError(
@@ -256,8 +375,16 @@ class NotificationCommandSuccess:
         raise NotImplementedError(
             '`encode` is not implemented for base class `NotificationCommandSuccess`')
 
+    @staticmethod
+    def from_binary(data: validation.Buffer, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['NotificationCommandSuccess']:
+        return binary.from_binary(data, NotificationCommandSuccess, offset=offset, length=length)
+
+    def to_binary(self) -> bytes:
+        raise NotImplementedError(
+            '`to_binary` is not implemented for base class `NotificationCommandSuccess`')
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class Notifications(NotificationCommandSuccess):
     data: typing.List[Notification]
 
@@ -266,8 +393,10 @@ class Notifications(NotificationCommandSuccess):
         return validation.validate_with_type_tag(value, 'type', 'Notifications', {'data': validation.validate_list(Notification.validate)}, Notifications)
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes]) -> validation.ValidationResult['Notifications']:
-        return validation.validate_from_string(string, Notifications.validate)
+    def decode(string: validation.JSONText, lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['Notifications']:
+        if lazy:
+            return views.decode_view(string, Notifications, offset=offset, length=length)
+        return validation.validate_from_string(string, Notifications.validate, offset=offset, length=length)
 
     def to_json(self) -> typing.Dict[str, typing.Any]:
         return {'type': 'Notifications', 'data': encoding.list_to_json(Notification.to_json)(self.data)}
@@ -275,8 +404,15 @@ class Notifications(NotificationCommandSuccess):
     def encode(self) -> str:
         return json.dumps(self.to_json())
 
+    @staticmethod
+    def from_binary(data: validation.Buffer, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['Notifications']:
+        return binary.from_binary(data, Notifications, offset=offset, length=length)
+
+    def to_binary(self) -> bytes:
+        return binary.to_binary(self, Notifications)
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class NotificationAdded(NotificationCommandSuccess):
     data: NotifyUserPayload
 
@@ -285,8 +421,10 @@ class NotificationAdded(NotificationCommandSuccess):
         return validation.validate_with_type_tag(value, 'type', 'NotificationAdded', {'data': NotifyUserPayload.validate}, NotificationAdded)
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes]) -> validation.ValidationResult['NotificationAdded']:
-        return validation.validate_from_string(string, NotificationAdded.validate)
+    def decode(string: validation.JSONText, lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['NotificationAdded']:
+        if lazy:
+            return views.decode_view(string, NotificationAdded, offset=offset, length=length)
+        return validation.validate_from_string(string, NotificationAdded.validate, offset=offset, length=length)
 
     def to_json(self) -> typing.Dict[str, typing.Any]:
         return {'type': 'NotificationAdded', 'data': self.data.to_json()}
@@ -294,8 +432,15 @@ class NotificationAdded(NotificationCommandSuccess):
     def encode(self) -> str:
         return json.dumps(self.to_json())
 
+    @staticmethod
+    def from_binary(data: validation.Buffer, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['NotificationAdded']:
+        return binary.from_binary(data, NotificationAdded, offset=offset, length=length)
+
+    def to_binary(self) -> bytes:
+        return binary.to_binary(self, NotificationAdded)
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class NotificationRemoved(NotificationCommandSuccess):
     data: RemoveNotificationResult
 
@@ -304,8 +449,10 @@ class NotificationRemoved(NotificationCommandSuccess):
         return validation.validate_with_type_tag(value, 'type', 'NotificationRemoved', {'data': RemoveNotificationResult.validate}, NotificationRemoved)
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes]) -> validation.ValidationResult['NotificationRemoved']:
-        return validation.validate_from_string(string, NotificationRemoved.validate)
+    def decode(string: validation.JSONText, lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['NotificationRemoved']:
+        if lazy:
+            return views.decode_view(string, NotificationRemoved, offset=offset, length=length)
+        return validation.validate_from_string(string, NotificationRemoved.validate, offset=offset, length=length)
 
     def to_json(self) -> typing.Dict[str, typing.Any]:
         return {'type': 'NotificationRemoved', 'data': self.data.to_json()}
@@ -313,8 +460,15 @@ class NotificationRemoved(NotificationCommandSuccess):
     def encode(self) -> str:
         return json.dumps(self.to_json())
 
+    @staticmethod
+    def from_binary(data: validation.Buffer, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['NotificationRemoved']:
+        return binary.from_binary(data, NotificationRemoved, offset=offset, length=length)
+
+    def to_binary(self) -> bytes:
+        return binary.to_binary(self, NotificationRemoved)
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class NotificationsCleared(NotificationCommandSuccess):
     data: int
 
@@ -323,8 +477,10 @@ class NotificationsCleared(NotificationCommandSuccess):
         return validation.validate_with_type_tag(value, 'type', 'NotificationsCleared', {'data': validation.validate_int}, NotificationsCleared)
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes]) -> validation.ValidationResult['NotificationsCleared']:
-        return validation.validate_from_string(string, NotificationsCleared.validate)
+    def decode(string: validation.JSONText, lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['NotificationsCleared']:
+        if lazy:
+            return views.decode_view(string, NotificationsCleared, offset=offset, length=length)
+        return validation.validate_from_string(string, NotificationsCleared.validate, offset=offset, length=length)
 
     def to_json(self) -> typing.Dict[str, typing.Any]:
         return {'type': 'NotificationsCleared', 'data': self.data}
@@ -332,16 +488,25 @@ class NotificationsCleared(NotificationCommandSuccess):
     def encode(self) -> str:
         return json.dumps(self.to_json())
 
+    @staticmethod
+    def from_binary(data: validation.Buffer, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['NotificationsCleared']:
+        return binary.from_binary(data, NotificationsCleared, offset=offset, length=length)
 
-@dataclass(frozen=True)
+    def to_binary(self) -> bytes:
+        return binary.to_binary(self, NotificationsCleared)
+
+
+@dataclass(frozen=True, slots=True)
 class AllNotificationsCleared(NotificationCommandSuccess):
     @staticmethod
     def validate(value: validation.Unknown) -> validation.ValidationResult['AllNotificationsCleared']:
         return validation.validate_with_type_tag(value, 'type', 'AllNotificationsCleared', {}, AllNotificationsCleared)
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes]) -> validation.ValidationResult['AllNotificationsCleared']:
-        return validation.validate_from_string(string, AllNotificationsCleared.validate)
+    def decode(string: validation.JSONText, lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['AllNotificationsCleared']:
+        if lazy:
+            return views.decode_view(string, AllNotificationsCleared, offset=offset, length=length)
+        return validation.validate_from_string(string, AllNotificationsCleared.validate, offset=offset, length=length)
 
     def to_json(self) -> typing.Dict[str, typing.Any]:
         return {'type': 'AllNotificationsCleared'}
@@ -349,15 +514,27 @@ class AllNotificationsCleared(NotificationCommandSuccess):
     def encode(self) -> str:
         return json.dumps(self.to_json())
 
+    @staticmethod
+    def from_binary(data: validation.Buffer, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['AllNotificationsCleared']:
+        return binary.from_binary(data, AllNotificationsCleared, offset=offset, length=length)
+
+    def to_binary(self) -> bytes:
+        return binary.to_binary(self, AllNotificationsCleared)
+
+
+class NotificationCommandFailure(encoding.MemoizedEncoding):
+    __tag_field__ = 'type'
+    __slots__ = ()
 
-class NotificationCommandFailure:
     @staticmethod
     def validate(value: validation.Unknown) -> validation.ValidationResult['NotificationCommandFailure']:
         return validation.validate_with_type_tags(value, 'type', {'NotificationNotRemoved': NotificationNotRemoved.validate, 'NotificationNotAdded': NotificationNotAdded.validate, 'InvalidCommand': InvalidCommand.validate})
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes]) -> validation.ValidationResult['NotificationCommandFailure']:
-        return validation.validate_from_string(string, NotificationCommandFailure.validate)
+    def decode(string: validation.JSONText, lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['NotificationCommandFailure']:
+        if lazy:
+            return views.decode_view(string, NotificationCommandFailure, offset=offset, length=length)
+        return validation.validate_from_string(string, NotificationCommandFailure.validate, offset=offset, length=length)
 
     def to_json(self) -> typing.Dict[str, typing.Any]:
         raise NotImplementedError(
@@ -367,8 +544,16 @@ class NotificationCommandFailure:
         raise NotImplementedError(
             '`encode` is not implemented for base class `NotificationCommandFailure`')
 
+    @staticmethod
+    def from_binary(data: validation.Buffer, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['NotificationCommandFailure']:
+        return binary.from_binary(data, NotificationCommandFailure, offset=offset, length=length)
+
+    def to_binary(self) -> bytes:
+        raise NotImplementedError(
+            '`to_binary` is not implemented for base class `NotificationCommandFailure`')
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NotificationNotRemoved(NotificationCommandFailure):
     data: RemoveNotificationError
 
@@ -377,8 +562,10 @@ class NotificationNotRemoved(NotificationCommandFailure):
         return validation.validate_with_type_tag(value, 'type', 'NotificationNotRemoved', {'data': RemoveNotificationError.validate}, NotificationNotRemoved)
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes]) -> validation.ValidationResult['NotificationNotRemoved']:
-        return validation.validate_from_string(string, NotificationNotRemoved.validate)
+    def decode(string: validation.JSONText, lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['NotificationNotRemoved']:
+        if lazy:
+            return views.decode_view(string, NotificationNotRemoved, offset=offset, length=length)
+        return validation.validate_from_string(string, NotificationNotRemoved.validate, offset=offset, length=length)
 
     def to_json(self) -> typing.Dict[str, typing.Any]:
         return {'type': 'NotificationNotRemoved', 'data': self.data.to_json()}
@@ -386,8 +573,15 @@ class NotificationNotRemoved(NotificationCommandFailure):
     def encode(self) -> str:
         return json.dumps(self.to_json())
 
+    @staticmethod
+    def from_binary(data: validation.Buffer, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['NotificationNotRemoved']:
+        return binary.from_binary(data, NotificationNotRemoved, offset=offset, length=length)
+
+    def to_binary(self) -> bytes:
+        return binary.to_binary(self, NotificationNotRemoved)
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NotificationNotAdded(NotificationCommandFailure):
     data: AddNotificationError
 
@@ -396,8 +590,10 @@ class NotificationNotAdded(NotificationCommandFailure):
         return validation.validate_with_type_tag(value, 'type', 'NotificationNotAdded', {'data': AddNotificationError.validate}, NotificationNotAdded)
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes]) -> validation.ValidationResult['NotificationNotAdded']:
-        return validation.validate_from_string(string, NotificationNotAdded.validate)
+    def decode(string: validation.JSONText, lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['NotificationNotAdded']:
+        if lazy:
+            return views.decode_view(string, NotificationNotAdded, offset=offset, length=length)
+        return validation.validate_from_string(string, NotificationNotAdded.validate, offset=offset, length=length)
 
     def to_json(self) -> typing.Dict[str, typing.Any]:
         return {'type': 'NotificationNotAdded', 'data': self.data.to_json()}
@@ -405,8 +601,15 @@ class NotificationNotAdded(NotificationCommandFailure):
     def encode(self) -> str:
         return json.dumps(self.to_json())
 
+    @staticmethod
+    def from_binary(data: validation.Buffer, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['NotificationNotAdded']:
+        return binary.from_binary(data, NotificationNotAdded, offset=offset, length=length)
+
+    def to_binary(self) -> bytes:
+        return binary.to_binary(self, NotificationNotAdded)
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class InvalidCommand(NotificationCommandFailure):
     data: str
 
@@ -415,8 +618,10 @@ class InvalidCommand(NotificationCommandFailure):
         return validation.validate_with_type_tag(value, 'type', 'InvalidCommand', {'data': validation.validate_string}, InvalidCommand)
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes]) -> validation.ValidationResult['InvalidCommand']:
-        return validation.validate_from_string(string, InvalidCommand.validate)
+    def decode(string: validation.JSONText, lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['InvalidCommand']:
+        if lazy:
+            return views.decode_view(string, InvalidCommand, offset=offset, length=length)
+        return validation.validate_from_string(string, InvalidCommand.validate, offset=offset, length=length)
 
     def to_json(self) -> typing.Dict[str, typing.Any]:
         return {'type': 'InvalidCommand', 'data': self.data}
@@ -424,15 +629,27 @@ class InvalidCommand(NotificationCommandFailure):
     def encode(self) -> str:
         return json.dumps(self.to_json())
 
+    @staticmethod
+    def from_binary(data: validation.Buffer, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['InvalidCommand']:
+        return binary.from_binary(data, InvalidCommand, offset=offset, length=length)
+
+    def to_binary(self) -> bytes:
+        return binary.to_binary(self, InvalidCommand)
+
+
+class NotificationCommandResult(encoding.MemoizedEncoding):
+    __tag_field__ = 'type'
+    __slots__ = ()
 
-class NotificationCommandResult:
     @staticmethod
     def validate(value: validation.Unknown) -> validation.ValidationResult['NotificationCommandResult']:
         return validation.validate_with_type_tags(value, 'type', {'CommandSuccess': CommandSuccess.validate, 'CommandFailure': CommandFailure.validate})
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes]) -> validation.ValidationResult['NotificationCommandResult']:
-        return validation.validate_from_string(string, NotificationCommandResult.validate)
+    def decode(string: validation.JSONText, lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['NotificationCommandResult']:
+        if lazy:
+            return views.decode_view(string, NotificationCommandResult, offset=offset, length=length)
+        return validation.validate_from_string(string, NotificationCommandResult.validate, offset=offset, length=length)
 
     def to_json(self) -> typing.Dict[str, typing.Any]:
         raise NotImplementedError(
@@ -442,8 +659,16 @@ class NotificationCommandResult:
         raise NotImplementedError(
             '`encode` is not implemented for base class `NotificationCommandResult`')
 
+    @staticmethod
+    def from_binary(data: validation.Buffer, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['NotificationCommandResult']:
+        return binary.from_binary(data, NotificationCommandResult, offset=offset, length=length)
+
+    def to_binary(self) -> bytes:
+        raise NotImplementedError(
+            '`to_binary` is not implemented for base class `NotificationCommandResult`')
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class CommandSuccess(NotificationCommandResult):
     data: NotificationCommandSuccess
 
@@ -452,8 +677,10 @@ class CommandSuccess(NotificationCommandResult):
         return validation.validate_with_type_tag(value, 'type', 'CommandSuccess', {'data': NotificationCommandSuccess.validate}, CommandSuccess)
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes]) -> validation.ValidationResult['CommandSuccess']:
-        return validation.validate_from_string(string, CommandSuccess.validate)
+    def decode(string: validation.JSONText, lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['CommandSuccess']:
+        if lazy:
+            return views.decode_view(string, CommandSuccess, offset=offset, length=length)
+        return validation.validate_from_string(string, CommandSuccess.validate, offset=offset, length=length)
 
     def to_json(self) -> typing.Dict[str, typing.Any]:
         return {'type': 'CommandSuccess', 'data': self.data.to_json()}
@@ -461,8 +688,15 @@ class CommandSuccess(NotificationCommandResult):
     def encode(self) -> str:
         return json.dumps(self.to_json())
 
+    @staticmethod
+    def from_binary(data: validation.Buffer, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['CommandSuccess']:
+        return binary.from_binary(data, CommandSuccess, offset=offset, length=length)
+
+    def to_binary(self) -> bytes:
+        return binary.to_binary(self, CommandSuccess)
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CommandFailure(NotificationCommandResult):
     data: NotificationCommandFailure
 
@@ -471,11 +705,20 @@ class CommandFailure(NotificationCommandResult):
         return validation.validate_with_type_tag(value, 'type', 'CommandFailure', {'data': NotificationCommandFailure.validate}, CommandFailure)
 
     @staticmethod
-    def decode(string: typing.Union[str, bytes]) -> validation.ValidationResult['CommandFailure']:
-        return validation.validate_from_string(string, CommandFailure.validate)
+    def decode(string: validation.JSONText, lazy: bool = False, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['CommandFailure']:
+        if lazy:
+            return views.decode_view(string, CommandFailure, offset=offset, length=length)
+        return validation.validate_from_string(string, CommandFailure.validate, offset=offset, length=length)
 
     def to_json(self) -> typing.Dict[str, typing.Any]:
         return {'type': 'CommandFailure', 'data': self.data.to_json()}
 
     def encode(self) -> str:
         return json.dumps(self.to_json())
+
+    @staticmethod
+    def from_binary(data: validation.Buffer, offset: int = 0, length: typing.Optional[int] = None) -> validation.ValidationResult['CommandFailure']:
+        return binary.from_binary(data, CommandFailure, offset=offset, length=length)
+
+    def to_binary(self) -> bytes:
+        return binary.to_binary(self, CommandFailure)
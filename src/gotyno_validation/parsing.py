@@ -0,0 +1,228 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import json
+import json.decoder
+import json.scanner
+
+from gotyno_validation import schema as s
+from gotyno_validation.validation import (Invalid, JSONText, Valid, ValidationResult, construct, json_text,
+                                          parsed_json_source, validate_from_string)
+
+Parser = Callable[[str, int], Tuple[Any, int]]
+
+_WHITESPACE = json.decoder.WHITESPACE.match
+_scanstring = json.decoder.scanstring
+_scan_once = json.scanner.make_scanner(json.JSONDecoder())
+
+# The attribute that schemas keep their parser in, see `schema.derived`
+_PARSER_ATTRIBUTE = '_parser'
+
+
+class _Mismatch(Exception):
+    """
+    Raised when the text does not match the schema. The one-pass decoder then falls back to the
+    regular decoder to produce the same error a regular decode would.
+    """
+
+
+def decode_one_pass(value: JSONText,
+                    type_: Any,
+                    *arguments: Any,
+                    offset: int = 0,
+                    length: Optional[int] = None) -> ValidationResult[Any]:
+    """
+    Decodes a string as `type_` in a single pass. Objects are validated and constructed while the
+    JSON text is parsed, guided by the schema of the type, so the generic dict and list tree that
+    `json.loads` would build is never created for interfaces, unions, lists and maps. The result is
+    the same as that of the generated `decode`.
+
+    :param value: The string to decode, or a buffer holding it, see `json_text`.
+    :param type_: The generated type to decode as.
+    :param arguments: Type arguments for generic types, as types or validators.
+    :param offset: Where in `value` the JSON starts.
+    :param length: The length of the JSON, which otherwise runs to the end of `value`.
+    :return: The validation result.
+    """
+    schema = s.schema_of(type_, *arguments)
+    try:
+        text = json_text(value, offset, length)
+    except UnicodeDecodeError:
+        return Invalid('Invalid JSON')
+
+    try:
+        with parsed_json_source():
+            result, end = parser_of(schema)(text, _WHITESPACE(text, 0).end())
+        if _WHITESPACE(text, end).end() != len(text):
+            raise _Mismatch()
+    except (_Mismatch, StopIteration, ValueError, IndexError):
+        # Invalid JSON and invalid values take the regular path to get identical errors
+        return validate_from_string(text, s.validator_of(schema))
+
+    return Valid(result)
+
+
+def parser_of(schema: s.Schema) -> Parser:
+    """
+    Creates a parser for a schema. Parsers take the text and the index of the value to parse and
+    return the validated value together with the index after it, or raise on a mismatch.
+    """
+    return s.derived(schema, _PARSER_ATTRIBUTE, _build_parser)
+
+
+def _skip(text: str, index: int) -> int:
+    return _WHITESPACE(text, index).end()
+
+
+def _build_parser(schema: s.Schema) -> Parser:
+    if isinstance(schema, s.InterfaceSchema):
+        return _interface_parser(schema)
+
+    if isinstance(schema, s.TaggedUnionSchema):
+        return _tagged_union_parser(schema)
+
+    if isinstance(schema, s.ListSchema):
+        def parse_list(text: str, index: int) -> Tuple[List[Any], int]:
+            if text[index] != '[':
+                raise _Mismatch()
+            parse_item = parser_of(schema.item)
+            items = []
+            index = _skip(text, index + 1)
+            if text[index] == ']':
+                return items, index + 1
+            while True:
+                item, index = parse_item(text, index)
+                items.append(item)
+                index = _skip(text, index)
+                if text[index] == ']':
+                    return items, index + 1
+                if text[index] != ',':
+                    raise _Mismatch()
+                index = _skip(text, index + 1)
+        return parse_list
+
+    if isinstance(schema, s.StringMapSchema):
+        def parse_string_map(text: str, index: int) -> Tuple[Dict[str, Any], int]:
+            parse_value = parser_of(schema.value)
+            items = {}
+
+            def parse_member(key: str, value_index: int) -> int:
+                items[key], end = parse_value(text, value_index)
+                return end
+
+            return items, _parse_object(text, index, parse_member)
+        return parse_string_map
+
+    if isinstance(schema, s.OptionalSchema):
+        def parse_optional(text: str, index: int) -> Tuple[Any, int]:
+            if text.startswith('null', index):
+                return None, index + 4
+            return parser_of(schema.inner)(text, index)
+        return parse_optional
+
+    # Everything else is parsed by the C scanner and validated as a whole
+    validator = s.validator_of(schema)
+
+    def parse_value(text: str, index: int) -> Tuple[Any, int]:
+        value, index = _scan_once(text, index)
+        result = validator(value)
+        if isinstance(result, Invalid):
+            raise _Mismatch()
+        return result.value, index
+
+    return parse_value
+
+
+def _parse_object(text: str, index: int, parse_member: Callable[[str, int], int]) -> int:
+    """
+    Parses the object starting at `index`. `parse_member` is called with each key and the index of
+    its value and returns the index after the value. Returns the index after the object.
+    """
+    if text[index] != '{':
+        raise _Mismatch()
+    index = _skip(text, index + 1)
+    if text[index] == '}':
+        return index + 1
+    while True:
+        if text[index] != '"':
+            raise _Mismatch()
+        key, index = _scanstring(text, index + 1)
+        index = _skip(text, index)
+        if text[index] != ':':
+            raise _Mismatch()
+        index = _skip(text, parse_member(key, _skip(text, index + 1)))
+        if text[index] == '}':
+            return index + 1
+        if text[index] != ',':
+            raise _Mismatch()
+        index = _skip(text, index + 1)
+
+
+def _skip_value(text: str, index: int) -> int:
+    return _scan_once(text, index)[1]
+
+
+def _interface_parser(schema: s.InterfaceSchema) -> Parser:
+    tag_field = schema.tag_field
+    tag = schema.tag
+    names = list(schema.fields.keys())
+
+    def parse_interface(text: str, index: int) -> Tuple[Any, int]:
+        values: Dict[str, Any] = {}
+        found_tag = [tag_field is None]
+
+        def parse_member(key: str, value_index: int) -> int:
+            if key == tag_field:
+                found, end = _scan_once(text, value_index)
+                if found != tag:
+                    raise _Mismatch()
+                found_tag[0] = True
+                return end
+            field_schema = schema.fields.get(key)
+            if field_schema is None:
+                return _skip_value(text, value_index)
+            values[key], end = parser_of(field_schema)(text, value_index)
+            return end
+
+        index = _parse_object(text, index, parse_member)
+        if not found_tag[0]:
+            raise _Mismatch()
+        for name in names:
+            if name not in values:
+                # Missing fields are validated as `None`, just like in `validate_interface`
+                result = s.validator_of(schema.fields[name])(None)
+                if isinstance(result, Invalid):
+                    raise _Mismatch()
+                values[name] = result.value
+
+        return construct(schema.constructor, values), index
+
+    return parse_interface
+
+
+def _tagged_union_parser(schema: s.TaggedUnionSchema) -> Parser:
+    tag_field = schema.tag_field
+    validator = s.validator_of(schema)
+
+    def parse_tagged_union(text: str, index: int) -> Tuple[Any, int]:
+        # The tag is usually the first key, as `to_json` puts it there; this is checked without
+        # consuming anything so that the case parser can parse the whole object.
+        if text[index] != '{':
+            raise _Mismatch()
+        key_index = _skip(text, index + 1)
+        if text.startswith('"', key_index):
+            key, after_key = _scanstring(text, key_index + 1)
+            after_key = _skip(text, after_key)
+            if key == tag_field and text[after_key] == ':':
+                tag, _ = _scan_once(text, _skip(text, after_key + 1))
+                case = schema.cases.get(tag) if isinstance(tag, str) else None
+                if case is None:
+                    raise _Mismatch()
+                return parser_of(case)(text, index)
+
+        # Otherwise the object is parsed generically and validated as a whole
+        value, index = _scan_once(text, index)
+        result = validator(value)
+        if isinstance(result, Invalid):
+            raise _Mismatch()
+        return result.value, index
+
+    return parse_tagged_union
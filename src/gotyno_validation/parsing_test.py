@@ -0,0 +1,53 @@
+import gc
+import json
+import unittest
+import weakref
+from gotyno_validation import parsing, schema
+from gotyno_validation.gotyno_output import Event, Holder, Possibly, SomeType
+from gotyno_validation.notifications import NotificationCommandResult
+from gotyno_validation.parsing import decode_one_pass
+from gotyno_validation.validation import Valid, validate_int
+
+
+class TestParsing(unittest.TestCase):
+    "A test suite for one-pass decoding"
+
+    def assertSameAsDecode(self, string, type_, *arguments):
+        expected = type_.decode(string, *arguments)
+        self.assertEqual(decode_one_pass(string, type_, *arguments), expected)
+        self.assertEqual(decode_one_pass(string.encode('utf-8'), type_, *arguments), expected)
+
+        return expected
+
+    def test_valid_values(self):
+        notifications = [{'id': i, 'message': f'må {i}', 'seen': i % 2 == 0} for i in range(10)]
+        result = self.assertSameAsDecode(json.dumps({'type': 'CommandSuccess',
+                                                     'data': {'type': 'Notifications', 'data': notifications}}),
+                                         NotificationCommandResult)
+        self.assertIsInstance(result, Valid)
+
+        self.assertSameAsDecode(' { "data" : {"some_other_field": 1, "type": "SomeType", "some_field": "x", '
+                                '"unknown": [1, {"a": null}]}, "type": "AnotherEvent" } ', Event)
+        self.assertSameAsDecode('{"type": "Definitely", "data": 5}', Possibly, validate_int)
+        self.assertSameAsDecode('{"value": 5}', Holder, validate_int)
+
+    def test_invalid_values_give_the_same_errors(self):
+        self.assertSameAsDecode('{"type": "SomeType", "some_field": 1, "some_other_field": "x"}', SomeType)
+        self.assertSameAsDecode('{"type": "Unknown"}', Event)
+        self.assertSameAsDecode('{"type": "AnotherEvent"', Event)
+        self.assertSameAsDecode('{"type": "Launch"} trailing', Event)
+        self.assertSameAsDecode('[]', NotificationCommandResult)
+
+    def test_parsers_are_freed_along_with_their_schemas(self):
+        holder_schema = schema.schema_of(Holder, validate_int)
+        self.assertIs(parsing.parser_of(holder_schema), parsing.parser_of(holder_schema))
+
+        def validate_temporary(value):
+            return validate_int(value)
+
+        temporary_schema = schema.ListSchema(schema.ValidatorSchema(validate_temporary))
+        self.assertEqual(parsing.parser_of(temporary_schema)('[1]', 0), ([1], 3))
+        references = [weakref.ref(temporary_schema), weakref.ref(validate_temporary)]
+        del temporary_schema, validate_temporary
+        gc.collect()
+        self.assertEqual([r for r in references if r() is not None], [])
@@ -0,0 +1,387 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+import dataclasses
+
+from gotyno_validation import schema as s
+from gotyno_validation.validation import Invalid, Unknown, Valid, ValidationResult
+
+T = TypeVar('T')
+JSONPatch = List[Dict[str, Unknown]]
+
+
+def apply_merge_patch(value: T, patch: Unknown, type_: Any, *arguments: Any) -> ValidationResult[T]:
+    """
+    Applies a JSON merge patch (RFC 7396) to an already validated value of `type_`. Only the parts
+    of the value that the patch touches are validated; everything else is shared with `value`.
+
+    :param value: The validated value to patch.
+    :param patch: The merge patch, as decoded JSON.
+    :param type_: The generated type of `value`.
+    :param arguments: Type arguments for generic types, as types or validators.
+    :return: The validation result, containing the patched value if valid.
+    """
+    return _merge(value, s.schema_of(type_, *arguments), patch, {})
+
+
+def apply_json_patch(value: T, patch: JSONPatch, type_: Any, *arguments: Any) -> ValidationResult[T]:
+    """
+    Applies a JSON patch (RFC 6902) to an already validated value of `type_`, with all of its
+    operations. Only the values the operations write are validated and only the containers along
+    their paths are rebuilt, each at most once per patch. Values that `move` and `copy` take from
+    elsewhere in the value are kept as they are if their new place has the same type, and validated
+    again otherwise.
+
+    :param value: The validated value to patch.
+    :param patch: The list of patch operations, as decoded JSON.
+    :param type_: The generated type of `value`.
+    :param arguments: Type arguments for generic types, as types or validators.
+    :return: The validation result, containing the patched value if valid.
+    """
+    schema = s.schema_of(type_, *arguments)
+    # Containers copied by this patch, which later operations change in place
+    owned: Dict[int, Any] = {}
+    for operation in patch:
+        if not isinstance(operation, dict) or 'op' not in operation or 'path' not in operation:
+            return Invalid(f'Invalid patch operation: {operation}')
+        path = operation['path']
+        tokens = _parse_pointer(path)
+        if tokens is None:
+            return Invalid({path: 'Invalid JSON pointer'})
+
+        op = operation['op']
+        if op == 'test':
+            result = _test(value, schema, tokens, operation.get('value'))
+        elif op in ('add', 'replace', 'remove'):
+            if op != 'remove' and 'value' not in operation:
+                return Invalid({path: f'Missing value for "{op}"'})
+            result = _update(value, schema, tokens, op, _validated(operation.get('value')), owned)
+        elif op in ('move', 'copy'):
+            from_tokens = _parse_pointer(operation.get('from'))
+            if from_tokens is None:
+                return Invalid({path: f'Invalid JSON pointer for "from": {operation.get("from")}'})
+            result = _transfer(value, schema, from_tokens, tokens, op, owned)
+        else:
+            result = Invalid(f'Unsupported operation: {op}')
+
+        if isinstance(result, Invalid):
+            return Invalid({path: result.reason})
+        value = result.value
+
+    return Valid(value)
+
+
+def _parse_pointer(pointer: Unknown) -> Optional[List[str]]:
+    if not isinstance(pointer, str) or (pointer != '' and not pointer.startswith('/')):
+        return None
+    if pointer == '':
+        return []
+
+    return [t.replace('~1', '/').replace('~0', '~') for t in pointer[1:].split('/')]
+
+
+def _resolve(current: Unknown, schema: s.Schema) -> Tuple[Unknown, s.Schema]:
+    """
+    Unwraps optional and tagged union schemas to the schema that describes `current` itself.
+    """
+    if isinstance(schema, s.OptionalSchema):
+        if current is None:
+            return current, None
+        return _resolve(current, schema.inner)
+    if isinstance(schema, s.TaggedUnionSchema):
+        # Cases are keyed by their tag, which need not be the name of their class
+        for case in schema.cases.values():
+            if isinstance(current, case.constructor):
+                return current, case
+        return current, None
+
+    return current, schema
+
+
+def _own(container: Any, owned: Dict[int, Any]) -> Any:
+    """
+    Copies a list or map the first time a patch changes it. Later operations of the same patch change
+    the copy in place, so a patch copies each container on its paths once rather than once per
+    operation. The copies are kept in `owned`, so that their ids aren't reused while patching.
+    """
+    if id(container) in owned:
+        return container
+    copy = dict(container) if isinstance(container, dict) else list(container)
+    owned[id(copy)] = copy
+
+    return copy
+
+
+# Gives the value to write at a place with a given schema
+_Write = Callable[[s.Schema], ValidationResult[Any]]
+
+
+def _validated(raw: Unknown) -> _Write:
+    def write(schema: s.Schema) -> ValidationResult[Any]:
+        return s.validator_of(schema)(raw)
+
+    return write
+
+
+def _update(current: Unknown,
+            schema: s.Schema,
+            tokens: List[str],
+            op: str,
+            write: _Write,
+            owned: Dict[int, Any]) -> ValidationResult[Any]:
+    if len(tokens) == 0:
+        if op == 'remove':
+            return Invalid('Cannot remove the root value')
+        return write(schema)
+
+    current, schema = _resolve(current, schema)
+    token, rest = tokens[0], tokens[1:]
+
+    if isinstance(schema, s.InterfaceSchema):
+        if token not in schema.fields:
+            return Invalid(f'Unknown field: {token}')
+        if token == schema.tag_field:
+            return Invalid(f'Cannot change tag field "{token}"')
+        field_schema = schema.fields[token]
+        if len(rest) > 0:
+            result = _update(getattr(current, token), field_schema, rest, op, write, owned)
+        elif op == 'remove':
+            # A removed field is validated as missing, just like in `validate_interface`
+            result = s.validator_of(field_schema)(None)
+        else:
+            result = write(field_schema)
+        if isinstance(result, Invalid):
+            return result
+        if result.value is getattr(current, token):
+            return Valid(current)
+
+        return Valid(dataclasses.replace(current, **{token: result.value}))
+
+    if isinstance(schema, s.ListSchema):
+        if len(rest) == 0 and op == 'add':
+            index = len(current) if token == '-' else _parse_index(token, len(current) + 1)
+            if index is None:
+                return Invalid(f'Invalid list index: {token}')
+            result = write(schema.item)
+            if isinstance(result, Invalid):
+                return result
+            new_list = _own(current, owned)
+            new_list.insert(index, result.value)
+
+            return Valid(new_list)
+
+        index = _parse_index(token, len(current))
+        if index is None:
+            return Invalid(f'Invalid list index: {token}')
+        if len(rest) > 0:
+            result = _update(current[index], schema.item, rest, op, write, owned)
+        elif op == 'remove':
+            new_list = _own(current, owned)
+            del new_list[index]
+            return Valid(new_list)
+        else:
+            result = write(schema.item)
+        if isinstance(result, Invalid):
+            return result
+        new_list = _own(current, owned)
+        new_list[index] = result.value
+
+        return Valid(new_list)
+
+    if isinstance(schema, s.StringMapSchema):
+        if len(rest) > 0:
+            if token not in current:
+                return Invalid(f'Missing key: {token}')
+            result = _update(current[token], schema.value, rest, op, write, owned)
+        elif op == 'remove':
+            if token not in current:
+                return Invalid(f'Missing key: {token}')
+            new_map = _own(current, owned)
+            del new_map[token]
+            return Valid(new_map)
+        else:
+            if op == 'replace' and token not in current:
+                return Invalid(f'Missing key: {token}')
+            result = write(schema.value)
+        if isinstance(result, Invalid):
+            return result
+        new_map = _own(current, owned)
+        new_map[token] = result.value
+
+        return Valid(new_map)
+
+    return Invalid(f'Path does not exist: {token}')
+
+
+def _parse_index(token: str, length: int) -> Optional[int]:
+    if not token.isdigit() or (len(token) > 1 and token.startswith('0')):
+        return None
+    index = int(token)
+
+    return index if index < length else None
+
+
+def _get(current: Unknown, schema: s.Schema, tokens: List[str]) -> ValidationResult[Tuple[Any, s.Schema]]:
+    """
+    Finds the value at a path and its schema.
+    """
+    for token in tokens:
+        current, schema = _resolve(current, schema)
+        if isinstance(schema, s.InterfaceSchema) and token in schema.fields:
+            current, schema = getattr(current, token), schema.fields[token]
+        elif isinstance(schema, s.ListSchema) and _parse_index(token, len(current)) is not None:
+            current, schema = current[int(token)], schema.item
+        elif isinstance(schema, s.StringMapSchema) and token in current:
+            current, schema = current[token], schema.value
+        else:
+            return Invalid(f'Path does not exist: {token}')
+
+    return Valid((current, schema))
+
+
+def _test(value: Unknown, schema: s.Schema, tokens: List[str], raw: Unknown) -> ValidationResult[Any]:
+    """
+    Gives back `value` itself if the value at the path equals `raw`.
+    """
+    found = _get(value, schema, tokens)
+    if isinstance(found, Invalid):
+        return found
+    current, current_schema = found.value
+
+    result = s.validator_of(current_schema)(raw)
+    if isinstance(result, Invalid) or result.value != current:
+        return Invalid(f'Test failed, value is: {current}')
+
+    return Valid(value)
+
+
+def _transfer(current: Unknown,
+              schema: s.Schema,
+              from_tokens: List[str],
+              tokens: List[str],
+              op: str,
+              owned: Dict[int, Any]) -> ValidationResult[Any]:
+    """
+    Moves or copies the value at `from_tokens` to `tokens`, adding it there like `add` does.
+    """
+    found = _get(current, schema, from_tokens)
+    if isinstance(found, Invalid):
+        return Invalid({'from': found.reason})
+    moved, moved_schema = found.value
+
+    if op == 'move':
+        if from_tokens == tokens:
+            return Valid(current)
+        if tokens[:len(from_tokens)] == from_tokens:
+            return Invalid('Cannot move a value into itself')
+        removed = _update(current, schema, from_tokens, 'remove', _validated(None), owned)
+        if isinstance(removed, Invalid):
+            return Invalid({'from': removed.reason})
+        current = removed.value
+    else:
+        # The copy and the original are the same object, so containers in it that this patch owns
+        # mustn't be changed in place anymore
+        owned.clear()
+
+    def write(target: s.Schema) -> ValidationResult[Any]:
+        return _retyped(moved, moved_schema, target)
+
+    return _update(current, schema, tokens, 'add', write, owned)
+
+
+def _retyped(value: Any, source: s.Schema, target: s.Schema) -> ValidationResult[Any]:
+    """
+    Gives a value of `source` as a value of `target`: as it is if the schemas describe the same
+    type, otherwise validated again. Validators accept instances of generated classes, but tagged
+    unions take their cases from dicts, so the case of an instance is found first.
+    """
+    if _same_schema(source, target):
+        return Valid(value)
+    resolved_value, resolved = _resolve(value, target)
+    if resolved is None:
+        if value is None and isinstance(target, s.OptionalSchema):
+            return Valid(None)
+        return Invalid(f'Value does not match the type at the path: {value}')
+
+    return s.validator_of(resolved)(resolved_value)
+
+
+def _same_schema(first: s.Schema, second: s.Schema) -> bool:
+    # Interfaces and tagged unions are only the same schema if they're the same object, since they
+    # may refer to themselves
+    if first is second:
+        return True
+    if type(first) is not type(second):
+        return False
+    if isinstance(first, (s.OptionalSchema, s.ListSchema, s.StringMapSchema)):
+        return all(_same_schema(getattr(first, f.name), getattr(second, f.name))
+                   for f in dataclasses.fields(first))
+
+    return isinstance(first, (s.PrimitiveSchema, s.LiteralSchema, s.EnumSchema)) and first == second
+
+
+def _merge(current: Unknown, schema: s.Schema, patch: Unknown, owned: Dict[int, Any]) -> ValidationResult[Any]:
+    if not isinstance(patch, dict):
+        return s.validator_of(schema)(patch)
+
+    resolved, resolved_schema = _resolve(current, schema)
+    if isinstance(resolved_schema, s.InterfaceSchema):
+        errors = dict()
+        changes = dict()
+        for key, value in patch.items():
+            if key == resolved_schema.tag_field:
+                if value != resolved_schema.tag:
+                    errors[key] = f'Cannot change tag field "{key}"'
+                continue
+            # Unknown keys would be ignored by `validate_interface` as well
+            if key not in resolved_schema.fields:
+                continue
+            field_schema = resolved_schema.fields[key]
+            if value is None:
+                result = s.validator_of(field_schema)(None)
+            else:
+                result = _merge(getattr(resolved, key), field_schema, value, owned)
+            if isinstance(result, Invalid):
+                errors[key] = result.reason
+            elif result.value is not getattr(resolved, key):
+                changes[key] = result.value
+
+        if len(errors) > 0:
+            return Invalid(errors)
+        if len(changes) == 0:
+            return Valid(resolved)
+
+        return Valid(dataclasses.replace(resolved, **changes))
+
+    if isinstance(resolved_schema, s.StringMapSchema):
+        errors = dict()
+        # Copied on the first change only, so that maps the patch doesn't change are shared
+        new_map = resolved
+        for key, value in patch.items():
+            if value is None:
+                if key in new_map:
+                    new_map = _own(new_map, owned)
+                    del new_map[key]
+                continue
+            if key in new_map:
+                result = _merge(new_map[key], resolved_schema.value, value, owned)
+            else:
+                result = s.validator_of(resolved_schema.value)(_without_nulls(value))
+            if isinstance(result, Invalid):
+                errors[key] = result.reason
+            elif key not in new_map or result.value is not new_map[key]:
+                new_map = _own(new_map, owned)
+                new_map[key] = result.value
+
+        if len(errors) > 0:
+            return Invalid(errors)
+
+        return Valid(new_map)
+
+    # Anything else is replaced wholesale by the patch, which merges into an empty object
+    return s.validator_of(schema)(_without_nulls(patch))
+
+
+def _without_nulls(patch: Unknown) -> Unknown:
+    if not isinstance(patch, dict):
+        return patch
+
+    return {k: _without_nulls(v) for k, v in patch.items() if v is not None}
@@ -0,0 +1,131 @@
+import typing
+import unittest
+from unittest import mock
+from gotyno_validation import gotyno_output, patching, schema
+from gotyno_validation.gotyno_output import Event, Holder, SomeType
+from gotyno_validation.notifications import (AddNotificationError, CommandSuccess, Notification,
+                                             NotificationCommandResult, Notifications)
+from gotyno_validation.patching import apply_json_patch, apply_merge_patch
+from gotyno_validation.validation import Invalid, Valid, validate_int, validate_string
+
+
+class TestPatching(unittest.TestCase):
+    "A test suite for incremental revalidation of patches"
+
+    def test_json_patch_rebuilds_only_the_changed_spine(self):
+        notifications = [Notification(i, f'message {i}', False) for i in range(10)]
+        value = CommandSuccess(Notifications(notifications))
+
+        result = apply_json_patch(value, [{'op': 'replace', 'path': '/data/data/3/seen', 'value': True},
+                                          {'op': 'add', 'path': '/data/data/-',
+                                           'value': {'id': 10, 'message': 'new', 'seen': False}},
+                                          {'op': 'remove', 'path': '/data/data/0'}],
+                                  NotificationCommandResult)
+        self.assertIsInstance(result, Valid)
+        patched = result.value.data.data
+        self.assertEqual(len(patched), 10)
+        self.assertEqual(patched[2], Notification(3, 'message 3', True))
+        self.assertEqual(patched[-1], Notification(10, 'new', False))
+        self.assertIs(patched[0], notifications[1])
+        self.assertEqual(value.data.data[3].seen, False)
+
+    def test_json_patch_copies_each_container_once(self):
+        notifications = [Notification(i, f'message {i}', False) for i in range(1000)]
+        value = CommandSuccess(Notifications(notifications))
+        operations = [{'op': 'replace', 'path': f'/data/data/{i}/seen', 'value': True} for i in range(0, 1000, 10)]
+        operations.append({'op': 'remove', 'path': '/data/data/1'})
+
+        with mock.patch.object(patching, 'list', side_effect=list, create=True) as copy_list:
+            result = apply_json_patch(value, operations, NotificationCommandResult)
+        self.assertEqual(copy_list.call_count, 1)
+        patched = result.value.data.data
+        self.assertEqual(len(patched), 999)
+        self.assertEqual(sum(n.seen for n in patched), 100)
+        self.assertFalse(any(n.seen for n in notifications))
+
+        # A failing patch leaves the value as it was
+        self.assertIsInstance(apply_json_patch(value, [{'op': 'remove', 'path': '/data/data/0'},
+                                                       {'op': 'replace', 'path': '/data/data/0/id', 'value': 'x'}],
+                                               NotificationCommandResult), Invalid)
+        self.assertEqual(len(notifications), 1000)
+
+    def test_json_patch_finds_cases_by_their_tag(self):
+        # Case tags need not be the names of their classes
+        notification = schema.schema_of(gotyno_output.Notification)
+        event = schema.TaggedUnionSchema(Event, 'type', {
+            'notification': schema.InterfaceSchema(gotyno_output.Notification, notification.fields, 'type',
+                                                   'notification', 0)})
+        self.assertEqual(apply_json_patch(Holder(gotyno_output.Notification('a')),
+                                          [{'op': 'replace', 'path': '/value/data', 'value': 'b'}], Holder, event),
+                         Valid(Holder(gotyno_output.Notification('b'))))
+
+    def test_json_patch_reports_invalid_values(self):
+        value = AddNotificationError(1, Notification(1, 'hello', False), 'error')
+        self.assertEqual(apply_json_patch(value, [{'op': 'replace', 'path': '/notification/id', 'value': 'x'}],
+                                          AddNotificationError),
+                         Invalid({'/notification/id': "Value is not int: x (<class 'str'>)"}))
+        self.assertIsInstance(apply_json_patch(value, [{'op': 'test', 'path': '/error', 'value': 'other'}],
+                                               AddNotificationError), Invalid)
+        self.assertIsInstance(apply_json_patch(value, [{'op': 'replace', 'path': '/missing', 'value': 1}],
+                                               AddNotificationError), Invalid)
+
+    def test_json_patch_moves_and_copies_values(self):
+        notifications = [Notification(i, f'message {i}', False) for i in range(5)]
+        value = CommandSuccess(Notifications(notifications))
+        result = apply_json_patch(value, [{'op': 'move', 'from': '/data/data/0', 'path': '/data/data/-'},
+                                          {'op': 'copy', 'from': '/data/data/0', 'path': '/data/data/1'},
+                                          {'op': 'test', 'path': '/data/data/5/id', 'value': 0}],
+                                  NotificationCommandResult)
+        self.assertEqual([n.id for n in result.value.data.data], [1, 1, 2, 3, 4, 0])
+        self.assertIs(result.value.data.data[-1], notifications[0])
+        self.assertEqual([n.id for n in notifications], [0, 1, 2, 3, 4])
+
+        # Copies are changed on their own, even when the patch copied the copied container already
+        maps = Holder({'a': {'x': 1}})
+        result = apply_json_patch(maps, [{'op': 'add', 'path': '/value/a/y', 'value': 2},
+                                         {'op': 'copy', 'from': '/value/a', 'path': '/value/b'},
+                                         {'op': 'remove', 'path': '/value/b/x'}],
+                                  Holder, typing.Dict[str, typing.Dict[str, int]])
+        self.assertEqual(result, Valid(Holder({'a': {'x': 1, 'y': 2}, 'b': {'y': 2}})))
+        self.assertEqual(maps, Holder({'a': {'x': 1}}))
+
+        # Values are validated again where their type differs
+        value = AddNotificationError(1, Notification(1, 'hello', False), 'error')
+        self.assertEqual(apply_json_patch(value, [{'op': 'copy', 'from': '/notification/message', 'path': '/error'}],
+                                          AddNotificationError),
+                         Valid(AddNotificationError(1, Notification(1, 'hello', False), 'hello')))
+        self.assertIsInstance(apply_json_patch(value, [{'op': 'copy', 'from': '/userId', 'path': '/error'}],
+                                               AddNotificationError), Invalid)
+        self.assertIsInstance(apply_json_patch(value, [{'op': 'move', 'from': '/notification', 'path': '/notification/id'}],
+                                               AddNotificationError), Invalid)
+        self.assertIsInstance(apply_json_patch(value, [{'op': 'move', 'from': '/userId', 'path': '/notification/id'}],
+                                               AddNotificationError), Invalid)
+        # Cases of tagged unions are found by their class
+        case = CommandSuccess(Notifications([]))
+        self.assertIs(apply_json_patch(Holder(case), [{'op': 'copy', 'from': '/value', 'path': '/value'}],
+                                       Holder, NotificationCommandResult).value.value, case)
+        self.assertEqual(apply_json_patch(Holder(case), [{'op': 'copy', 'from': '/value/data', 'path': '/value'}],
+                                          Holder, NotificationCommandResult), Invalid(
+                                              {'/value': f'Value does not match the type at the path: {case.data}'}))
+
+    def test_merge_patch_copies_only_changed_maps(self):
+        maps = Holder({'a': {'x': 1}, 'b': {'y': 2}})
+        result = apply_merge_patch(maps, {'value': {'a': {'x': 3}, 'b': {'y': 2}}},
+                                   Holder, typing.Dict[str, typing.Dict[str, int]])
+        self.assertEqual(result, Valid(Holder({'a': {'x': 3}, 'b': {'y': 2}})))
+        self.assertIs(result.value.value['b'], maps.value['b'])
+        self.assertIs(apply_merge_patch(maps, {'value': {'b': {'y': 2}}}, Holder,
+                                        typing.Dict[str, typing.Dict[str, int]]).value, maps)
+        self.assertEqual(apply_merge_patch(maps, {'value': {'b': {'y': None}}}, Holder,
+                                           typing.Dict[str, typing.Dict[str, int]]).value.value['b'], {})
+        self.assertEqual(maps.value['b'], {'y': 2})
+
+    def test_merge_patch(self):
+        value = SomeType('SomeType', 'a', 1, 'maybe')
+        self.assertEqual(apply_merge_patch(value, {'some_other_field': 2, 'maybe_some_field': None}, SomeType),
+                         Valid(SomeType('SomeType', 'a', 2, None)))
+        self.assertEqual(apply_merge_patch(value, {'some_field': 1}, SomeType),
+                         Invalid({'some_field': "Value is not string: 1 (<class 'int'>)"}))
+
+        holder = Holder(1)
+        self.assertEqual(apply_merge_patch(holder, {'value': 2}, Holder, validate_int), Valid(Holder(2)))
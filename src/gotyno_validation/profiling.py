@@ -0,0 +1,278 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from dataclasses import dataclass
+from types import CodeType, FrameType, ModuleType
+import bisect
+import sys
+import tracemalloc
+
+# Allocations are attributed to the innermost frame of the traceback that runs code of this
+# package: a validator, an encoder, a generated method, or a dataclass `__init__` (which dataclasses
+# compile from a string, so it has no file of its own).
+_PACKAGE = 'gotyno_validation'
+CONSTRUCTOR_STAGE = '<constructor>'
+OTHER_STAGE = '<other>'
+
+
+@dataclass(frozen=True)
+class StageAllocation:
+    """
+    The memory attributed to one stage, in bytes and allocated blocks. `peak` is the most memory
+    the stage had allocated at once while it ran, in bytes, including memory it freed again.
+    """
+    stage: str
+    size: int
+    count: int
+    peak: int = 0
+
+
+@dataclass(frozen=True)
+class AllocationProfile:
+    """
+    The memory a workload allocated and still held when it returned, per stage, largest first, with
+    the peak memory of each stage while it ran.
+    """
+    stages: Tuple[StageAllocation, ...]
+
+    @property
+    def total_size(self) -> int:
+        return sum(s.size for s in self.stages)
+
+    @property
+    def total_count(self) -> int:
+        return sum(s.count for s in self.stages)
+
+    def stage(self, name: str) -> Optional[StageAllocation]:
+        for stage in self.stages:
+            if stage.stage == name:
+                return stage
+
+        return None
+
+    def report(self, limit: Optional[int] = None) -> str:
+        """
+        Formats the profile as a table.
+        """
+        return _table(['stage', 'bytes', 'blocks', 'peak'],
+                      [(s.stage, s.size, s.count, s.peak) for s in self.stages[:limit]],
+                      ('total', self.total_size, self.total_count, ''))
+
+
+class _StageIndex:
+    """
+    Maps source lines of the package to the innermost function they belong to.
+    """
+
+    def __init__(self) -> None:
+        self._files: Dict[str, Tuple[List[int], List[Tuple[int, int, str]]]] = {}
+        seen = set()
+        modules = [m for name, m in list(sys.modules.items())
+                   if (name == _PACKAGE or name.startswith(_PACKAGE + '.')) and isinstance(m, ModuleType)
+                   and name != __name__]
+        ranges: Dict[str, List[Tuple[int, int, str]]] = {}
+        for module in modules:
+            module_name = module.__name__.rpartition('.')[2]
+            for value in list(vars(module).values()):
+                for code in _codes_of(value):
+                    self._add(code, module_name, ranges, seen)
+
+        for filename, file_ranges in ranges.items():
+            # Narrower ranges are nested functions, which take precedence
+            file_ranges.sort(key=lambda r: (r[0], -r[1]))
+            self._files[filename] = ([r[0] for r in file_ranges], file_ranges)
+
+    def _add(self, code: CodeType, module_name: str, ranges: Dict[str, List[Tuple[int, int, str]]],
+             seen: set) -> None:
+        if id(code) in seen:
+            return
+        seen.add(id(code))
+        lines = [line for _, _, line in code.co_lines() if line is not None]
+        if len(lines) > 0:
+            name = getattr(code, 'co_qualname', code.co_name)
+            ranges.setdefault(code.co_filename, []).append((min(lines), max(lines), f'{module_name}.{name}'))
+        for constant in code.co_consts:
+            if isinstance(constant, CodeType):
+                self._add(constant, module_name, ranges, seen)
+
+    def stage_of(self, frame: tracemalloc.Frame) -> Optional[str]:
+        if frame.filename == '<string>':
+            return CONSTRUCTOR_STAGE
+        entry = self._files.get(frame.filename)
+        if entry is None:
+            return None
+        starts, file_ranges = entry
+        stage = None
+        for i in range(bisect.bisect_right(starts, frame.lineno) - 1, -1, -1):
+            start, end, name = file_ranges[i]
+            if start <= frame.lineno <= end:
+                # The latest starting range that contains the line is the innermost function
+                stage = name
+                break
+
+        return stage
+
+
+def _codes_of(value: Any) -> List[CodeType]:
+    if isinstance(value, staticmethod):
+        value = value.__func__
+    value = getattr(value, '__wrapped__', value)
+    code = getattr(value, '__code__', None)
+    if isinstance(code, CodeType):
+        return [code]
+    if isinstance(value, type):
+        return [c for member in list(vars(value).values()) for c in _codes_of(member)]
+
+    return []
+
+
+class _PeakTracker:
+    """
+    Follows calls of stages with `sys.setprofile` and records the most memory each stage had
+    allocated at once, above what was allocated when it was called. This includes what the stage
+    freed again before returning, which snapshots taken afterwards don't see.
+    """
+
+    def __init__(self) -> None:
+        self.peaks: Dict[str, int] = {}
+        self._stages: Dict[CodeType, Optional[str]] = {}
+        # The frame, stage, memory when called and peak memory so far of the running stages
+        self._running: List[List[Any]] = []
+
+    def __call__(self, frame: FrameType, event: str, arg: Any) -> None:
+        if event == 'call':
+            code = frame.f_code
+            stage = self._stages.get(code, code)
+            if stage is code:
+                stage = self._stages[code] = _stage_of_frame(frame)
+            if stage is None:
+                return
+            current, peak = tracemalloc.get_traced_memory()
+            running = self._running
+            if len(running) > 0 and peak > running[-1][3]:
+                running[-1][3] = peak
+            # The peak is reset for each call, so the caller takes over the peak of its callees
+            tracemalloc.reset_peak()
+            running.append([frame, stage, current, current])
+        elif event == 'return':
+            running = self._running
+            if len(running) == 0 or running[-1][0] is not frame:
+                return
+            _, stage, start, peak = running.pop()
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            if peak - start > self.peaks.get(stage, -1):
+                self.peaks[stage] = peak - start
+            if len(running) > 0 and peak > running[-1][3]:
+                running[-1][3] = peak
+
+
+def _stage_of_frame(frame: FrameType) -> Optional[str]:
+    module_name = frame.f_globals.get('__name__', '')
+    if (module_name != _PACKAGE and not module_name.startswith(_PACKAGE + '.')) or module_name == __name__:
+        return None
+    code = frame.f_code
+    if code.co_filename == '<string>':
+        return CONSTRUCTOR_STAGE
+
+    return f'{module_name.rpartition(".")[2]}.{getattr(code, "co_qualname", code.co_name)}'
+
+
+def profile_allocations(workload: Callable[[], Any], frames: int = 32) -> AllocationProfile:
+    """
+    Runs a workload under `tracemalloc` and attributes the memory it allocated to stages: the
+    validators, encoders and generated methods of this package, and constructors. Allocations
+    outside of the package, like in `json`, count towards the innermost package function that
+    caused them.
+
+    The bytes and blocks of a stage are the memory still held when the workload returns, so the
+    workload should return what it decoded or encoded; the result is kept alive until the profile
+    is taken. Memory that is only used while a stage runs, like parsed JSON that is validated and
+    dropped, shows in the peak of the stage instead. Peaks are followed with `sys.setprofile`, in the
+    thread that runs the workload, which makes it run about twice as slow as under `tracemalloc`
+    alone. They aren't followed while another profiler is set.
+
+    :param workload: The function to profile.
+    :param frames: How many frames to keep per allocation; deeper stacks may fall under `<other>`.
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start(frames)
+    tracker = _PeakTracker()
+    # Profilers written in C, like `cProfile`, couldn't be set again afterwards
+    follow_peaks = sys.getprofile() is None
+    try:
+        before = tracemalloc.take_snapshot()
+        if follow_peaks:
+            sys.setprofile(tracker)
+        try:
+            result = workload()
+        finally:
+            if follow_peaks:
+                sys.setprofile(None)
+        after = tracemalloc.take_snapshot()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    index = _StageIndex()
+    sizes: Dict[str, List[int]] = {}
+    for difference in after.compare_to(before, 'traceback'):
+        if difference.size_diff <= 0:
+            continue
+        stage = OTHER_STAGE
+        for frame in reversed(difference.traceback):
+            found = index.stage_of(frame)
+            if found is not None:
+                stage = found
+                break
+        totals = sizes.setdefault(stage, [0, 0])
+        totals[0] += difference.size_diff
+        totals[1] += max(0, difference.count_diff)
+    del result
+
+    stages = [StageAllocation(stage, *sizes.get(stage, (0, 0)), tracker.peaks.get(stage, 0))
+              for stage in sizes.keys() | tracker.peaks.keys()]
+
+    return AllocationProfile(tuple(sorted(stages, key=lambda s: (-s.size, s.stage))))
+
+
+@dataclass(frozen=True)
+class StageDifference:
+    """
+    The change in memory of one stage between two profiles.
+    """
+    stage: str
+    size_diff: int
+    count_diff: int
+
+
+def diff_profiles(before: AllocationProfile, after: AllocationProfile) -> List[StageDifference]:
+    """
+    Compares two profiles, giving the changes per stage with the largest changes first.
+    """
+    stages = {s.stage for s in before.stages} | {s.stage for s in after.stages}
+    differences = []
+    for stage in stages:
+        old = before.stage(stage) or StageAllocation(stage, 0, 0)
+        new = after.stage(stage) or StageAllocation(stage, 0, 0)
+        differences.append(StageDifference(stage, new.size - old.size, new.count - old.count))
+
+    return sorted(differences, key=lambda d: (-abs(d.size_diff), d.stage))
+
+
+def format_diff(differences: List[StageDifference]) -> str:
+    """
+    Formats profile differences as a table.
+    """
+    return _table(['stage', 'bytes', 'blocks'],
+                  [(d.stage, f'{d.size_diff:+}', f'{d.count_diff:+}') for d in differences],
+                  ('total', f'{sum(d.size_diff for d in differences):+}',
+                   f'{sum(d.count_diff for d in differences):+}'))
+
+
+def _table(header: List[str], rows: List[Tuple[Any, ...]], total: Tuple[Any, ...]) -> str:
+    width = max([len(header[0]), len(str(total[0]))] + [len(str(r[0])) for r in rows])
+    widths = [12, 10, 12]
+    lines = []
+    for row in [header] + rows + [total]:
+        lines.append(f'{row[0]:<{width}}' + ''.join(f'  {c:>{w}}' for c, w in zip(row[1:], widths)))
+
+    return '\n'.join(lines)
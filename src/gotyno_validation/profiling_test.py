@@ -0,0 +1,46 @@
+import json
+import unittest
+from gotyno_validation import profiling
+from gotyno_validation.loadgen import generate_payloads
+from gotyno_validation.notifications import NotificationCommandResult
+
+
+class TestProfiling(unittest.TestCase):
+    "A test suite for allocation profiling"
+
+    def setUp(self):
+        self.payloads = [json.dumps(p) for p in generate_payloads(500, NotificationCommandResult)]
+
+    def test_allocations_are_attributed_to_stages(self):
+        profile = profiling.profile_allocations(lambda: [NotificationCommandResult.decode(p) for p in self.payloads])
+        construct = profile.stage(profiling.CONSTRUCTOR_STAGE)
+        self.assertIsNotNone(construct)
+        self.assertGreater(construct.count, 500)
+        self.assertIsNotNone(profile.stage('validation.validate_from_string'))
+        self.assertEqual(list(profile.stages), sorted(profile.stages, key=lambda s: -s.size))
+        self.assertIn(profiling.CONSTRUCTOR_STAGE, profile.report())
+
+        values = [NotificationCommandResult.decode(p).value for p in self.payloads]
+        encoded = profiling.profile_allocations(lambda: [v.to_json() for v in values])
+        self.assertIsNotNone(encoded.stage('notifications.Notification.to_json'))
+
+    def test_memory_freed_within_a_stage_counts_towards_its_peak(self):
+        payload = json.dumps({'type': 'CommandSuccess', 'data': {'type': 'Notifications', 'data': [
+            {'id': i, 'message': f'{i:0100}', 'seen': False} for i in range(2000)]}})
+        # The decoded value is dropped before the workload returns
+        profile = profiling.profile_allocations(lambda: NotificationCommandResult.decode(payload) and None)
+        decode = profile.stage('validation.validate_from_string')
+        self.assertIsNotNone(decode)
+        self.assertGreater(decode.peak, 2000 * 100)
+        self.assertLess(decode.size, decode.peak / 10)
+        # Each item only holds its own memory at once
+        self.assertLess(profile.stage('notifications.Notification.validate').peak, decode.peak / 4)
+        self.assertIn('peak', profile.report())
+
+    def test_diff(self):
+        small = profiling.profile_allocations(lambda: [NotificationCommandResult.decode(p) for p in self.payloads[:50]])
+        large = profiling.profile_allocations(lambda: [NotificationCommandResult.decode(p) for p in self.payloads])
+        differences = profiling.diff_profiles(small, large)
+        self.assertGreater({d.stage: d for d in differences}[profiling.CONSTRUCTOR_STAGE].size_diff, 0)
+        self.assertEqual(differences, sorted(differences, key=lambda d: -abs(d.size_diff)))
+        self.assertIn('total', profiling.format_diff(differences))
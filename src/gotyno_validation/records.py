@@ -0,0 +1,221 @@
+from typing import Any, BinaryIO, Iterable, List, Optional, Union
+from collections.abc import Sequence
+import mmap
+import os
+import struct
+import zlib
+
+from gotyno_validation import binary
+from gotyno_validation import schema as s
+
+# File layout:
+#   header: magic, version, fingerprint length + fingerprint, type name length + type name
+#   records: binary encoded values, back to back
+#   index: one (offset, length, crc32) entry per record
+#   footer: index offset, record count, magic
+MAGIC = b'GTYR'
+VERSION = 1
+
+_HEADER = struct.Struct('<4sBH')
+_NAME_LENGTH = struct.Struct('<H')
+_INDEX_ENTRY = struct.Struct('<QII')
+_FOOTER = struct.Struct('<QQ4s')
+
+
+class RecordWriter:
+    """
+    Writes validated values of one type to a record file. Use as a context manager, or call
+    `close()` when done; the index is written on close. When the `with` block raises, the file is
+    removed instead, as with `abort()`, so that no file holds only part of what was meant to be in it.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], type_: Any, *arguments: Any):
+        self._path = path
+        self._schema = s.schema_of(type_, *arguments)
+        self._encode = binary.encoder_of(self._schema)
+        self._file: Optional[BinaryIO] = open(path, 'wb')
+        self._index = bytearray()
+        self._count = 0
+
+        fingerprint = s.fingerprint(self._schema).encode('ascii')
+        name = getattr(type_, '__qualname__', repr(type_)).encode('utf-8')
+        self._file.write(_HEADER.pack(MAGIC, VERSION, len(fingerprint)))
+        self._file.write(fingerprint)
+        self._file.write(_NAME_LENGTH.pack(len(name)))
+        self._file.write(name)
+        self._offset = self._file.tell()
+
+    def write(self, value: Any) -> None:
+        """
+        Appends a value to the file. The value is expected to be valid already.
+        """
+        out = bytearray()
+        self._encode(value, out)
+        self._file.write(out)
+        self._index += _INDEX_ENTRY.pack(self._offset, len(out), zlib.crc32(out))
+        self._offset += len(out)
+        self._count += 1
+
+    @property
+    def count(self) -> int:
+        """
+        The number of records written so far.
+        """
+        return self._count
+
+    def write_all(self, values: Iterable[Any]) -> None:
+        """
+        Appends all values to the file.
+        """
+        for value in values:
+            self.write(value)
+
+    def close(self) -> None:
+        """
+        Writes the index and footer and closes the file.
+        """
+        if self._file is None:
+            return
+        self._file.write(self._index)
+        self._file.write(_FOOTER.pack(self._offset, self._count, MAGIC))
+        self._file.close()
+        self._file = None
+
+    def abort(self) -> None:
+        """
+        Closes and removes the file without writing the index and footer.
+        """
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        try:
+            os.unlink(self._path)
+        except OSError:
+            # Without a footer the file is detected as truncated anyway
+            pass
+
+    def __enter__(self) -> 'RecordWriter':
+        return self
+
+    def __exit__(self, *exception_info: Any) -> None:
+        if exception_info[0] is not None:
+            self.abort()
+        else:
+            self.close()
+
+
+def write_records(path: Union[str, os.PathLike], values: Iterable[Any], type_: Any, *arguments: Any) -> int:
+    """
+    Writes all values to a new record file, returning the number of records written.
+    """
+    with RecordWriter(path, type_, *arguments) as writer:
+        writer.write_all(values)
+        return writer.count
+
+
+class RecordFile(Sequence):
+    """
+    A memory-mapped record file. Records are decoded only when they are indexed or iterated, and
+    any record can be reached in constant time through the index.
+
+    Files are written from validated values, so records are trusted by default. With
+    `verify=True` each record is checked against its stored checksum before being decoded.
+    """
+
+    def __init__(self,
+                 path: Union[str, os.PathLike],
+                 type_: Any,
+                 *arguments: Any,
+                 verify: bool = False):
+        self._schema = s.schema_of(type_, *arguments)
+        self._decode = binary.decoder_of(self._schema)
+        self._verify = verify
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        try:
+            self._read_layout()
+        except (ValueError, struct.error):
+            self.close()
+            raise
+
+    def _read_layout(self) -> None:
+        magic, version, fingerprint_length = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError('Not a record file')
+        if version != VERSION:
+            raise ValueError(f'Unsupported record file version: {version}')
+        offset = _HEADER.size
+        fingerprint = bytes(self._view[offset:offset + fingerprint_length]).decode('ascii')
+        if fingerprint != s.fingerprint(self._schema):
+            raise ValueError('Record file was written with a different schema')
+        offset += fingerprint_length
+        (name_length,) = _NAME_LENGTH.unpack_from(self._mmap, offset)
+        self.type_name = bytes(self._view[offset + 2:offset + 2 + name_length]).decode('utf-8')
+
+        self._index_offset, self._count, magic = _FOOTER.unpack_from(self._mmap,
+                                                                     len(self._mmap) - _FOOTER.size)
+        if magic != MAGIC:
+            raise ValueError('Record file is truncated')
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self._record(i) for i in range(self._count)[index]]
+        if index < 0:
+            index += self._count
+        if index < 0 or index >= self._count:
+            raise IndexError('record index out of range')
+
+        return self._record(index)
+
+    def _record(self, index: int) -> Any:
+        offset, length, checksum = _INDEX_ENTRY.unpack_from(
+            self._mmap, self._index_offset + index * _INDEX_ENTRY.size)
+        data = self._view[offset:offset + length]
+        try:
+            if self._verify and zlib.crc32(data) != checksum:
+                raise ValueError(f'Checksum mismatch for record {index}')
+            value, end = self._decode(data, 0)
+            if end != length:
+                raise ValueError(f'Record {index} has trailing data')
+        except binary.BinaryDecodeError as e:
+            raise ValueError(f'Invalid record {index}: {e.reason}')
+        except IndexError:
+            raise ValueError(f'Record {index} is truncated')
+        finally:
+            data.release()
+
+        return value
+
+    def records(self) -> List[Any]:
+        """
+        Decodes all records into a list.
+        """
+        return self[:]
+
+    def close(self) -> None:
+        """
+        Closes the memory map. Values decoded before closing stay usable.
+        """
+        if self._mmap.closed:
+            return
+        self._view.release()
+        self._mmap.close()
+
+    def __enter__(self) -> 'RecordFile':
+        return self
+
+    def __exit__(self, *exception_info: Any) -> None:
+        self.close()
+
+
+def read_record(path: Union[str, os.PathLike], index: int, type_: Any, *arguments: Any) -> Any:
+    """
+    Opens a record file and decodes a single record from it.
+    """
+    with RecordFile(path, type_, *arguments) as records:
+        return records[index]
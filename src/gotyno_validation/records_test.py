@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+from gotyno_validation.gotyno_output import AnotherEvent, Event, Launch, Notification, SomeType
+from gotyno_validation.notifications import Notification as UserNotification
+from gotyno_validation.records import RecordFile, RecordWriter, write_records
+
+
+class TestRecords(unittest.TestCase):
+    "A test suite for memory-mapped record files"
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'records.gtyr')
+
+    def test_random_access_slicing_and_iteration(self):
+        events = [Notification(f'n{i}') if i % 3 == 0 else
+                  AnotherEvent(SomeType('SomeType', f's{i}', i, None)) if i % 3 == 1 else Launch()
+                  for i in range(100)]
+        self.assertEqual(write_records(self.path, events, Event), 100)
+
+        with RecordFile(self.path, Event) as records:
+            self.assertEqual(len(records), 100)
+            self.assertEqual(records[42], events[42])
+            self.assertEqual(records[-1], events[-1])
+            self.assertEqual(records[10:20:3], events[10:20:3])
+            self.assertEqual(list(records), events)
+            self.assertEqual(records.type_name, 'Event')
+            with self.assertRaises(IndexError):
+                records[100]
+
+    def test_verified_reads_and_schema_mismatch(self):
+        notifications = [UserNotification(i, 'hello', False) for i in range(10)]
+        with RecordWriter(self.path, UserNotification) as writer:
+            writer.write_all(notifications)
+
+        with RecordFile(self.path, UserNotification, verify=True) as records:
+            self.assertEqual(records.records(), notifications)
+
+        with self.assertRaises(ValueError):
+            RecordFile(self.path, Event)
+
+    def test_failed_writes_leave_no_file(self):
+        notifications = [UserNotification(i, 'hello', False) for i in range(10)]
+        with self.assertRaises(RuntimeError):
+            with RecordWriter(self.path, UserNotification) as writer:
+                writer.write_all(notifications)
+                raise RuntimeError('Failed while writing')
+        self.assertFalse(os.path.exists(self.path))
+
+        writer = RecordWriter(self.path, UserNotification)
+        writer.write_all(notifications)
+        writer.abort()
+        writer.close()
+        self.assertFalse(os.path.exists(self.path))
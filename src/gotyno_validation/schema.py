@@ -0,0 +1,411 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union
+from dataclasses import dataclass, field, fields, is_dataclass
+from enum import Enum
+import hashlib
+import threading
+import typing
+
+from gotyno_validation import validation
+from gotyno_validation.validation import Unknown, Validator
+
+T = TypeVar('T')
+
+# The name of the class attribute that generated tagged union base classes use to declare their
+# tag field, e.g. `__tag_field__ = 'type'`.
+TAG_FIELD_ATTRIBUTE = '__tag_field__'
+
+
+@dataclass(frozen=True)
+class PrimitiveSchema:
+    """
+    Describes one of the basic JSON values: `str`, `int`, `float` or `bool`.
+    """
+    type: type
+
+
+@dataclass(frozen=True)
+class LiteralSchema:
+    """
+    Describes a single literal value.
+    """
+    value: Any
+
+
+@dataclass(frozen=True)
+class OptionalSchema:
+    """
+    Describes a value that is either `None` or matches `inner`.
+    """
+    inner: 'Schema'
+
+
+@dataclass(frozen=True)
+class ListSchema:
+    """
+    Describes a list where every item matches `item`.
+    """
+    item: 'Schema'
+
+
+@dataclass(frozen=True)
+class StringMapSchema:
+    """
+    Describes a string map where every value matches `value`.
+    """
+    value: 'Schema'
+
+
+@dataclass(frozen=True)
+class EnumSchema:
+    """
+    Describes a value that has to be one of the values of an enumeration.
+    """
+    enumeration: type
+
+
+@dataclass(frozen=True)
+class UnionSchema:
+    """
+    Describes an untagged union; the first matching option is used.
+    """
+    options: Tuple['Schema', ...]
+
+
+@dataclass(frozen=True)
+class ValidatorSchema:
+    """
+    An opaque schema that is only known through its validator. This is used for type arguments that
+    are passed as validators, like `validate_T` in generated generic types.
+    """
+    validator: Validator[Any]
+
+
+@dataclass(frozen=True, eq=False)
+class InterfaceSchema:
+    """
+    Describes a generated dataclass. If `tag_field` is set the class is a case of a tagged union and
+    its JSON representation carries `tag` in that field, and `ordinal` is its position among the
+    cases of the union.
+    """
+    constructor: Callable[..., Any]
+    fields: Dict[str, 'Schema'] = field(default_factory=dict)
+    tag_field: Optional[str] = None
+    tag: Optional[str] = None
+    ordinal: Optional[int] = None
+
+
+@dataclass(frozen=True, eq=False)
+class TaggedUnionSchema:
+    """
+    Describes a tagged union base class, with its cases keyed by tag.
+    """
+    base: type
+    tag_field: str
+    cases: Dict[str, InterfaceSchema] = field(default_factory=dict)
+
+
+Schema = Union[PrimitiveSchema, LiteralSchema, OptionalSchema, ListSchema, StringMapSchema,
+               EnumSchema, UnionSchema, ValidatorSchema, InterfaceSchema, TaggedUnionSchema]
+
+UNKNOWN = ValidatorSchema(validation.validate_unknown)
+
+# Schemas of classes are only put in `_schemas` once they're complete. They're built one at a time,
+# under the lock, in `_pending`, where recursive types find themselves while being filled in.
+# Schemas of classes with type arguments go in `_argument_schemas` instead, which is cleared when
+# it's full, since type arguments given as validators may be created anew for every call.
+_schemas: Dict[Tuple[Any, ...], Schema] = {}
+_argument_schemas: Dict[Tuple[Any, ...], Schema] = {}
+_ARGUMENT_SCHEMAS_LIMIT = 1024
+_pending: Dict[Tuple[Any, ...], Schema] = {}
+_schemas_lock = threading.RLock()
+# The attribute that schemas keep their validator in, see `derived`
+_VALIDATOR_ATTRIBUTE = '_validator'
+
+
+def schema_of(type_: Any, *arguments: Any) -> Schema:
+    """
+    Creates the schema for a type from the generated code, based on its type annotations. Generic
+    types take their type arguments either subscripted (`Holder[int]`) or as extra arguments, where
+    each argument is a type or a validator (`schema_of(Holder, validate_int)`).
+    """
+    if len(arguments) > 0:
+        parameters = getattr(type_, '__parameters__', ())
+        if len(parameters) != len(arguments):
+            raise ValueError(f'Expected {len(parameters)} type arguments for {type_}, '
+                             f'got {len(arguments)}')
+        substitutions = {p: _argument_schema(a) for p, a in zip(parameters, arguments)}
+
+        return _schema_of(type_, substitutions)
+
+    return _schema_of(type_, {})
+
+
+def _argument_schema(argument: Any) -> Schema:
+    if isinstance(argument, type) or typing.get_origin(argument) is not None:
+        return schema_of(argument)
+    if isinstance(argument, (PrimitiveSchema, LiteralSchema, OptionalSchema, ListSchema,
+                             StringMapSchema, EnumSchema, UnionSchema, ValidatorSchema,
+                             InterfaceSchema, TaggedUnionSchema)):
+        return argument
+
+    return ValidatorSchema(argument)
+
+
+def _schema_of(type_: Any, substitutions: Dict[Any, Schema]) -> Schema:
+    if isinstance(type_, TypeVar):
+        if type_ not in substitutions:
+            raise ValueError(f'No type argument given for {type_}')
+        return substitutions[type_]
+
+    if type_ is Any:
+        return UNKNOWN
+    if type_ in (str, int, float, bool):
+        return PrimitiveSchema(type_)
+
+    origin = typing.get_origin(type_)
+    arguments = typing.get_args(type_)
+    if origin is typing.Literal:
+        if len(arguments) == 1:
+            return LiteralSchema(arguments[0])
+        return UnionSchema(tuple(LiteralSchema(a) for a in arguments))
+    if origin is Union:
+        options = [a for a in arguments if a is not type(None)]
+        if len(options) < len(arguments):
+            if len(options) == 1:
+                return OptionalSchema(_schema_of(options[0], substitutions))
+            return OptionalSchema(UnionSchema(tuple(_schema_of(o, substitutions) for o in options)))
+        return UnionSchema(tuple(_schema_of(o, substitutions) for o in options))
+    if origin is list:
+        return ListSchema(_schema_of(arguments[0], substitutions))
+    if origin is dict:
+        if arguments[0] is not str:
+            raise ValueError(f'Only string maps are supported, got: {type_}')
+        return StringMapSchema(_schema_of(arguments[1], substitutions))
+    if origin is not None:
+        # A subscripted generated generic, like `Possibly[int]`
+        parameters = getattr(origin, '__parameters__', ())
+        inner = {p: _schema_of(a, substitutions) for p, a in zip(parameters, arguments)}
+
+        return _class_schema(origin, inner)
+
+    if isinstance(type_, type):
+        if issubclass(type_, Enum):
+            return EnumSchema(type_)
+        parameters = getattr(type_, '__parameters__', ())
+        # Generic classes referred to without arguments can only resolve through the caller
+        inner = {p: substitutions[p] for p in parameters if p in substitutions}
+
+        return _class_schema(type_, inner)
+
+    raise ValueError(f'Unsupported type for schema: {type_}')
+
+
+def _class_schema(class_: type, substitutions: Dict[Any, Schema]) -> Schema:
+    key = (class_, frozenset(substitutions.items()))
+    schema = _schemas.get(key) or _argument_schemas.get(key)
+    if schema is not None:
+        return schema
+
+    with _schemas_lock:
+        schema = _schemas.get(key) or _argument_schemas.get(key) or _pending.get(key)
+        if schema is not None:
+            return schema
+        outermost = len(_pending) == 0
+        try:
+            schema = _build_class_schema(class_, substitutions, key)
+            if outermost:
+                if len(_argument_schemas) >= _ARGUMENT_SCHEMAS_LIMIT:
+                    _argument_schemas.clear()
+                for pending_key, pending in _pending.items():
+                    (_argument_schemas if len(pending_key[1]) > 0 else _schemas)[pending_key] = pending
+        finally:
+            if outermost:
+                _pending.clear()
+
+    return schema
+
+
+def _build_class_schema(class_: type, substitutions: Dict[Any, Schema], key: Tuple[Any, ...]) -> Schema:
+    tag_field = getattr(class_, TAG_FIELD_ATTRIBUTE, None)
+    if is_dataclass(class_):
+        tag = class_.__name__ if tag_field is not None else None
+        ordinal = case_ordinal(class_) if tag_field is not None else None
+        schema = InterfaceSchema(class_, tag_field=tag_field, tag=tag, ordinal=ordinal)
+        # Registered before the fields are filled in so that recursive types resolve to themselves
+        _pending[key] = schema
+        for f in fields(class_):
+            schema.fields[f.name] = _schema_of(f.type, substitutions)
+
+        return schema
+
+    if tag_field is not None:
+        schema = TaggedUnionSchema(class_, tag_field)
+        _pending[key] = schema
+        for case in union_cases(class_):
+            case_schema = _class_schema(case, substitutions)
+            schema.cases[case.__name__] = case_schema
+
+        return schema
+
+    raise ValueError(f'Unsupported class for schema: {class_}')
+
+
+def union_cases(base: type) -> List[type]:
+    """
+    Returns the cases of a tagged union base class in the order they're defined. Generated classes
+    are slotted, and `dataclass` replaces a slotted class with a new one; the class it replaced is
+    still a subclass of the base until it's collected, so only the last class of each name is kept.
+    """
+    cases: Dict[str, type] = {}
+    for case in base.__subclasses__():
+        cases[case.__name__] = case
+
+    return list(cases.values())
+
+
+def case_ordinal(case: type) -> int:
+    """
+    Returns the position of a tagged union case among the cases of its union, as given by
+    `union_cases`. This is also the order of the cases in the schema of the union.
+    """
+    for base in case.__mro__[1:]:
+        if TAG_FIELD_ATTRIBUTE in base.__dict__:
+            return [c.__name__ for c in union_cases(base)].index(case.__name__)
+
+    raise ValueError(f'{case} is not a case of a tagged union')
+
+
+def validator_of(schema: Schema) -> Validator[Any]:
+    """
+    Creates a validator from a schema. The validator gives the same results as the generated
+    `validate` functions, since it is built out of the same functions in `validation`.
+    """
+    return derived(schema, _VALIDATOR_ATTRIBUTE, _build_validator)
+
+
+def derived(schema: Schema, attribute: str, build: Callable[[Schema], T]) -> T:
+    """
+    Gives what `build` creates from a schema, like its validator, creating it once. It's kept in an
+    attribute of the schema itself, so that it's freed along with the schema.
+
+    Nothing is locked; threads racing on one schema create equivalent values and the last one kept
+    wins.
+    """
+    value = schema.__dict__.get(attribute)
+    if value is None:
+        value = build(schema)
+        # Schemas are frozen
+        object.__setattr__(schema, attribute, value)
+
+    return value
+
+
+def _build_validator(schema: Schema) -> Validator[Any]:
+    if isinstance(schema, PrimitiveSchema):
+        return _PRIMITIVE_VALIDATORS[schema.type]
+    if isinstance(schema, LiteralSchema):
+        return validation.validate_literal(schema.value)
+    if isinstance(schema, OptionalSchema):
+        return validation.validate_optional(validator_of(schema.inner))
+    if isinstance(schema, ListSchema):
+        return validation.validate_list(validator_of(schema.item))
+    if isinstance(schema, StringMapSchema):
+        return validation.validate_string_map_of(validator_of(schema.value))
+    if isinstance(schema, EnumSchema):
+        enumeration = schema.enumeration
+
+        def validate_enumeration(value: Unknown) -> validation.ValidationResult[Any]:
+            return validation.validate_enumeration_member(value, enumeration)
+        return validate_enumeration
+    if isinstance(schema, UnionSchema):
+        return validation.validate_union([validator_of(o) for o in schema.options])
+    if isinstance(schema, ValidatorSchema):
+        return schema.validator
+    if isinstance(schema, InterfaceSchema):
+        return _interface_validator(schema)
+    if isinstance(schema, TaggedUnionSchema):
+        return _tagged_union_validator(schema)
+
+    raise ValueError(f'Unsupported schema: {schema}')
+
+
+def _interface_validator(schema: InterfaceSchema) -> Validator[Any]:
+    # The specification is built on first use, since recursive types refer back to this validator
+    # and it's replaced in one assignment, so that other threads never see it half filled in
+    specification: Dict[str, Validator[Any]] = {}
+
+    def validate_interface_schema(value: Unknown) -> validation.ValidationResult[Any]:
+        nonlocal specification
+        if len(specification) != len(schema.fields):
+            specification = {k: validator_of(s) for k, s in schema.fields.items()}
+        if schema.tag_field is None:
+            return validation.validate_interface(value, specification, schema.constructor)
+
+        return validation.validate_with_type_tag(value, schema.tag_field, schema.tag,
+                                                 specification, schema.constructor)
+
+    return validate_interface_schema
+
+
+def _tagged_union_validator(schema: TaggedUnionSchema) -> Validator[Any]:
+    tagged_validators: Dict[str, Validator[Any]] = {}
+
+    def validate_tagged_union_schema(value: Unknown) -> validation.ValidationResult[Any]:
+        nonlocal tagged_validators
+        if len(tagged_validators) != len(schema.cases):
+            tagged_validators = {t: validator_of(s) for t, s in schema.cases.items()}
+
+        return validation.validate_with_type_tags(value, schema.tag_field, tagged_validators)
+
+    return validate_tagged_union_schema
+
+
+_PRIMITIVE_VALIDATORS: Dict[type, Validator[Any]] = {
+    str: validation.validate_string,
+    int: validation.validate_int,
+    float: validation.validate_float,
+    bool: validation.validate_bool,
+}
+
+
+def fingerprint(schema: Schema) -> str:
+    """
+    Returns a stable hash of the structure of a schema: field names and order, case tags and
+    ordinals, enumeration values and literals. Schemas that would read each other's binary data
+    differently have different fingerprints.
+    """
+    return hashlib.sha256(_describe(schema, {}).encode('utf-8')).hexdigest()
+
+
+def _describe(schema: Schema, seen: Dict[int, int]) -> str:
+    if isinstance(schema, PrimitiveSchema):
+        return schema.type.__name__
+    if isinstance(schema, LiteralSchema):
+        return f'literal({schema.value!r})'
+    if isinstance(schema, OptionalSchema):
+        return f'optional({_describe(schema.inner, seen)})'
+    if isinstance(schema, ListSchema):
+        return f'list({_describe(schema.item, seen)})'
+    if isinstance(schema, StringMapSchema):
+        return f'map({_describe(schema.value, seen)})'
+    if isinstance(schema, EnumSchema):
+        values = ','.join(repr(m.value) for m in schema.enumeration)
+        return f'enum {schema.enumeration.__name__}({values})'
+    if isinstance(schema, UnionSchema):
+        return f'union({",".join(_describe(o, seen) for o in schema.options)})'
+    if isinstance(schema, ValidatorSchema):
+        return f'validator {getattr(schema.validator, "__qualname__", "?")}'
+
+    # Recursive types refer back to the first description of themselves
+    if id(schema) in seen:
+        return f'ref {seen[id(schema)]}'
+    seen[id(schema)] = len(seen)
+    if isinstance(schema, InterfaceSchema):
+        fields = ','.join(f'{k}:{_describe(v, seen)}' for k, v in schema.fields.items())
+        return (f'interface {schema.constructor.__name__} {schema.tag_field}={schema.tag}#{schema.ordinal}'
+                f'({fields})')
+    if isinstance(schema, TaggedUnionSchema):
+        cases = ','.join(_describe(c, seen) for c in schema.cases.values())
+        return f'union {schema.base.__name__} {schema.tag_field}({cases})'
+
+    raise ValueError(f'Unsupported schema: {schema}')
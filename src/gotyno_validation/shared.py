@@ -0,0 +1,211 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from collections.abc import Sequence
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+import json
+import os
+import struct
+import sys
+
+from gotyno_validation import binary
+from gotyno_validation import schema as s
+from gotyno_validation.validation import Invalid, Unknown
+
+# Shared memory layout: record count, then one (offset, length) index entry per record, then the
+# binary encoded records back to back. Offsets are relative to the start of the block.
+_COUNT = struct.Struct('<Q')
+_INDEX_ENTRY = struct.Struct('<QI')
+
+# Blocks belong to whoever unlinks them, not to the processes that create or open them. Before
+# Python 3.13 there's no `track=False`, and every process that creates or opens a block registers it
+# with its resource tracker, which unlinks it when the process exits; the registration is undone
+# right away instead. Resource trackers only handle shared memory on POSIX.
+_TRACK_ARGUMENT = sys.version_info >= (3, 13)
+_UNREGISTER = not _TRACK_ARGUMENT and os.name == 'posix'
+
+
+@dataclass(frozen=True)
+class SharedBatch:
+    """
+    A handle to a batch of validated values in shared memory. Handles are small and cheap to pickle,
+    so they can be returned from worker processes in place of the values themselves.
+    """
+    name: str
+    count: int
+    fingerprint: str
+
+
+def share_batch(values: Iterable[Any], type_: Any, *arguments: Any) -> SharedBatch:
+    """
+    Writes validated values of `type_` into a new shared memory block in the binary encoding. The
+    block stays alive after this process closes it, until the receiver unlinks it.
+
+    Values are encoded twice: once to size the block and once to fill it, one record at a time, so
+    that the batch is never held in this process' memory next to the block.
+
+    :param values: The values to share.
+    :param type_: The generated type of the values.
+    :param arguments: Type arguments for generic types, as types or validators.
+    :raises ValueError: If a value changes while it's being shared.
+    :return: A handle to the shared batch.
+    """
+    schema = s.schema_of(type_, *arguments)
+    encode = binary.encoder_of(schema)
+    values = list(values)
+    record = bytearray()
+    lengths: List[int] = []
+    for value in values:
+        encode(value, record)
+        lengths.append(len(record))
+        del record[:]
+
+    header_size = _COUNT.size + len(lengths) * _INDEX_ENTRY.size
+    block = _open_untracked(size=max(1, header_size + sum(lengths)))
+    try:
+        buffer = block.buf
+        _COUNT.pack_into(buffer, 0, len(lengths))
+        offset = header_size
+        for i, (value, length) in enumerate(zip(values, lengths)):
+            encode(value, record)
+            if len(record) != length:
+                raise ValueError(f'Value changed while being shared: {value}')
+            _INDEX_ENTRY.pack_into(buffer, _COUNT.size + i * _INDEX_ENTRY.size, offset, length)
+            buffer[offset:offset + length] = record
+            offset += length
+            del record[:]
+    except BaseException:
+        block.close()
+        _unlink(block)
+        raise
+
+    block.close()
+
+    return SharedBatch(block.name, len(lengths), s.fingerprint(schema))
+
+
+def _open_untracked(name: Optional[str] = None, size: int = 0) -> shared_memory.SharedMemory:
+    """
+    Creates a block, or opens an existing one by name, without a resource tracker that would unlink it
+    when this process exits.
+    """
+    if _TRACK_ARGUMENT:
+        return shared_memory.SharedMemory(name, create=name is None, size=size, track=False)
+
+    block = shared_memory.SharedMemory(name, create=name is None, size=size)
+    if _UNREGISTER:
+        resource_tracker.unregister(_tracker_name(block), 'shared_memory')
+
+    return block
+
+
+def _unlink(block: shared_memory.SharedMemory) -> None:
+    if _UNREGISTER:
+        # `unlink` unregisters the block from the resource tracker, which expects it to be registered
+        resource_tracker.register(_tracker_name(block), 'shared_memory')
+    block.unlink()
+
+
+def _tracker_name(block: shared_memory.SharedMemory) -> str:
+    # Resource trackers know POSIX blocks by their name with a leading slash
+    return '/' + block.name
+
+
+def validate_batch_to_shared(values: Iterable[Unknown],
+                             type_: Any,
+                             *arguments: Any) -> Tuple[SharedBatch, Dict[str, Any]]:
+    """
+    Validates raw values, or JSON strings, as `type_` and shares the valid ones. This is meant to
+    run in worker processes. Invalid values are returned as reasons keyed by their position, like
+    `validate_list` does.
+    """
+    validator = s.validator_of(s.schema_of(type_, *arguments))
+    valid = []
+    errors = dict()
+    for i, value in enumerate(values):
+        if isinstance(value, (str, bytes)):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                errors[str(i)] = 'Invalid JSON'
+                continue
+        result = validator(value)
+        if isinstance(result, Invalid):
+            errors[str(i)] = result.reason
+        else:
+            valid.append(result.value)
+
+    return share_batch(valid, type_, *arguments), errors
+
+
+class SharedBatchView(Sequence):
+    """
+    A view of a shared batch. Values are decoded from shared memory when they are indexed or
+    iterated. `release()` closes the view and frees the shared memory.
+    """
+
+    def __init__(self, batch: SharedBatch, type_: Any, *arguments: Any):
+        schema = s.schema_of(type_, *arguments)
+        if s.fingerprint(schema) != batch.fingerprint:
+            raise ValueError('Shared batch was written with a different schema')
+        self._decode = binary.decoder_of(schema)
+        self._block = _open_untracked(batch.name)
+        self._count = batch.count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self._value(i) for i in range(self._count)[index]]
+        if index < 0:
+            index += self._count
+        if index < 0 or index >= self._count:
+            raise IndexError('batch index out of range')
+
+        return self._value(index)
+
+    def _value(self, index: int) -> Any:
+        buffer = self._block.buf
+        offset, length = _INDEX_ENTRY.unpack_from(buffer, _COUNT.size + index * _INDEX_ENTRY.size)
+        data = buffer[offset:offset + length]
+        try:
+            value, _ = self._decode(data, 0)
+        finally:
+            data.release()
+
+        return value
+
+    def close(self) -> None:
+        """
+        Closes the view without freeing the shared memory, which stays available to other processes
+        after this one exits.
+        """
+        self._block.close()
+
+    def release(self) -> None:
+        """
+        Closes the view and frees the shared memory.
+        """
+        self._block.close()
+        _unlink(self._block)
+
+    def __enter__(self) -> 'SharedBatchView':
+        return self
+
+    def __exit__(self, *exception_info: Any) -> None:
+        self.release()
+
+
+def open_batch(batch: SharedBatch, type_: Any, *arguments: Any) -> SharedBatchView:
+    """
+    Opens a shared batch for reading in place. Use as a context manager to free it afterwards.
+    """
+    return SharedBatchView(batch, type_, *arguments)
+
+
+def load_batch(batch: SharedBatch, type_: Any, *arguments: Any) -> List[Any]:
+    """
+    Decodes all values of a shared batch into a list and frees the shared memory.
+    """
+    with SharedBatchView(batch, type_, *arguments) as view:
+        return view[:]
@@ -0,0 +1,72 @@
+import json
+import os
+import pickle
+import subprocess
+import sys
+import tracemalloc
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from gotyno_validation.notifications import Notification
+from gotyno_validation.shared import load_batch, open_batch, share_batch, validate_batch_to_shared
+
+SOURCE_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_python(code):
+    environment = dict(os.environ, PYTHONPATH=SOURCE_DIRECTORY)
+    return subprocess.run([sys.executable, '-c', code], env=environment, capture_output=True, check=True).stdout
+
+
+class TestShared(unittest.TestCase):
+    "A test suite for the shared memory transport"
+
+    def test_share_and_view_in_place(self):
+        notifications = [Notification(i, f'message {i}', i % 2 == 0) for i in range(50)]
+        batch = share_batch(notifications, Notification)
+        self.assertEqual(batch.count, 50)
+        with open_batch(batch, Notification) as view:
+            self.assertEqual(view[7], notifications[7])
+            self.assertEqual(view[-1], notifications[-1])
+            self.assertEqual(list(view), notifications)
+
+    def test_batches_from_worker_processes(self):
+        raw = [json.dumps({'id': i, 'message': 'hello', 'seen': False}) for i in range(20)]
+        raw[3] = '{"id": "three"}'
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            results = list(executor.map(validate_batch_to_shared, [raw[:10], raw[10:]],
+                                        [Notification, Notification]))
+
+        (first, first_errors), (second, second_errors) = results
+        self.assertEqual(list(first_errors.keys()), ['3'])
+        self.assertEqual(second_errors, {})
+        values = load_batch(first, Notification) + load_batch(second, Notification)
+        self.assertEqual(len(values), 19)
+        self.assertEqual(values[-1], Notification(19, 'hello', False))
+
+    def test_blocks_outlive_the_processes_that_create_and_open_them(self):
+        created = run_python('import pickle, sys\n'
+                             'from gotyno_validation.notifications import Notification\n'
+                             'from gotyno_validation.shared import share_batch\n'
+                             'sys.stdout.buffer.write(pickle.dumps(share_batch([Notification(1, "a", True)], '
+                             'Notification)))\n')
+        batch = pickle.loads(created)
+        run_python('import pickle\n'
+                   'from gotyno_validation.notifications import Notification\n'
+                   'from gotyno_validation.shared import open_batch\n'
+                   f'view = open_batch(pickle.loads({pickle.dumps(batch)!r}), Notification)\n'
+                   'assert view[0] == Notification(1, "a", True)\n'
+                   'view.close()\n')
+        self.assertEqual(load_batch(batch, Notification), [Notification(1, 'a', True)])
+        self.assertRaises(FileNotFoundError, load_batch, batch, Notification)
+
+    def test_batches_are_not_held_in_memory_while_shared(self):
+        notifications = [Notification(i, 'x' * 1000, False) for i in range(1000)]
+        tracemalloc.start()
+        try:
+            tracemalloc.reset_peak()
+            batch = share_batch(notifications, Notification)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak, 1000 * 1000 / 4)
+        self.assertEqual(load_batch(batch, Notification), notifications)
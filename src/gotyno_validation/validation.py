@@ -1,6 +1,18 @@
-from typing import Callable, Dict, List, Optional, Union, TypeVar, Generic
-from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union, TypeVar, Generic
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, fields, is_dataclass
+import functools
+import importlib
 import json
+import math
+import mmap
+import random
+import sys
+import threading
+import types
+import weakref
 from enum import Enum
 
 
@@ -32,21 +44,654 @@ Validator = Callable[[Unknown], ValidationResult[T]]
 InterfaceSpecification = StringMap[Validator[T]]
 TaggedValidators = Dict[str, Validator[T]]
 
+# Set while validating values that come straight out of `json.loads`. Such values only contain
+# dicts with `str` keys, lists, `str`, numbers, booleans and `None`, so validators can skip the
+# checks that only matter for arbitrary Python objects, like validating and copying dict keys.
+_parsed_json: ContextVar[bool] = ContextVar('parsed_json', default=False)
 
-def validate_from_string(value: Union[str, bytes], validator: Validator[T]) -> ValidationResult[T]:
+
+@contextmanager
+def parsed_json_source() -> Iterator[None]:
+    """
+    Marks validation inside the `with` block as validating parsed JSON, which lets validators skip
+    checks that `json.loads` already guarantees. Only use this for values from `json.loads` (or an
+    equivalent parser); raw Python objects need the full checks.
+    """
+    token = _parsed_json.set(True)
+    try:
+        yield
+    finally:
+        _parsed_json.reset(token)
+
+
+# Set while union validators try their members. Only the union's own reason is shown when it fails,
+# so members that fail give `_PROBE_FAILED` instead of rendering a reason, and containers stop at
+# their first invalid item. Validators outside of this module render their reasons as usual.
+_probing: ContextVar[bool] = ContextVar('probing', default=False)
+_PROBE_FAILED = Invalid('Does not match')
+
+
+# Set to deep-check instances of generated classes given to their own validators, instead of
+# accepting them as they are.
+_strict_instances: ContextVar[bool] = ContextVar('strict_instances', default=False)
+
+
+@contextmanager
+def strict_instances() -> Iterator[None]:
+    """
+    Makes validators inside the `with` block check the fields of instances of their own generated
+    class, instead of accepting them as they are. Valid instances are still returned as they are.
+    """
+    token = _strict_instances.set(True)
+    try:
+        yield
+    finally:
+        _strict_instances.reset(token)
+
+
+def _validate_instance(value: T, interface: InterfaceSpecification) -> ValidationResult[T]:
+    """
+    Validates an instance of the generated class an interface belongs to. Instances were validated
+    when they were constructed from outside data, so they pass as they are unless
+    `strict_instances` is active. Fields of generic types are trusted to hold the type argument
+    they were created with.
+    """
+    if not _strict_instances.get():
+        return Valid(value)
+
+    result = validate_interface({f.name: getattr(value, f.name) for f in fields(value)}, interface)
+    if isinstance(result, Invalid):
+        return result
+
+    return Valid(value)
+
+
+DEFAULT_INTERN_SIZE = 64 * 1024
+
+# Stands in for an interned instance in the keys of an intern table
+_INTERNED = object()
+
+
+class _NotInternable(Exception):
+    pass
+
+
+class InternTable:
+    """
+    Canonical instances of generated types, for `interning`. Instances are keyed by their class and
+    field values, with interned instances in fields standing in by identity. Keys are thus built
+    from the parts already validated and never hash whole subtrees. Instances holding lists or
+    dicts are not interned, as those can still be changed in place.
+
+    At most `max_size` instances are kept; the least recently used ones are dropped first. A table
+    can be shared between threads, as with `concurrency.validate_batch`.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_INTERN_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._instances: 'OrderedDict[Tuple[Any, ...], Any]' = OrderedDict()
+        self._keys: Dict[int, Tuple[Any, ...]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._instances)
+
+    def construct(self, constructor: Callable[..., T], fields: Dict[str, Unknown]) -> T:
+        """
+        Gives the canonical instance for the fields, constructing and keeping it if there's none.
+        """
+        with self._lock:
+            try:
+                key = (constructor,) + tuple([self._part(v) for v in fields.values()])
+            except _NotInternable:
+                key = None
+            else:
+                instance = self._instances.get(key)
+                if instance is not None:
+                    self._instances.move_to_end(key)
+                    self.hits += 1
+                    return instance
+
+        # Constructed outside of the lock; another thread may have kept an equal instance meanwhile
+        instance = _instantiate(constructor, fields)
+        if key is None:
+            return instance
+
+        with self._lock:
+            kept = self._instances.get(key)
+            if kept is not None:
+                self.hits += 1
+                return kept
+            self.misses += 1
+            self._instances[key] = instance
+            self._keys[id(instance)] = key
+            if len(self._instances) > self.max_size:
+                # Instances in fields of kept instances stay alive, so their identities in keys are
+                # never reused while those keys exist
+                _, dropped = self._instances.popitem(last=False)
+                del self._keys[id(dropped)]
+
+        return instance
+
+    def _part(self, value: Unknown) -> Any:
+        type_ = type(value)
+        if type_ is str or value is None:
+            return value
+        if type_ is int or type_ is bool:
+            # Keeps `1`, `1.0` and `True` apart, which compare equal
+            return (type_, value)
+        if type_ is float:
+            return (type_, value.hex())
+        if isinstance(value, Enum):
+            return value
+        if id(value) in self._keys:
+            return (_INTERNED, id(value))
+
+        raise _NotInternable()
+
+
+_intern_table: ContextVar[Optional[InternTable]] = ContextVar('intern_table', default=None)
+
+
+@contextmanager
+def interning(max_size: int = DEFAULT_INTERN_SIZE) -> Iterator[InternTable]:
+    """
+    Interns the instances of generated types created by validation inside the `with` block, so
+    that structurally equal instances are one shared instance. This pays off for batches that
+    repeat the same nested values, which then take memory only once.
+
+    :param max_size: The most instances to keep in the table.
+    :return: The intern table, for its statistics.
+    """
+    table = InternTable(max_size)
+    token = _intern_table.set(table)
+    try:
+        yield table
+    finally:
+        _intern_table.reset(token)
+
+
+def construct(constructor: Callable[..., T], fields: Dict[str, Unknown]) -> T:
+    """
+    Constructs a validated instance, going through the intern table if `interning` is active.
+    """
+    table = _intern_table.get()
+    if table is None:
+        return _instantiate(constructor, fields)
+
+    return table.construct(constructor, fields)
+
+
+# The attribute that classes keep their trusted constructor in, see `_trusted_constructor`
+_TRUSTED_CONSTRUCTOR = '_trusted_construct'
+
+
+def _instantiate(constructor: Callable[..., T], fields: Dict[str, Unknown]) -> T:
+    if not isinstance(constructor, type):
+        return constructor(**fields)
+    # Looked up in the class itself, as subclasses need constructors of their own
+    trusted = constructor.__dict__.get(_TRUSTED_CONSTRUCTOR)
+    if trusted is None:
+        trusted = _trusted_constructor(constructor)
+        try:
+            setattr(constructor, _TRUSTED_CONSTRUCTOR, trusted)
+        except (AttributeError, TypeError):
+            pass
+
+    return trusted(fields)
+
+
+def _trusted_constructor(class_: type) -> Callable[[Dict[str, Unknown]], Any]:
+    """
+    Creates a function that constructs instances of a dataclass from validated fields without
+    calling its `__init__`, which takes the fields as keyword arguments and, for frozen classes,
+    sets each one through `object.__setattr__`. The fields are put straight into the slots or the
+    `__dict__` of a new instance instead. Fields that don't match the class exactly go through the
+    class, to get the usual errors and defaults.
+
+    Only dataclasses whose `__init__` is the generated one and that have no `__post_init__` or
+    other construction logic are constructed this way; other classes are simply called.
+    """
+    def construct_by_keywords(values: Dict[str, Unknown]) -> Any:
+        return class_(**values)
+
+    init = class_.__dict__.get('__init__')
+    # Dataclasses compile their `__init__` from a string
+    if (not is_dataclass(class_) or init is None or getattr(init, '__code__', None) is None
+            or init.__code__.co_filename != '<string>' or hasattr(class_, '__post_init__')
+            or class_.__new__ is not object.__new__):
+        return construct_by_keywords
+    class_fields = fields(class_)
+    if len(class_fields) != len(class_.__dataclass_fields__) or not all(f.init for f in class_fields):
+        # Init-only variables or fields that aren't arguments of `__init__`
+        return construct_by_keywords
+
+    namespace: Dict[str, Any] = {'new': object.__new__, 'class_': class_}
+    lines = []
+    for i, f in enumerate(class_fields):
+        slot = None
+        for base in class_.__mro__:
+            if f.name in base.__dict__:
+                slot = base.__dict__[f.name]
+                break
+        if isinstance(slot, types.MemberDescriptorType):
+            namespace[f'set_{i}'] = slot.__set__
+            lines.append(f'            set_{i}(instance, values[{f.name!r}])')
+        elif class_.__dictoffset__ != 0:
+            lines.append(f'            instance.__dict__[{f.name!r}] = values[{f.name!r}]')
+        else:
+            return construct_by_keywords
+
+    source = '\n'.join([
+        'def construct(values):',
+        f'    if len(values) == {len(class_fields)}:',
+        '        try:',
+        '            instance = new(class_)',
+        *lines,
+        '            return instance',
+        '        except KeyError:',
+        '            pass',
+        '    return class_(**values)',
+    ])
+    exec(compile(source, '<string>', 'exec'), namespace)
+
+    return namespace['construct']
+
+
+@dataclass
+class SamplingReport:
+    """
+    What a `sampling` block validated. `checked` items were validated fully and `skipped` ones only
+    had their shape checked. `errors` counts the invalid items found by sampling; after the first
+    one the block is `escalated` and validates everything fully.
+    """
+    checked: int = 0
+    skipped: int = 0
+    errors: int = 0
+    escalated: bool = False
+
+    @property
+    def error_rate(self) -> float:
+        """
+        The share of fully validated items that were invalid.
+        """
+        return self.errors / self.checked if self.checked > 0 else 0.0
+
+
+class _Sampler:
+    def __init__(self, fraction: float, count: int, seed: Optional[int]):
+        self.fraction = fraction
+        self.count = count
+        self.random = random.Random(seed)
+        self.report = SamplingReport()
+        self._lock = threading.Lock()
+
+    def samples(self, length: int) -> Set[int]:
+        wanted = max(self.count, math.ceil(self.fraction * length))
+        middle = range(1, length - 1)
+        with self._lock:
+            indices = set(self.random.sample(middle, min(len(middle), max(0, wanted - 2))))
+        indices.add(0)
+        indices.add(length - 1)
+
+        return indices
+
+    def validate_items(self,
+                       items: Iterable[Unknown],
+                       length: int,
+                       validator: Validator[T]) -> Optional[Iterable[T]]:
+        """
+        Validates sampled items fully and only checks the shapes of the rest, giving the valid
+        values; basic values are given back as they are, so for them that's `items` itself. Gives
+        `None` on the first problem, after escalating, so that the caller validates everything.
+        """
+        shape_types = getattr(validator, 'shape_types', None)
+        samples = self.samples(length)
+        # Counted locally and added to the report once, as containers may be validated in threads
+        checked = skipped = errors = 0
+        values: Optional[Iterable[Any]] = items
+        if shape_types is not None:
+            for i, item in enumerate(items):
+                if i in samples:
+                    checked += 1
+                    if isinstance(validator(item), Invalid):
+                        errors += 1
+                        values = None
+                        break
+                elif type(item) in shape_types:
+                    skipped += 1
+                else:
+                    values = None
+                    break
+        else:
+            shape = _interface_shape(validator)
+            constructed: List[Any] = []
+            values = constructed
+            for i, item in enumerate(items):
+                if i in samples:
+                    checked += 1
+                    result = validator(item)
+                    if isinstance(result, Invalid):
+                        errors += 1
+                        values = None
+                        break
+                    value = result.value
+                else:
+                    value = shape(item)
+                    if value is _NOT_SHAPED:
+                        values = None
+                        break
+                    skipped += 1
+                constructed.append(value)
+
+        with self._lock:
+            report = self.report
+            report.checked += checked
+            report.skipped += skipped
+            report.errors += errors
+            if values is None:
+                report.escalated = True
+
+        return values
+
+
+_sampler: ContextVar[Optional[_Sampler]] = ContextVar('sampler', default=None)
+
+
+def _active_sampler(validator: Validator[Unknown], length: int) -> Optional[_Sampler]:
+    """
+    The sampler to use for a container, if sampling applies to it. Sampling only applies to items
+    whose shape alone can be checked: values that their validator gives back as they are, like
+    strings and numbers, and generated interfaces whose fields are such values.
+    """
+    sampler = _sampler.get()
+    if sampler is None or sampler.report.escalated or length <= 2:
+        return None
+    if getattr(validator, 'shape_types', None) is None and _interface_shape(validator) is None:
+        return None
+
+    return sampler
+
+
+# The attribute that the `validate` functions of generated interfaces keep their shape check in,
+# or `False` if sampling doesn't apply to them
+_SAMPLING_SHAPE = '_sampling_shape'
+# Given by shape checks for values that don't have the shape
+_NOT_SHAPED = object()
+
+
+def _interface_shape(validator: Validator[T]) -> Optional[Callable[[Unknown], Any]]:
+    """
+    The shape check of a generated interface, if `validator` is its `validate` and sampling applies
+    to it. The check takes a dict with the tag of the interface, if any, and its fields, each of a
+    type that its validator gives back as it is, and constructs the instance; anything else gives
+    `_NOT_SHAPED`.
+    """
+    shape = getattr(validator, _SAMPLING_SHAPE, None)
+    if shape is None:
+        shape = _build_interface_shape(validator) or False
+        try:
+            setattr(validator, _SAMPLING_SHAPE, shape)
+        except (AttributeError, TypeError):
+            pass
+
+    return shape or None
+
+
+def _build_interface_shape(validator: Validator[T]) -> Optional[Callable[[Unknown], Any]]:
+    class_ = _generated_class_of(validator)
+    # Validators of generic types were created for type arguments that aren't known here
+    if class_ is None or getattr(class_, 'validate', None) is not validator:
+        return None
+    s = importlib.import_module('gotyno_validation.schema')
+    interface = s.schema_of(class_)
+    if not isinstance(interface, s.InterfaceSchema):
+        return None
+    # The name, and the types given back as they are or the literal value, of each field
+    checks: List[Tuple[str, Optional[Tuple[type, ...]], Any]] = []
+    for name, field_schema in interface.fields.items():
+        if isinstance(field_schema, s.LiteralSchema):
+            checks.append((name, None, field_schema.value))
+            continue
+        shape_types = getattr(s.validator_of(field_schema), 'shape_types', None)
+        if shape_types is None:
+            return None
+        checks.append((name, shape_types, None))
+
+    constructor = interface.constructor
+    tag_field = interface.tag_field
+    tag = interface.tag
+
+    def shape(value: Unknown) -> Any:
+        if type(value) is not dict or (tag_field is not None and value.get(tag_field) != tag):
+            return _NOT_SHAPED
+        fields = {}
+        for name, types, literal in checks:
+            field = value.get(name)
+            if types is None:
+                if field != literal:
+                    return _NOT_SHAPED
+                field = literal
+            elif type(field) not in types:
+                return _NOT_SHAPED
+            fields[name] = field
+
+        return construct(constructor, fields)
+
+    return shape
+
+
+@contextmanager
+def sampling(fraction: float = 0.01,
+             count: int = 0,
+             seed: Optional[int] = None) -> Iterator[SamplingReport]:
+    """
+    Validates lists and string maps of basic values or of generated interfaces with basic fields
+    inside the `with` block by sampling: the first and last items and random ones, at least `count`
+    or `fraction` of the items, are validated fully and the rest only have their shape checked. For
+    basic values that's their type, for interfaces it's being a dict with the tag of the interface
+    and fields of the right types. Only use this for data from trusted producers.
+
+    On the first invalid or misshapen item the whole block escalates to full validation: the
+    container it was found in is validated again fully, so invalid values get the same errors as
+    without sampling, and so is every container after it, in this thread or any other, until the
+    block ends.
+
+    :return: A report of what was validated, including the observed error rate.
+    """
+    sampler = _Sampler(fraction, count, seed)
+    token = _sampler.set(sampler)
+    try:
+        yield sampler.report
+    finally:
+        _sampler.reset(token)
+
+
+# The attribute that the last argument of a specialization keeps it alive in, see `specialized`
+_SPECIALIZATIONS = '_specializations'
+
+
+class _Specializing:
+    """
+    Marks a specialization that is being created, for generic types that refer to themselves.
+    """
+    __slots__ = ('thread', 'validator')
+
+    def __init__(self) -> None:
+        self.thread = threading.get_ident()
+        self.validator: Optional[Validator[Unknown]] = None
+
+
+def specialized(factory: Callable[..., Validator[T]]) -> Callable[..., Validator[T]]:
+    """
+    Memoizes a function that creates a validator out of other validators, like `validate_list` or
+    the `validate` function of a generated generic type. Calling it again with the same argument
+    validators (by identity) gives back the same validator instead of a new one.
+
+    Specializations are referenced weakly, together with all of their arguments, and are forgotten
+    as soon as either is freed. They are kept alive by their last argument, which keeps them in its
+    `__dict__` under `_SPECIALIZATIONS`, so they are reused across calls for as long as it lives.
+    Only the last argument does this, so that a long-lived first argument like the `validate_string`
+    of `validate_string_map_of` doesn't keep alive the other arguments it was combined with; the
+    shortest lived argument should come last. Keeping them in a weak dictionary of this module
+    instead would never free them, since specializations refer to their arguments.
+
+    If an argument or the validator can't be referenced weakly, no memoization happens. A thread
+    that finds a specialization being created by another thread creates its own rather than
+    waiting for it.
+    """
+    specializations: Dict[Tuple[int, ...], Tuple[Tuple[weakref.ref, ...], Any]] = {}
+
+    @functools.wraps(factory)
+    def specialize(*arguments: Validator[Unknown]) -> Validator[T]:
+        if len(arguments) == 0:
+            return factory()
+
+        key = tuple(id(a) for a in arguments)
+        entry = specializations.get(key)
+        if entry is not None and all(r() is a for r, a in zip(entry[0], arguments)):
+            if not isinstance(entry[1], _Specializing):
+                validator = entry[1]()
+                if validator is not None:
+                    return validator
+            elif entry[1].thread == threading.get_ident():
+                # A recursive reference while creating; resolve it once the validator exists
+                specializing = entry[1]
+                return lambda value: specializing.validator(value)
+            else:
+                return factory(*arguments)
+
+        def forget(_: Optional[weakref.ref] = None) -> None:
+            current = specializations.get(key)
+            if current is not None and current[0] is references:
+                del specializations[key]
+                last = references[-1]()
+                if last is not None:
+                    getattr(last, '__dict__', {}).get(_SPECIALIZATIONS, {}).pop((specialize, key), None)
+
+        try:
+            references = tuple(weakref.ref(a, forget) for a in arguments)
+        except TypeError:
+            return factory(*arguments)
+        placeholder = _Specializing()
+        specializations[key] = (references, placeholder)
+        try:
+            validator = factory(*arguments)
+        except BaseException:
+            forget()
+            raise
+        placeholder.validator = validator
+        try:
+            specializations[key] = (references, weakref.ref(validator, forget))
+        except TypeError:
+            forget()
+            return validator
+        try:
+            vars(arguments[-1]).setdefault(_SPECIALIZATIONS, {})[(specialize, key)] = validator
+        except TypeError:
+            pass
+
+        return validator
+
+    return specialize
+
+
+class _DeferredModule(types.ModuleType):
+    """
+    Stands in for a module that is imported when one of its attributes is first used.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        module = sys.modules.get(self.__name__)
+        if module is None:
+            module = importlib.import_module(self.__name__)
+
+        return getattr(module, name)
+
+
+def import_on_first_use(module_name: str) -> types.ModuleType:
+    """
+    Gives a module that is only imported once one of its attributes is used. Generated modules
+    import the modules that only some of their functions need, like `binary` and `views`, this way,
+    so that importing them doesn't import those modules and the `schema` they build on too.
+
+    :param module_name: The name of the module.
+    :return: The module if it is imported already, otherwise a stand-in for it.
+    """
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+
+    return _DeferredModule(module_name)
+
+
+# Anything with the buffer protocol that holds bytes, like these, can be decoded from
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+JSONText = Union[str, Buffer]
+
+
+def json_text(value: JSONText, offset: int = 0, length: Optional[int] = None) -> str:
+    """
+    Gives the JSON text in `value[offset:offset + length]`, or from `offset` to the end. Buffers are
+    decoded straight from their memory, without copying the range into `bytes` first; their
+    encoding is detected like `json.loads` does.
+
+    :raises ValueError: If the range is not within the value, or a `UnicodeDecodeError` if the
+                        bytes can't be decoded.
+    """
+    if isinstance(value, str):
+        if offset == 0 and length is None:
+            return value
+        _check_range(offset, length, len(value))
+        return value[offset:len(value) if length is None else offset + length]
+
+    with memoryview(value) as view, view.cast('B') as data:
+        end = _check_range(offset, length, len(data))
+        with data[offset:end] as text:
+            encoding = json.detect_encoding(bytes(text[:4]))
+            return str(text, encoding, 'surrogatepass')
+
+
+def _check_range(offset: int, length: Optional[int], size: int) -> int:
+    end = size if length is None else offset + length
+    if offset < 0 or end < offset or end > size:
+        raise ValueError(f'Range of {length} from {offset} is outside of the {size} available')
+
+    return end
+
+
+def validate_from_string(value: JSONText,
+                         validator: Validator[T],
+                         parsed_json: bool = True,
+                         offset: int = 0,
+                         length: Optional[int] = None) -> ValidationResult[T]:
     """
     Validates a string with a validator by way of `loads`.
 
-    :param value: The string to validate.
+    :param value: The string to validate, or a buffer holding it, see `json_text`.
     :param validator: The validator to use.
+    :param parsed_json: Whether to validate in parsed JSON mode, see `parsed_json_source`.
+    :param offset: Where in `value` the JSON starts.
+    :param length: The length of the JSON, which otherwise runs to the end of `value`.
     :return: The validation result.
     """
+    if not isinstance(value, str) or offset != 0 or length is not None:
+        try:
+            value = json_text(value, offset, length)
+        except UnicodeDecodeError:
+            return Invalid('Invalid JSON')
     try:
         value = json.loads(value)
     except ValueError:
         return Invalid('Invalid JSON')
 
-    validation_result = validator(value)
+    if parsed_json:
+        with parsed_json_source():
+            validation_result = validator(value)
+    else:
+        validation_result = validator(value)
     if isinstance(validation_result, Invalid):
         return validation_result
 
@@ -67,6 +712,8 @@ def validate_string(value: Unknown) -> ValidationResult[str]:
             return Valid(value)
         except UnicodeDecodeError:
             return Invalid('Bytes invalid as utf-8 string')
+    if _probing.get():
+        return _PROBE_FAILED
 
     return Invalid(f'Value is not string: {value} ({type(value)})')
 
@@ -77,6 +724,8 @@ def validate_int(value: Unknown) -> ValidationResult[int]:
     """
     if isinstance(value, int) and not isinstance(value, bool):
         return Valid(value)
+    if _probing.get():
+        return _PROBE_FAILED
 
     return Invalid(f'Value is not int: {value} ({type(value)})')
 
@@ -93,7 +742,11 @@ def validate_bigint(value: Unknown) -> ValidationResult[int]:
             value = int(value)
             return Valid(value)
         except ValueError:
+            if _probing.get():
+                return _PROBE_FAILED
             return Invalid(f'String value for bigint is not parsable as integer: {value}')
+    if _probing.get():
+        return _PROBE_FAILED
     return Invalid(f'Value is not valid big integer or parsable as one: {value} ({type(value)})')
 
 
@@ -103,6 +756,8 @@ def validate_float(value: Unknown) -> ValidationResult[float]:
     """
     if isinstance(value, float) or isinstance(value, int):
         return Valid(value)
+    if _probing.get():
+        return _PROBE_FAILED
 
     return Invalid(f'Value is not float: {value} ({type(value)})')
 
@@ -113,10 +768,19 @@ def validate_bool(value: Unknown) -> ValidationResult[bool]:
     """
     if isinstance(value, bool):
         return Valid(value)
+    if _probing.get():
+        return _PROBE_FAILED
 
     return Invalid(f'Value is not bool: {value} ({type(value)})')
 
 
+# The exact types that validators give back as they are, for the type checks of `sampling`
+validate_string.shape_types = (str,)
+validate_int.shape_types = (int,)
+validate_float.shape_types = (float, int)
+validate_bool.shape_types = (bool,)
+
+
 def validate_literal(literal: T) -> Validator[T]:
     """
     Takes a literal value and creates a validator for it.
@@ -124,11 +788,16 @@ def validate_literal(literal: T) -> Validator[T]:
     def validator(value: Unknown) -> Validator[T]:
         if value == literal:
             return Valid(literal)
+        if _probing.get():
+            return _PROBE_FAILED
         return Invalid(f'Value is not {literal}: {value} ({type(value)})')
 
+    validator.accepted_types = _equality_types(literal)
+
     return validator
 
 
+@specialized
 def validate_optional(validator: Validator[T]) -> Validator[Optional[T]]:
     """
     Takes a validator and creates a validator that will return `None` if the value is `None`.
@@ -138,6 +807,13 @@ def validate_optional(validator: Validator[T]) -> Validator[Optional[T]]:
             return Valid(None)
         return validator(value)
 
+    accepted_types = _accepted_types(validator)
+    if accepted_types is not None:
+        validate_OptionalT.accepted_types = accepted_types + (type(None),)
+    shape_types = getattr(validator, 'shape_types', None)
+    if shape_types is not None:
+        validate_OptionalT.shape_types = shape_types + (type(None),)
+
     return validate_OptionalT
 
 
@@ -149,17 +825,27 @@ def validate_dict(value: Unknown,
     Validates a value as a dict with type `T` for keys and `U` for values.
     """
     if not isinstance(value, dict):
+        if _probing.get():
+            return _PROBE_FAILED
         return Invalid(f'Expected dict, got: {value} ({type(value)})')
 
+    if validate_t is validate_string and _parsed_json.get():
+        return _validate_parsed_json_values(value, validate_u)
+
+    probing = _probing.get()
     errors = dict()
     new_value = dict()
     for key, value in value.items():
         key_validation_result = validate_t(key)
         if isinstance(key_validation_result, Invalid):
+            if probing:
+                return _PROBE_FAILED
             errors[key] = key_validation_result.reason
         else:
             value_validation_result = validate_u(value)
             if isinstance(value_validation_result, Invalid):
+                if probing:
+                    return _PROBE_FAILED
                 errors[key] = value_validation_result.reason
             else:
                 new_value[key_validation_result.value] = value_validation_result.value
@@ -171,6 +857,33 @@ def validate_dict(value: Unknown,
     return Valid(new_value)
 
 
+def _validate_parsed_json_values(value: Dict[str, Unknown],
+                                 validate_u: Validator[U]
+                                 ) -> ValidationResult[StringMap[U]]:
+    """
+    Validates the values of a dict from parsed JSON, where the keys are known to be strings.
+    """
+    if validate_u is validate_unknown:
+        return Valid(value)
+
+    probing = _probing.get()
+    errors = dict()
+    new_value = dict()
+    for key, item in value.items():
+        item_validation_result = validate_u(item)
+        if isinstance(item_validation_result, Invalid):
+            if probing:
+                return _PROBE_FAILED
+            errors[key] = item_validation_result.reason
+        else:
+            new_value[key] = item_validation_result.value
+
+    if len(errors) > 0:
+        return Invalid(errors)
+
+    return Valid(new_value)
+
+
 def validate_string_map(value: Unknown, validator: Validator[T]) -> ValidationResult[StringMap[T]]:
     """
     Validates a value as a string map with value types `T`.
@@ -178,25 +891,47 @@ def validate_string_map(value: Unknown, validator: Validator[T]) -> ValidationRe
     return validate_dict(value, validate_string, validator)
 
 
+@specialized
 def validate_dict_of(validate_t: Validator[T],
                      validate_u: Validator[U]
                      ) -> Validator[Dict[T, U]]:
     """
-    Takes a key validator and a value validator and creates a validator for a dict using them.
+    Takes a key validator and a value validator and creates a validator for a dict using them. A
+    `containers.ValidatedMap` of `validate_u` is valid without validating its values again, unless
+    in `strict_instances` mode, and a copy of it is returned.
     """
     def validator(value: Unknown) -> Validator[Dict[T, U]]:
         if not isinstance(value, dict):
             return Invalid('Expected dict')
+        if validate_t is validate_string and _known_valid(value, dict, validate_u):
+            return Valid(value.copy())
+        if validate_t is validate_string:
+            sampler = _active_sampler(validate_u, len(value))
+            if sampler is not None and all(type(key) is str for key in value):
+                values = value.values()
+                valid_values = sampler.validate_items(values, len(value), validate_u)
+                if valid_values is values:
+                    return Valid(dict(value))
+                if valid_values is not None:
+                    return Valid(dict(zip(value, valid_values)))
+        if validate_t is validate_string and _parsed_json.get():
+            return _validate_parsed_json_values(value, validate_u)
+
+        probing = _probing.get()
         new_value = dict()
         errors = dict()
         for key, value_u in value.items():
             key_validation_result = validate_t(key)
-            value_validation_result = validate_u(value_u)
             if isinstance(key_validation_result, Invalid):
+                if probing:
+                    return _PROBE_FAILED
                 errors[key] = key_validation_result.reason
                 continue
 
+            value_validation_result = validate_u(value_u)
             if isinstance(value_validation_result, Invalid):
+                if probing:
+                    return _PROBE_FAILED
                 errors[key] = value_validation_result.reason
                 continue
 
@@ -207,9 +942,23 @@ def validate_dict_of(validate_t: Validator[T],
 
         return Valid(new_value)
 
+    validator.accepted_types = (dict,)
+
     return validator
 
 
+# Set in the classes of validated containers themselves; subclasses could put in unchecked items
+_VALIDATES_ITEMS = '__validates_items__'
+
+
+def _known_valid(value: Unknown, base: type, validate_item: Validator[Unknown]) -> bool:
+    """
+    Whether a container is a validated container whose items were validated by `validate_item`.
+    """
+    return (type(value) is not base and type(value).__dict__.get(_VALIDATES_ITEMS, False)
+            and value.item_validator is validate_item and not _strict_instances.get())
+
+
 def validate_string_map_of(validate_t: Validator[T]) -> Validator[StringMap[T]]:
     """
     Takes a value validator for `T` and creates a validator for a `StringMap[T]`.
@@ -217,18 +966,33 @@ def validate_string_map_of(validate_t: Validator[T]) -> Validator[StringMap[T]]:
     return validate_dict_of(validate_string, validate_t)
 
 
+@specialized
 def validate_list(validate_T: Validator[T]) -> Validator[List[T]]:
     """
-    Takes a validator and creates a validator for a list of that type.
+    Takes a validator and creates a validator for a list of that type. A `containers.ValidatedList`
+    of `validate_T` is valid without validating its items again, unless in `strict_instances` mode,
+    and a copy of it is returned.
     """
     def validate_list_T(value: Unknown) -> Validator[List[T]]:
         if not isinstance(value, list):
+            if _probing.get():
+                return _PROBE_FAILED
             return Invalid(f'Expected list, got: {value} ({type(value)})')
+        if _known_valid(value, list, validate_T):
+            return Valid(value.copy())
+        sampler = _active_sampler(validate_T, len(value))
+        if sampler is not None:
+            items = sampler.validate_items(value, len(value), validate_T)
+            if items is not None:
+                return Valid(list(items))
+        probing = _probing.get()
         errors = dict()
         new_value = list()
         for i, item in enumerate(value):
             item_validation_result = validate_T(item)
             if isinstance(item_validation_result, Invalid):
+                if probing:
+                    return _PROBE_FAILED
                 errors[str(i)] = item_validation_result.reason
             else:
                 new_value.append(item_validation_result.value)
@@ -238,6 +1002,8 @@ def validate_list(validate_T: Validator[T]) -> Validator[List[T]]:
 
         return Valid(new_value)
 
+    validate_list_T.accepted_types = (list,)
+
     return validate_list_T
 
 
@@ -250,6 +1016,8 @@ def validate_one_of_literals(value: Unknown, literals: List[T]) -> ValidationRes
     for literal in literals:
         if value == literal:
             return Valid(value)
+    if _probing.get():
+        return _PROBE_FAILED
     return Invalid(f'Expected one of {literals}, got: {value} ({type(value)})')
 
 
@@ -257,28 +1025,198 @@ def validate_one_of(value: Unknown, validators: List[Validator[T]]) -> Validatio
     """
     Validates a value as matching one of the given validators.
     """
-    for validator in validators:
-        validation_result = validator(value)
-        if isinstance(validation_result, Valid):
-            return validation_result
-
-    validator_names = [v.__name__ for v in validators]
+    validation_result = _first_match(value, _one_of_candidates(validators, type(value)))
+    if validation_result is not None:
+        return validation_result
 
-    return Invalid(f'Expected to match one of {validator_names}, got: {value} ({type(value)})')
+    return _no_match(value, validators)
 
 def validate_one_of_with_constructor(value: Unknown, validators: List[Validator[T]], constructor: Callable[[T], U]) -> ValidationResult[U]:
     """
     Validates a value as matching one of the given validators.
     """
-    for validator in validators:
-        validation_result = validator(value)
-        if isinstance(validation_result, Valid):
-            return Valid(constructor(validation_result.value))
+    validation_result = _first_match(value, _one_of_candidates(validators, type(value)))
+    if validation_result is not None:
+        return Valid(constructor(validation_result.value))
+
+    return _no_match(value, validators)
+
+
+def _first_match(value: Unknown, candidates: List[Validator[T]]) -> Optional[Valid[T]]:
+    """
+    Gives the result of the first candidate that accepts the value, trying them in `_probing` mode.
+    """
+    if len(candidates) == 0:
+        return None
+    if _probing.get():
+        for validator in candidates:
+            validation_result = validator(value)
+            if isinstance(validation_result, Valid):
+                return validation_result
+        return None
+
+    token = _probing.set(True)
+    try:
+        for validator in candidates:
+            validation_result = validator(value)
+            if isinstance(validation_result, Valid):
+                return validation_result
+    finally:
+        _probing.reset(token)
+
+    return None
 
+
+def _no_match(value: Unknown, validators: List[Validator[T]]) -> Invalid:
+    if _probing.get():
+        return _PROBE_FAILED
     validator_names = [v.__name__ for v in validators]
 
     return Invalid(f'Expected to match one of {validator_names}, got: {value} ({type(value)})')
 
+
+def validate_union(validators: List[Validator[T]],
+                   constructor: Optional[Callable[[T], U]] = None) -> Validator[U]:
+    """
+    Takes a list of validators and creates a validator for a value matching one of them, like
+    `validate_one_of` (or `validate_one_of_with_constructor` if a constructor is given). Which
+    validators can accept which Python types is worked out once, so each value is only tried
+    against the validators that could accept its type. Members that fail don't render a reason.
+    """
+    validators = list(validators)
+    by_type: Dict[type, List[Validator[T]]] = {}
+
+    def validate_union_value(value: Unknown) -> ValidationResult[U]:
+        value_type = type(value)
+        candidates = by_type.get(value_type)
+        if candidates is None:
+            candidates = _filter_candidates(validators, value_type)
+            by_type[value_type] = candidates
+        validation_result = _first_match(value, candidates)
+        if validation_result is None:
+            return _no_match(value, validators)
+        if constructor is not None:
+            return Valid(constructor(validation_result.value))
+
+        return validation_result
+
+    return validate_union_value
+
+
+# Candidate validators per union and input type, for unions passed as lists on every call. Inline
+# lists with fresh closures never hit again, so the cache is dropped once it gets large. Entries are
+# computed in full before they're stored, so threads racing on one key store equal lists.
+_ONE_OF_CACHE_LIMIT = 1024
+_one_of_cache: Dict[Tuple[Tuple[Validator[Unknown], ...], type], List[Validator[Unknown]]] = {}
+
+
+def _one_of_candidates(validators: List[Validator[T]], value_type: type) -> List[Validator[T]]:
+    key = (tuple(validators), value_type)
+    try:
+        candidates = _one_of_cache.get(key)
+    except TypeError:
+        # Validators that are not hashable can't be cached
+        return _filter_candidates(validators, value_type)
+    if candidates is None:
+        if len(_one_of_cache) >= _ONE_OF_CACHE_LIMIT:
+            _one_of_cache.clear()
+        candidates = _filter_candidates(validators, value_type)
+        _one_of_cache[key] = candidates
+
+    return candidates
+
+
+def _filter_candidates(validators: List[Validator[T]], value_type: type) -> List[Validator[T]]:
+    candidates = []
+    for validator in validators:
+        accepted_types = _accepted_types(validator)
+        if accepted_types is None or issubclass(value_type, accepted_types):
+            candidates.append(validator)
+
+    return candidates
+
+
+def _equality_types(value: Unknown) -> Tuple[type, ...]:
+    """
+    Returns the types of values that can compare equal to `value`.
+    """
+    if isinstance(value, (int, float)):
+        return (int, float)
+    if isinstance(value, Enum):
+        # Members of enumerations mixed in with a data type, like `str`, equal values of that type
+        mixins = tuple(t for t in type(value).__mro__ if not issubclass(t, Enum) and t is not object)
+        if len(mixins) > 0:
+            return mixins
+
+    return (type(value),)
+
+
+def _accepted_types(validator: Validator[T]) -> Optional[Tuple[type, ...]]:
+    """
+    Returns the Python types a validator can possibly accept, or `None` if that is not known.
+    """
+    accepted_types = getattr(validator, 'accepted_types', None)
+    if accepted_types is not None:
+        return accepted_types
+    try:
+        if validator in _PRIMITIVE_ACCEPTED_TYPES:
+            return _PRIMITIVE_ACCEPTED_TYPES[validator]
+    except TypeError:
+        return None
+
+    class_ = _generated_class_of(validator)
+    if class_ is None:
+        return None
+    # Instances of the class itself are accepted as they are
+    if issubclass(class_, Enum):
+        accepted_types = tuple(set(t for member in class_ for t in _equality_types(member.value))) + (class_,)
+    elif is_dataclass(class_) or hasattr(class_, '__tag_field__'):
+        accepted_types = (dict, class_)
+    else:
+        return None
+    # Kept on the function, which belongs to this class for good
+    validator.accepted_types = accepted_types
+
+    return accepted_types
+
+
+def _generated_class_of(validator: Validator[T]) -> Optional[type]:
+    """
+    Finds the generated class that a `validate` function belongs to, or that created it for a generic
+    type. The class is looked up by name in the namespace the function was defined in, and only
+    counts if its own `validate` is that function, or created it.
+    """
+    class_name, _, rest = getattr(validator, '__qualname__', '').partition('.')
+    namespace = getattr(validator, '__globals__', None)
+    if not rest.startswith('validate') or namespace is None:
+        return None
+    class_ = namespace.get(class_name)
+    if not isinstance(class_, type):
+        return None
+    validate = class_.__dict__.get('validate')
+    if not isinstance(validate, staticmethod):
+        return None
+    function = getattr(validate.__func__, '__wrapped__', validate.__func__)
+    if function is validator:
+        return class_
+    # Validators of generic types are created by a function inside of `validate`
+    code = getattr(validator, '__code__', None)
+    factory_code = getattr(function, '__code__', None)
+    if code is not None and factory_code is not None and code in factory_code.co_consts:
+        return class_
+
+    return None
+
+
+_PRIMITIVE_ACCEPTED_TYPES: Dict[Validator[Unknown], Tuple[type, ...]] = {
+    validate_string: (str, bytes),
+    validate_int: (int,),
+    validate_bigint: (int, str),
+    validate_float: (int, float),
+    validate_bool: (bool,),
+}
+
+
 def validate_unknown(value: Unknown) -> ValidationResult[Unknown]:
     """
     Validates a value as unknown. This is always a valid result.
@@ -291,13 +1229,18 @@ def validate_interface(value: Unknown,
                        constructor: Callable[[Dict[str, Unknown]], T] = None
                        ) -> ValidationResult[T]:
     """
-    Validates a value as matching a given interface specification.
+    Validates a value as matching a given interface specification. An instance of `constructor`
+    itself is accepted as it is, see `strict_instances`.
     """
+    if constructor is not None and type(value) is constructor:
+        return _validate_instance(value, interface)
+
     value_as_string_map = validate_string_map(value, validate_unknown)
     if isinstance(value_as_string_map, Invalid):
         return value_as_string_map
 
     value_as_string_map = value_as_string_map.value
+    probing = _probing.get()
     errors = dict()
     new_value = dict()
     # iterate through the interface, validating each key exists and the value matches the validator
@@ -305,12 +1248,16 @@ def validate_interface(value: Unknown,
         if key not in value_as_string_map:
             validation_result = validator(None)
             if isinstance(validation_result, Invalid):
+                if probing:
+                    return _PROBE_FAILED
                 errors[key] = validation_result.reason
             else:
                 new_value[key] = validation_result.value
         else:
             validation_result = validator(value_as_string_map[key])
             if isinstance(validation_result, Invalid):
+                if probing:
+                    return _PROBE_FAILED
                 errors[key] = validation_result
             else:
                 new_value[key] = validation_result.value
@@ -319,7 +1266,7 @@ def validate_interface(value: Unknown,
         return Invalid(errors)
 
     if constructor is not None:
-        return Valid(constructor(**new_value))
+        return Valid(construct(constructor, new_value))
 
     return Valid(new_value)
 
@@ -339,6 +1286,8 @@ def validate_has_type_tag(value: Unknown,
         return Invalid(f'Missing tag field "{tag_field}"')
     tag = string_map[tag_field]
     if tag != type_tag:
+        if _probing.get():
+            return _PROBE_FAILED
         return Invalid(f'Expected tag "{type_tag}", got "{tag}"')
     return Valid(string_map)
 
@@ -363,7 +1312,7 @@ def validate_with_type_tag_and_validator(value: Unknown,
     if isinstance(result, Invalid):
         return result
 
-    return Valid(constructor(**result.value))
+    return Valid(construct(constructor, result.value))
 
 
 def validate_with_type_tag(value: Unknown,
@@ -374,8 +1323,12 @@ def validate_with_type_tag(value: Unknown,
                            ) -> ValidationResult[T]:
     """
     Validates a value as matching a given interface specification and having a type tag. The type
-    tag is removed from the result after validation.
+    tag is removed from the result after validation. An instance of `constructor` itself is
+    accepted as it is, see `strict_instances`.
     """
+    if type(value) is constructor:
+        return _validate_instance(value, interface)
+
     # Check first for a valid type tag
     validation_result = validate_has_type_tag(value, tag_field, type_tag)
     if isinstance(validation_result, Invalid):
@@ -385,7 +1338,7 @@ def validate_with_type_tag(value: Unknown,
     if isinstance(result, Invalid):
         return result
 
-    return Valid(constructor(**result.value))
+    return Valid(construct(constructor, result.value))
 
 
 def validate_with_type_tags(value: Unknown,
@@ -397,6 +1350,12 @@ def validate_with_type_tags(value: Unknown,
     field matches, the corresponding validator is also run either on the value itself or a 'data'
     field inside of it.
     """
+    # Instances of the generated class of a case go straight to the validator of that case
+    if is_dataclass(value) and not isinstance(value, type):
+        validator = tagged_validators.get(type(value).__name__)
+        if validator is not None and type(value) in (_accepted_types(validator) or ()):
+            return validator(value)
+
     # Make sure that we have a `StringMap`
     as_string_map = validate_string_map(value, validate_unknown)
     if not isinstance(as_string_map, Valid):
@@ -405,10 +1364,14 @@ def validate_with_type_tags(value: Unknown,
 
     # Make sure that the tag field exists
     if tag_field not in string_map:
+        if _probing.get():
+            return _PROBE_FAILED
         return Invalid(f'Missing tag field: {tag_field}')
     tag = string_map[tag_field]
     # If the tag doesn't match any of our tagged validators, we have an error
     if tag not in tagged_validators:
+        if _probing.get():
+            return _PROBE_FAILED
         valid_type_tags = [tag for tag in tagged_validators.keys()]
 
         return Invalid(f'Invalid tag: {tag}, expecting one of {valid_type_tags}')
@@ -421,11 +1384,16 @@ def validate_with_type_tags(value: Unknown,
 
 def validate_enumeration_member(value: Unknown, enumeration: Enum) -> ValidationResult[Enum]:
     """
-    Validates that a value is a member of an enumeration.
+    Validates that a value is a member of an enumeration, or the value of one.
     """
+    if isinstance(value, enumeration):
+        return Valid(value)
+
     for member in enumeration:
         if value == member.value:
             return Valid(member)
+    if _probing.get():
+        return _PROBE_FAILED
 
     enumeration_values = [str(v) for v in enumeration]
 
@@ -1,8 +1,8 @@
 from dataclasses import dataclass
 from typing import Generic, Literal, Optional, TypeVar, Union
 import unittest
-from gotyno_validation.gotyno_output import Color, Definitely, NotReally, Possibly, SomeType
-from gotyno_validation.notifications import AllNotificationsCleared, CommandSuccess, NotificationAdded, NotificationCommandResult, NotifyUserPayload
+from gotyno_validation.gotyno_output import AnotherEvent, Color, Definitely, Event, NotReally, Possibly, SomeType
+from gotyno_validation.notifications import AllNotificationsCleared, CommandSuccess, NotificationAdded, NotificationCommandResult, Notifications, NotifyUserPayload
 from gotyno_validation.validation import (Unknown, ValidationResult, Validator, validate_dict, validate_enumeration_member, validate_float,
                                           validate_from_string, validate_int, validate_interface, validate_list, validate_literal,
                                           validate_optional, validate_string, Valid, Invalid, validate_string_map)
@@ -10,8 +10,15 @@ import json
 import gotyno_validation.validation as v
 import gotyno_validation.validation as validation
 import gotyno_validation.encoding as encoding
+import gotyno_validation.gotyno_output as gotyno_output
+import gotyno_validation.schema as schema
+import gotyno_validation.lazy as lazy
 import typing
 import enum
+import gc
+import mmap
+import tempfile
+import weakref
 
 T = TypeVar('T')
 
@@ -207,3 +214,299 @@ class TestValidator(unittest.TestCase):
         all_notifications_cleared = AllNotificationsCleared()
         all_notifications_cleared_encoded = all_notifications_cleared.encode()
         all_notifications_cleared_decoded = AllNotificationsCleared.decode(all_notifications_cleared.encode())
+
+    def test_parsed_json_mode_gives_same_results(self):
+        validator = validation.validate_string_map_of(validate_int)
+        self.assertEqual(validate_from_string('{"a": 1, "b": 2}', validator), Valid({'a': 1, 'b': 2}))
+        self.assertEqual(validate_from_string('{"a": 1, "b": "2"}', validator),
+                         validate_from_string('{"a": 1, "b": "2"}', validator, parsed_json=False))
+        self.assertEqual(SomeType.decode('{"type": "SomeType", "some_field": "1", "some_other_field": 1}'),
+                         Valid(SomeType('SomeType', '1', 1, None)))
+
+        # Raw Python objects outside of parsed JSON mode still get their keys checked
+        self.assertEqual(validator({b'a': 1}), Valid({'a': 1}))
+        self.assertEqual(validate_dict({1: 'x'}, validate_string, validate_int),
+                         Invalid({1: 'Value is not string: 1 (<class \'int\'>)'}))
+        with validation.parsed_json_source():
+            self.assertEqual(validate_string_map({'a': 1}, validate_int), Valid({'a': 1}))
+
+    def test_union_validators_only_try_matching_types(self):
+        calls = []
+
+        def validate_counted_int(value):
+            calls.append(value)
+            return validate_int(value)
+
+        validate_counted_int.accepted_types = (int,)
+        validators = [validate_counted_int, validate_string, SomeType.validate,
+                      validation.validate_list(validate_int), validate_literal(None)]
+        union = validation.validate_union(validators)
+
+        self.assertEqual(union('hello'), Valid('hello'))
+        self.assertEqual(union([1, 2]), Valid([1, 2]))
+        self.assertEqual(union(None), Valid(None))
+        self.assertEqual(validation.validate_one_of('hello', validators), Valid('hello'))
+        self.assertEqual(calls, [])
+        self.assertEqual(union(1), Valid(1))
+        self.assertEqual(calls, [1])
+
+        self.assertEqual(union(1.5), validation.validate_one_of(1.5, validators))
+        self.assertIsInstance(union(1.5), Invalid)
+        self.assertEqual(validation.validate_union([validate_literal(1)])(1.0), Valid(1))
+        self.assertEqual(validation.validate_one_of_with_constructor(3, validators, str), Valid('3'))
+
+    def test_union_members_do_not_render_reasons(self):
+        renders = 0
+
+        class Rendered:
+            def __repr__(self):
+                nonlocal renders
+                renders += 1
+                return 'Rendered()'
+
+        first = validation.validate_string_map_of(validation.validate_list(validate_int))
+        second = validation.validate_string_map_of(validation.validate_unknown)
+        value = {'a': [1, Rendered()]}
+        self.assertEqual(validation.validate_union([first, second])(value), Valid(value))
+        self.assertEqual(validation.validate_one_of(value, [first, second]), Valid(value))
+        self.assertEqual(validation.validate_union([SomeType.validate, second])(value), Valid(value))
+        self.assertEqual(renders, 0)
+
+        self.assertEqual(validation.validate_union([first, validate_int])(value),
+                         validation.validate_one_of(value, [first, validate_int]))
+        self.assertIn("got: {'a': [1, Rendered()]}", validation.validate_union([first])(value).reason)
+        self.assertEqual(first(value), Invalid({'a': {'1': 'Value is not int: Rendered() (' + str(Rendered) + ')'}}))
+
+    def test_union_dispatch_on_enumerations_and_lazily_loaded_types(self):
+        class Mode(str, enum.Enum):
+            fast = 'fast'
+
+        union = validation.validate_union([validate_literal(Mode.fast), validate_int])
+        self.assertEqual(union('fast'), Valid(Mode.fast))
+        self.assertEqual(validation.validate_one_of('fast', [validate_literal(Mode.fast)]), Valid(Mode.fast))
+
+        # Classes are found where their validators were defined, not by the name of their module
+        module = lazy.load_lazily('gotyno_validation.gotyno_output', register=False)
+        event = module.AnotherEvent(module.SomeType('SomeType', 'x', 1, None))
+        self.assertEqual(validation.validate_union([module.Event.validate, validate_int])(event), Valid(event))
+        self.assertEqual(module.Event.validate(event), Valid(event))
+        self.assertEqual(validation._accepted_types(module.Event.validate), (dict, module.Event))
+        self.assertEqual(validation._accepted_types(Possibly.validate(validate_int)), (dict, Possibly))
+
+    def test_generic_validators_are_specialized_once(self):
+        self.assertIs(Possibly.validate(validate_int), Possibly.validate(validate_int))
+        self.assertIs(Definitely.validate(validate_int), Definitely.validate(validate_int))
+        self.assertIs(validate_list(validate_int), validate_list(validate_int))
+        self.assertIsNot(validate_list(validate_int), validate_list(validate_string))
+        self.assertEqual(Possibly.validate(validate_list(validate_int))({'type': 'Definitely', 'data': [1]}),
+                         Valid(Definitely([1])))
+
+        def validate_temporary(value):
+            return validate_int(value)
+
+        validator = validate_list(validate_temporary)
+        reference = weakref.ref(validate_temporary)
+        del validate_temporary, validator
+        gc.collect()
+        self.assertIsNone(reference())
+
+    def test_specializations_do_not_outlive_any_of_their_arguments(self):
+        def validate_temporary(value):
+            return validate_int(value)
+
+        self.assertIs(validation.validate_string_map_of(validate_temporary),
+                      validation.validate_string_map_of(validate_temporary))
+        self.assertIs(validation.validate_dict_of(validate_temporary, validate_string),
+                      validation.validate_dict_of(validate_temporary, validate_string))
+        validation.validate_dict_of(validate_string, validate_temporary)
+        self.assertEqual(len(vars(validate_temporary)[validation._SPECIALIZATIONS]), 1)
+
+        # Long-lived validators like `validate_string` don't keep what they were combined with alive
+        references = []
+        for _ in range(100):
+            def validate_item(value):
+                return validate_int(value)
+
+            validators = [validation.validate_string_map_of(validate_item),
+                          validation.validate_dict_of(validate_string, validate_item),
+                          validate_list(validation.validate_string_map_of(validate_item))]
+            self.assertEqual(validators[0]({'a': 1}), Valid({'a': 1}))
+            references.extend(weakref.ref(v) for v in validators + [validate_item])
+        del validate_item, validators
+        gc.collect()
+        self.assertEqual([r for r in references if r() is not None], [])
+
+    def test_specializations_are_reused_across_calls(self):
+        def validate_item(value):
+            return validate_int(value)
+
+        built = []
+        validate_dict_of = validation.validate_dict_of.__wrapped__
+
+        def counting_factory(*arguments):
+            built.append(arguments)
+            return validate_dict_of(*arguments)
+
+        specialize = validation.specialized(counting_factory)
+        reference = weakref.ref(specialize(validate_string, validate_item))
+        gc.collect()
+        self.assertIsNotNone(reference())
+        self.assertIs(specialize(validate_string, validate_item), reference())
+        self.assertEqual(len(built), 1)
+
+        # Generated validators ask for their specializations on every call
+        validation.validate_string_map_of(validate_item)
+        validate_map = weakref.ref(validation.validate_string_map_of(validate_item))
+        gc.collect()
+        self.assertIs(validation.validate_string_map_of(validate_item), validate_map())
+
+
+    def test_interning_shares_equal_instances(self):
+        payload = {'type': 'SomeType', 'some_field': 'x', 'some_other_field': 1}
+        events = [{'type': 'AnotherEvent', 'data': dict(payload)} for _ in range(3)]
+        events.append({'type': 'AnotherEvent', 'data': dict(payload, some_field='y')})
+        with validation.interning() as table:
+            results = [Event.validate(e).value for e in events]
+            notifications = Notifications.decode('{"type": "Notifications", "data": []}').value
+            self.assertIsNot(notifications, Notifications.decode('{"type": "Notifications", "data": []}').value)
+        self.assertIs(results[0], results[1])
+        self.assertIs(results[0].data, results[2].data)
+        self.assertIsNot(results[0].data, results[3].data)
+        self.assertEqual(table.hits, 4)
+        self.assertIsNot(Event.validate(events[0]).value, results[0])
+
+        with validation.interning(max_size=1) as table:
+            first = SomeType.validate(payload).value
+            SomeType.validate(dict(payload, some_field='y'))
+            self.assertIsNot(SomeType.validate(payload).value, first)
+            self.assertEqual(len(table), 1)
+
+        table = validation.InternTable()
+        values = [table.construct(Valid, {'value': v}) for v in (1, True, 1.0, 1, [1])]
+        self.assertEqual(len({id(v) for v in values}), 4)
+        self.assertIs(values[0], values[3])
+
+    def test_instances_of_generated_classes_pass_through(self):
+        payload = NotifyUserPayload.validate({'id': 1, 'message': 'm'}).value
+        self.assertIs(NotifyUserPayload.validate(payload).value, payload)
+        event = AnotherEvent(SomeType('SomeType', 'x', 1, None))
+        self.assertIs(Event.validate(event).value, event)
+        self.assertIs(AnotherEvent.validate(event).value, event)
+        self.assertIs(Possibly.validate(validate_int)(Definitely(1)).value.data, 1)
+        self.assertIs(Color.validate(Color.red).value, Color.red)
+        self.assertIsInstance(SomeType.validate(event), Invalid)
+        self.assertIsInstance(Event.validate(SomeType('SomeType', 'x', 1, None)), Invalid)
+
+        broken = AnotherEvent(SomeType('SomeType', 1, 'x', None))
+        self.assertIs(Event.validate(broken).value, broken)
+        with validation.strict_instances():
+            self.assertIs(Event.validate(event).value, event)
+            self.assertIsInstance(Event.validate(broken), Invalid)
+            self.assertIsInstance(Possibly.validate(validate_int)(Definitely('1')), Invalid)
+            not_really = NotReally()
+            self.assertIs(Possibly.validate(validate_int)(not_really).value, not_really)
+
+    def test_sampling_checks_types_and_escalates_on_errors(self):
+        validate_ints = validate_list(validate_int)
+        values = list(range(1000))
+        with validation.sampling(fraction=0.05, seed=1) as report:
+            self.assertEqual(validate_ints(values), Valid(values))
+            self.assertEqual(validation.validate_string_map_of(validate_optional(validate_string))(
+                {str(i): None if i % 2 else 'x' for i in range(100)}).value['1'], None)
+        self.assertFalse(report.escalated)
+        self.assertEqual(report.checked + report.skipped, 1100)
+        self.assertGreaterEqual(report.checked, 55)
+
+        invalid = values[:-1] + ['x']
+        with validation.sampling(fraction=0.0, seed=1) as report:
+            self.assertEqual(validate_ints(invalid), validate_list(validate_int)(invalid))
+            self.assertIsInstance(validate_ints(values[:500] + [True] + values[501:]), Invalid)
+        self.assertTrue(report.escalated)
+        self.assertEqual(report.error_rate, 0.5)
+
+        # Interfaces with basic fields only have their tag and fields checked
+        items = [{'type': 'SomeType', 'some_field': str(i), 'some_other_field': i} for i in range(100)]
+        expected = validate_list(SomeType.validate)(items)
+        with validation.sampling(fraction=0.0) as report:
+            self.assertEqual(validate_list(SomeType.validate)(items), expected)
+            self.assertIsInstance(validate_list(NotificationAdded.validate)(
+                [{'type': 'NotificationAdded', 'data': {'id': i, 'message': 'x'}} for i in range(5)]), Valid)
+        self.assertFalse(report.escalated)
+        self.assertEqual((report.checked, report.skipped), (2, 98))
+        self.assertEqual(validation._interface_shape(NotificationAdded.validate), None)
+
+        # Escalation holds for the rest of the block, not just the container it happened in
+        mistagged = items[:50] + [dict(items[50], type='AnotherType')] + items[51:]
+        with validation.sampling(fraction=0.0) as report:
+            self.assertIsInstance(validate_list(SomeType.validate)(mistagged), Invalid)
+            self.assertEqual(validate_ints(values), Valid(values))
+        self.assertTrue(report.escalated)
+        self.assertEqual((report.checked, report.skipped), (1, 49))
+
+    def test_generated_classes_are_slotted_and_constructed_directly(self):
+        payload = {'type': 'AnotherEvent', 'data': {'type': 'SomeType', 'some_field': 'x', 'some_other_field': 1}}
+        event = Event.validate(payload).value
+        self.assertEqual(event, AnotherEvent(SomeType('SomeType', 'x', 1, None)))
+        self.assertFalse(hasattr(event, '__dict__'))
+        self.assertFalse(hasattr(event.data, '__dict__'))
+        self.assertEqual(hash(event), hash(AnotherEvent(SomeType('SomeType', 'x', 1, None))))
+        self.assertEqual(encoding.memoized_encode(event), event.encode())
+        # The classes replaced by their slotted versions are not cases of their union
+        self.assertEqual(schema.union_cases(Event), [gotyno_output.Notification, gotyno_output.Launch, AnotherEvent])
+
+        @dataclass(frozen=True)
+        class Plain:
+            name: str
+            count: int = 0
+
+        @dataclass(frozen=True)
+        class Checked:
+            name: str
+
+            def __post_init__(self):
+                if self.name == '':
+                    raise ValueError('Empty name')
+
+        interface = {'name': validate_string, 'count': validate_int}
+        self.assertEqual(validate_interface({'name': 'x', 'count': 1}, interface, Plain), Valid(Plain('x', 1)))
+        self.assertEqual(validate_interface({'name': 'x'}, {'name': validate_string}, Plain), Valid(Plain('x')))
+        self.assertRaises(TypeError, validate_interface, {'name': 'x', 'other': 1},
+                          {'name': validate_string, 'other': validate_int}, Plain)
+        self.assertEqual(validate_interface({'name': 'x'}, {'name': validate_string}, Checked), Valid(Checked('x')))
+        self.assertRaises(ValueError, validate_interface, {'name': ''}, {'name': validate_string}, Checked)
+
+    def test_dataclass_constructors_are_recognized(self):
+        # `_trusted_constructor` only takes over from the `__init__` that dataclasses compile from a
+        # string; if Python stops doing that, generated classes would silently be constructed slowly
+        for class_ in (SomeType, AnotherEvent, gotyno_output.Launch, NotificationAdded):
+            self.assertEqual(class_.__init__.__code__.co_filename, '<string>',
+                             f'The dataclass __init__ of {class_.__name__} is no longer compiled from a string')
+            self.assertNotEqual(validation._trusted_constructor(class_).__name__, 'construct_by_keywords',
+                                f'{class_.__name__} is no longer constructed directly')
+
+    def test_decoding_from_buffers(self):
+        texts = [json.dumps({'type': 'Notification', 'data': f'd{i}'}) for i in range(3)] + ['"0000ff"']
+        packed = bytearray(''.join(texts).encode('utf-8'))
+        offsets = [sum(len(t) for t in texts[:i]) for i in range(len(texts))]
+        for i, text in enumerate(texts[:3]):
+            expected = Event.decode(text)
+            self.assertEqual(Event.decode(packed, offset=offsets[i], length=len(text)), expected)
+            self.assertEqual(Event.decode(memoryview(packed)[offsets[i]:], length=len(text)), expected)
+            self.assertEqual(Event.decode(packed, lazy=True, offset=offsets[i], length=len(text)).value.data,
+                             expected.value.data)
+        self.assertEqual(Color.decode(packed, offset=offsets[3]), Valid(Color.blue))
+        self.assertEqual(Event.decode(packed, length=len(texts[0]) - 1), Invalid('Invalid JSON'))
+        self.assertRaises(ValueError, Event.decode, packed, offset=offsets[3], length=100)
+        self.assertRaises(ValueError, Event.decode, packed, offset=-1)
+
+        self.assertEqual(validation.json_text(texts[0].encode('utf-16')), texts[0])
+        self.assertEqual(validation.json_text('abcd', 1, 2), 'bc')
+        self.assertEqual(validate_from_string(bytearray(b'\xff\xfe{'), validate_int), Invalid('Invalid JSON'))
+
+        with tempfile.TemporaryFile() as f:
+            f.write(packed)
+            f.flush()
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.assertEqual(Event.decode(mapped, offset=offsets[1], length=len(texts[1])), Event.decode(texts[1]))
+            # Nothing holds on to the mapped memory after decoding
+            mapped.close()
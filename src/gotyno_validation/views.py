@@ -0,0 +1,206 @@
+from typing import Any, Dict, Iterator, List, Optional, Union
+from collections.abc import Mapping, Sequence
+import json
+
+from gotyno_validation import schema as s
+from gotyno_validation.validation import Invalid, JSONText, Unknown, Valid, ValidationResult, json_text
+
+
+class LazyValidationError(ValueError):
+    """
+    Raised when a field of a view turns out to be invalid once it is accessed. `path` is the list of
+    keys leading to the field and `reason` is the same reason an eager validation would give.
+    """
+
+    def __init__(self, path: List[str], reason: Any):
+        super().__init__(f'Invalid value at {"/".join(path)}: {reason}')
+        self.path = path
+        self.reason = reason
+
+
+def decode_view(value: JSONText,
+                type_: Any,
+                *arguments: Any,
+                offset: int = 0,
+                length: Optional[int] = None) -> ValidationResult[Any]:
+    """
+    Decodes a string lazily as `type_`. Only the shape of the top-level value is checked; the
+    result is a view whose fields are validated the first time they are accessed.
+
+    :param value: The string to decode, or a buffer holding it, see `json_text`.
+    :param type_: The generated type to decode as.
+    :param arguments: Type arguments for generic types, as types or validators.
+    :param offset: Where in `value` the JSON starts.
+    :param length: The length of the JSON, which otherwise runs to the end of `value`.
+    :return: The validation result, containing a view if the shape is valid.
+    """
+    try:
+        text = json_text(value, offset, length)
+    except UnicodeDecodeError:
+        return Invalid('Invalid JSON')
+    try:
+        value = json.loads(text)
+    except ValueError:
+        return Invalid('Invalid JSON')
+
+    return view_of(value, s.schema_of(type_, *arguments))
+
+
+def view_of(value: Unknown, schema: s.Schema) -> ValidationResult[Any]:
+    """
+    Checks the shape of a value against a schema and wraps it in a view. Values that are not
+    interfaces, unions, lists or maps have no views and are validated fully.
+    """
+    return _view_of(value, schema, [])
+
+
+def _view_of(value: Unknown, schema: s.Schema, path: List[str]) -> ValidationResult[Any]:
+    if isinstance(schema, s.InterfaceSchema):
+        if not isinstance(value, dict):
+            return Invalid(f'Expected dict, got: {value} ({type(value)})')
+        if schema.tag_field is not None:
+            if schema.tag_field not in value:
+                return Invalid(f'Missing tag field "{schema.tag_field}"')
+            tag = value[schema.tag_field]
+            if tag != schema.tag:
+                return Invalid(f'Expected tag "{schema.tag}", got "{tag}"')
+        return Valid(InterfaceView(schema, value, path))
+
+    if isinstance(schema, s.TaggedUnionSchema):
+        if not isinstance(value, dict):
+            return Invalid(f'Expected dict, got: {value} ({type(value)})')
+        if schema.tag_field not in value:
+            return Invalid(f'Missing tag field: {schema.tag_field}')
+        tag = value[schema.tag_field]
+        if tag not in schema.cases:
+            return Invalid(f'Invalid tag: {tag}, expecting one of {list(schema.cases.keys())}')
+        return Valid(InterfaceView(schema.cases[tag], value, path))
+
+    if isinstance(schema, s.ListSchema):
+        if not isinstance(value, list):
+            return Invalid(f'Expected list, got: {value} ({type(value)})')
+        return Valid(ListView(schema, value, path))
+
+    if isinstance(schema, s.StringMapSchema):
+        if not isinstance(value, dict):
+            return Invalid('Expected dict')
+        return Valid(StringMapView(schema, value, path))
+
+    if isinstance(schema, s.OptionalSchema):
+        if value is None:
+            return Valid(None)
+        return _view_of(value, schema.inner, path)
+
+    return s.validator_of(schema)(value)
+
+
+def _access(value: Unknown, schema: s.Schema, path: List[str]) -> Any:
+    result = _view_of(value, schema, path)
+    if isinstance(result, Invalid):
+        raise LazyValidationError(path, result.reason)
+
+    return result.value
+
+
+class InterfaceView:
+    """
+    A lazily validated view of a generated dataclass. Fields are validated and converted on first
+    access and then cached. `force()` validates the whole value and constructs the real instance.
+    """
+    __slots__ = ('_schema', '_raw', '_path', '_cache')
+
+    def __init__(self, schema: s.InterfaceSchema, raw: Dict[str, Unknown], path: List[str]):
+        self._schema = schema
+        self._raw = raw
+        self._path = path
+        self._cache: Dict[str, Any] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('_') or name not in self._schema.fields:
+            raise AttributeError(name)
+        if name not in self._cache:
+            # The first value stored wins, so that threads sharing a view see the same nested views
+            self._cache.setdefault(name, _access(self._raw.get(name), self._schema.fields[name],
+                                                 self._path + [name]))
+
+        return self._cache[name]
+
+    def force(self) -> ValidationResult[Any]:
+        """
+        Runs full validation on the viewed value, returning the constructed instance if valid.
+        """
+        return s.validator_of(self._schema)(self._raw)
+
+    def __repr__(self) -> str:
+        return f'InterfaceView({self._schema.constructor.__name__})'
+
+
+class ListView(Sequence):
+    """
+    A lazily validated view of a list. Items are validated when they are indexed or iterated.
+    """
+    __slots__ = ('_schema', '_raw', '_path', '_cache')
+
+    def __init__(self, schema: s.ListSchema, raw: List[Unknown], path: List[str]):
+        self._schema = schema
+        self._raw = raw
+        self._path = path
+        self._cache: Dict[int, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(len(self._raw))[index]]
+        if index < 0:
+            index += len(self._raw)
+        if index not in self._cache:
+            item = self._raw[index]
+            self._cache.setdefault(index, _access(item, self._schema.item, self._path + [str(index)]))
+
+        return self._cache[index]
+
+    def force(self) -> ValidationResult[List[Any]]:
+        """
+        Runs full validation on the viewed list.
+        """
+        return s.validator_of(self._schema)(self._raw)
+
+    def __repr__(self) -> str:
+        return f'ListView(length={len(self._raw)})'
+
+
+class StringMapView(Mapping):
+    """
+    A lazily validated view of a string map. Values are validated when they are looked up.
+    """
+    __slots__ = ('_schema', '_raw', '_path', '_cache')
+
+    def __init__(self, schema: s.StringMapSchema, raw: Dict[str, Unknown], path: List[str]):
+        self._schema = schema
+        self._raw = raw
+        self._path = path
+        self._cache: Dict[str, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._raw)
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._cache:
+            value = self._raw[key]
+            self._cache.setdefault(key, _access(value, self._schema.value, self._path + [key]))
+
+        return self._cache[key]
+
+    def force(self) -> ValidationResult[Dict[str, Any]]:
+        """
+        Runs full validation on the viewed string map.
+        """
+        return s.validator_of(self._schema)(self._raw)
+
+    def __repr__(self) -> str:
+        return f'StringMapView(length={len(self._raw)})'
@@ -0,0 +1,77 @@
+import gc
+import json
+import unittest
+import weakref
+from unittest import mock
+from gotyno_validation import schema
+from gotyno_validation.gotyno_output import Definitely, Holder, Possibly, SomeType
+from gotyno_validation.notifications import Notification, Notifications, NotificationCommandResult
+from gotyno_validation.validation import Invalid, Valid, validate_int
+from gotyno_validation.views import InterfaceView, LazyValidationError, ListView
+
+
+class TestViews(unittest.TestCase):
+    "A test suite for lazily validated views"
+
+    def test_lazy_decode_validates_only_accessed_fields(self):
+        items = [{'id': i, 'message': f'message {i}', 'seen': False} for i in range(100)]
+        items[50] = {'id': 'not an int', 'message': 'broken', 'seen': False}
+        encoded = json.dumps({'type': 'Notifications', 'data': items})
+
+        self.assertIsInstance(Notifications.decode(encoded), Invalid)
+
+        result = Notifications.decode(encoded, lazy=True)
+        self.assertIsInstance(result, Valid)
+        data = result.value.data
+        self.assertIsInstance(data, ListView)
+        self.assertEqual(len(data), 100)
+        self.assertIsInstance(data[3], InterfaceView)
+        self.assertEqual(data[3].message, 'message 3')
+        self.assertEqual(data[3].force(), Valid(Notification(3, 'message 3', False)))
+
+        with self.assertRaises(LazyValidationError) as context:
+            data[50].id
+        self.assertEqual(context.exception.path, ['data', '50', 'id'])
+        self.assertEqual(context.exception.reason, "Value is not int: not an int (<class 'str'>)")
+
+        self.assertEqual(result.value.force(), Notifications.decode(encoded))
+
+    def test_lazy_decode_checks_shape_up_front(self):
+        self.assertEqual(SomeType.decode('[]', lazy=True),
+                         Invalid("Expected dict, got: [] (<class 'list'>)"))
+        self.assertEqual(NotificationCommandResult.decode('{"type": "Other"}', lazy=True),
+                         Invalid("Invalid tag: Other, expecting one of ['CommandSuccess', 'CommandFailure']"))
+
+    def test_lazy_decode_of_unions_and_generics(self):
+        encoded = '{"type": "CommandSuccess", "data": {"type": "NotificationsCleared", "data": 3}}'
+        result = NotificationCommandResult.decode(encoded, lazy=True)
+        self.assertIsInstance(result, Valid)
+        self.assertEqual(result.value.data.data, 3)
+        self.assertEqual(result.value.force(), NotificationCommandResult.decode(encoded))
+
+        possibly = Possibly.decode('{"type": "Definitely", "data": 42}', validate_int, lazy=True)
+        self.assertEqual(possibly.value.data, 42)
+        self.assertEqual(possibly.value.force(), Valid(Definitely(42)))
+
+        holder = Holder.decode('{"value": "42"}', validate_T=validate_int, lazy=True)
+        with self.assertRaises(LazyValidationError):
+            holder.value.value
+        self.assertEqual(holder.value.force(), Holder.decode('{"value": "42"}', validate_int))
+
+    def test_schemas_of_type_arguments_are_freed(self):
+        references = []
+        with mock.patch.object(schema, '_ARGUMENT_SCHEMAS_LIMIT', 50):
+            for _ in range(200):
+                def validate_temporary(value):
+                    return validate_int(value)
+
+                holder_schema = schema.schema_of(Holder, validate_temporary)
+                self.assertEqual(schema.validator_of(holder_schema)({'value': 1}), Valid(Holder(1)))
+                references.append(weakref.ref(validate_temporary))
+            del validate_temporary, holder_schema
+            gc.collect()
+            self.assertLessEqual(len([r for r in references if r() is not None]), 50)
+
+        holder_schema = schema.schema_of(Holder, validate_int)
+        self.assertIs(schema.schema_of(Holder, validate_int), holder_schema)
+        self.assertIs(schema.validator_of(holder_schema), schema.validator_of(holder_schema))